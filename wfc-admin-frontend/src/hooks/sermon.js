@@ -1,6 +1,7 @@
 // src/hooks/sermon.js
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import SermonService from '@services/SermonService';
+import { getNextCursor } from '@services/api';
 import toast from 'react-hot-toast';
 
 const SERMON_KEYS = {
@@ -12,13 +13,18 @@ const SERMON_KEYS = {
 export const useSermons = (params = {}) => {
   const queryClient = useQueryClient();
 
-  // List sermons (optionally by category_id)
-  const listQuery = useQuery({
+  // List sermons (optionally by category_id), one cursor page at a time
+  const listQuery = useInfiniteQuery({
     queryKey: SERMON_KEYS.list(params),
-    queryFn: async () => {
-      const { data } = await SermonService.getAll(params);
-      return data;
+    queryFn: async ({ pageParam }) => {
+      const response = await SermonService.getAll({
+        ...params,
+        ...(pageParam && { cursor: pageParam }),
+      });
+      return { items: response.data, nextCursor: getNextCursor(response) };
     },
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
   });
 
   // Create sermon via file upload (FormData)
@@ -70,9 +76,12 @@ export const useSermons = (params = {}) => {
     });
 
   return {
-    sermons: listQuery.data,
+    sermons: listQuery.data?.pages.flatMap((page) => page.items),
     isLoadingSermons: listQuery.isLoading,
     sermonsError: listQuery.error,
+    hasMoreSermons: listQuery.hasNextPage,
+    loadMoreSermons: listQuery.fetchNextPage,
+    isLoadingMoreSermons: listQuery.isFetchingNextPage,
 
     createSermon: createMutation.mutate,
     createSermonAsync: createMutation.mutateAsync,
@@ -14,6 +14,9 @@ function SermonsPage() {
   const {
     sermons,
     isLoadingSermons,
+    hasMoreSermons,
+    loadMoreSermons,
+    isLoadingMoreSermons,
     createSermonAsync,
     updateSermonAsync,
     deleteSermonAsync,
@@ -206,6 +209,19 @@ function SermonsPage() {
           </div>
         )}
 
+        {hasMoreSermons && (
+          <div className="flex justify-center">
+            <button
+              type="button"
+              onClick={() => loadMoreSermons()}
+              disabled={isLoadingMoreSermons}
+              className="rounded-md border border-gray-300 px-3 py-1.5 text-sm text-gray-700 hover:bg-gray-50 disabled:opacity-50 dark:border-gray-600 dark:text-gray-200 dark:hover:bg-gray-800"
+            >
+              {isLoadingMoreSermons ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
+
         {/* Create/Edit sermon modal */}
         {showModal && (
           <div className="fixed inset-0 z-40 flex items-center justify-center bg-black/40">
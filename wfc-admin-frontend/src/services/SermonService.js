@@ -8,7 +8,8 @@ import api from './api';
  * api.js baseURL handles /api/v1, so we only use `/sermons`.
  */
 const SermonService = {
-  // Get all sermons, optionally filtered by category_id
+  // Get one page of sermons, optionally filtered by category_id.
+  // Pass getNextCursor(response) back as `cursor` for the next page.
   getAll: (params = {}) => api.get('/sermons', { params }),
 
   // Get single sermon (with stats)
@@ -32,8 +33,19 @@ const SermonService = {
   // Toggle like (user)
   toggleLike: (sermonId) => api.post(`/sermons/${sermonId}/like`),
 
-  // Analytics (admin only)
+  // Analytics totals (admin only): total_views, total_likes, total_users, total_not_watched
   getAnalytics: (sermonId) => api.get(`/sermons/${sermonId}/analytics`),
+
+  // Members who 'viewed', 'liked' or are 'not_watched' (admin only), by name.
+  // One page per call; pass getNextCursor(response) back as `cursor`.
+  getAudience: (sermonId, audience, { cursor, limit = 50 } = {}) =>
+    api.get(`/sermons/${sermonId}/analytics/${audience}`, {
+      params: { limit, ...(cursor && { cursor }) },
+    }),
+
+  // Full audience list as a CSV file (admin only)
+  exportAudience: (sermonId, audience) =>
+    api.get(`/sermons/${sermonId}/analytics/${audience}/export`, { responseType: 'blob' }),
 };
 
 export default SermonService;
@@ -73,4 +73,10 @@ api.interceptors.response.use(
   }
 );
 
+/**
+ * Cursor for the next page of a cursor-paginated list, from the
+ * X-Next-Cursor response header (null on the last page)
+ */
+export const getNextCursor = (response) => response.headers['x-next-cursor'] || null;
+
 export default api;
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""sermon engagement counters
+
+Revision ID: 3f1c9a7b2d4e
+Revises: 
+Create Date: 2026-10-18 01:06:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7b2d4e'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: databases bootstrapped with scripts/create_tables.py
+    # after this change already have the columns
+    op.execute("ALTER TABLE sermons ADD COLUMN IF NOT EXISTS view_count INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE sermons ADD COLUMN IF NOT EXISTS like_count INTEGER NOT NULL DEFAULT 0")
+
+    # Backfill from existing view rows
+    op.execute("""
+        UPDATE sermons s
+        SET view_count = c.views, like_count = c.likes
+        FROM (
+            SELECT sermon_id,
+                   count(*) AS views,
+                   count(*) FILTER (WHERE liked) AS likes
+            FROM sermon_views
+            GROUP BY sermon_id
+        ) c
+        WHERE c.sermon_id = s.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('sermons', 'like_count')
+    op.drop_column('sermons', 'view_count')
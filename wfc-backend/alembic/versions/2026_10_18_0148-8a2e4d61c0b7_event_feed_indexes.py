@@ -0,0 +1,32 @@
+"""event feed indexes
+
+Revision ID: 8a2e4d61c0b7
+Revises: 3f1c9a7b2d4e
+Create Date: 2026-10-18 01:48:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a2e4d61c0b7'
+down_revision = '3f1c9a7b2d4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_events_branch_id_event_date "
+        "ON events (branch_id, event_date)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_events_cross_branch_status_event_date "
+        "ON events (cross_branch_status, event_date)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_cross_branch_status_event_date', table_name='events')
+    op.drop_index('ix_events_branch_id_event_date', table_name='events')
@@ -0,0 +1,125 @@
+"""hot path indexes and unique views
+
+Revision ID: c54f0e9d3a18
+Revises: 8a2e4d61c0b7
+Create Date: 2026-10-18 02:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c54f0e9d3a18'
+down_revision = '8a2e4d61c0b7'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns) - built CONCURRENTLY where possible so writes keep flowing
+INDEXES = [
+    ("ix_sermon_views_sermon_id_liked", "sermon_views", "sermon_id, liked"),
+    ("ix_sermon_views_user_id", "sermon_views", "user_id"),
+    ("ix_blog_views_user_id", "blog_views", "user_id"),
+    ("ix_notifications_user_id_is_read_created_at", "notifications", "user_id, is_read, created_at"),
+    ("ix_events_created_by", "events", "created_by"),
+    ("ix_prayer_requests_user_id", "prayer_requests", "user_id"),
+    ("ix_users_status_created_at", "users", "status, created_at"),
+    ("ix_users_branch_id", "users", "branch_id"),
+    ("ix_blogs_status_created_at", "blogs", "status, created_at"),
+]
+
+UNIQUE_CONSTRAINTS = [
+    ("uq_sermon_views_sermon_id_user_id", "sermon_views", "sermon_id, user_id"),
+    ("uq_blog_views_blog_id_user_id", "blog_views", "blog_id, user_id"),
+]
+
+
+def _add_unique(name: str, table: str, columns: str) -> None:
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{name}') THEN
+                ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({columns});
+            END IF;
+        END $$;
+    """)
+
+
+def _is_partitioned(table: str) -> bool:
+    relkind = op.get_bind().scalar(sa.text(
+        "SELECT relkind FROM pg_class WHERE relname = :table AND relnamespace = 'public'::regnamespace"
+    ).bindparams(table=table))
+    return relkind == 'p'
+
+
+def upgrade() -> None:
+    # Collapse duplicate view rows (left behind by concurrent check-then-insert)
+    # onto the earliest one, keeping a like if any duplicate had it
+    op.execute("""
+        UPDATE sermon_views v
+        SET liked = true
+        FROM (
+            SELECT DISTINCT ON (sermon_id, user_id) id
+            FROM sermon_views
+            WHERE (sermon_id, user_id) IN (
+                SELECT sermon_id, user_id FROM sermon_views
+                GROUP BY sermon_id, user_id
+                HAVING count(*) > 1 AND bool_or(liked)
+            )
+            ORDER BY sermon_id, user_id, viewed_at, id
+        ) keep
+        WHERE v.id = keep.id AND NOT v.liked
+    """)
+    for table, key in (("sermon_views", "sermon_id"), ("blog_views", "blog_id")):
+        op.execute(f"""
+            DELETE FROM {table}
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, row_number() OVER (
+                        PARTITION BY {key}, user_id ORDER BY viewed_at, id
+                    ) AS rn
+                    FROM {table}
+                ) ranked
+                WHERE rn > 1
+            )
+        """)
+
+    # Counters must match the deduplicated rows
+    op.execute("""
+        UPDATE sermons s
+        SET view_count = coalesce(c.views, 0), like_count = coalesce(c.likes, 0)
+        FROM sermons s2
+        LEFT JOIN (
+            SELECT sermon_id,
+                   count(*) AS views,
+                   count(*) FILTER (WHERE liked) AS likes
+            FROM sermon_views
+            GROUP BY sermon_id
+        ) c ON c.sermon_id = s2.id
+        WHERE s.id = s2.id
+          AND (s.view_count <> coalesce(c.views, 0) OR s.like_count <> coalesce(c.likes, 0))
+    """)
+
+    for name, table, columns in UNIQUE_CONSTRAINTS:
+        _add_unique(name, table, columns)
+
+    # CONCURRENTLY is not supported on a partitioned table (notifications
+    # when bootstrapped by scripts/create_tables.py); a plain CREATE INDEX
+    # there builds it on every partition
+    partitioned = {table for _, table, _ in INDEXES if _is_partitioned(table)}
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            concurrently = "" if table in partitioned else "CONCURRENTLY "
+            op.execute(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {table} ({columns})")
+        # Superseded by ix_users_status_created_at
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_status")
+
+
+def downgrade() -> None:
+    op.create_index('ix_users_status', 'users', ['status'])
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    for name, table, _ in reversed(UNIQUE_CONSTRAINTS):
+        op.drop_constraint(name, table, type_='unique')
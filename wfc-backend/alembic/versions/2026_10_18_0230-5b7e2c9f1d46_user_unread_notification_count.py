@@ -0,0 +1,37 @@
+"""user unread notification count
+
+Revision ID: 5b7e2c9f1d46
+Revises: c54f0e9d3a18
+Create Date: 2026-10-18 02:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2c9f1d46'
+down_revision = 'c54f0e9d3a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS unread_notification_count INTEGER NOT NULL DEFAULT 0")
+
+    # Backfill from existing unread notifications
+    op.execute("""
+        UPDATE users u
+        SET unread_notification_count = c.unread
+        FROM (
+            SELECT user_id, count(*) AS unread
+            FROM notifications
+            WHERE NOT is_read
+            GROUP BY user_id
+        ) c
+        WHERE c.user_id = u.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'unread_notification_count')
@@ -0,0 +1,96 @@
+"""partition notifications by month
+
+Revision ID: e81d3b6a9c27
+Revises: 5b7e2c9f1d46
+Create Date: 2026-10-18 03:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e81d3b6a9c27'
+down_revision = '5b7e2c9f1d46'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = "id, created_at, updated_at, message, notification_type, is_read, user_id"
+
+
+def _create_table(partitioned: bool) -> None:
+    primary_key = "id, created_at" if partitioned else "id"
+    partition_by = "PARTITION BY RANGE (created_at)" if partitioned else ""
+    op.execute(f"""
+        CREATE TABLE notifications (
+            id UUID NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            message TEXT NOT NULL,
+            notification_type VARCHAR(50) NOT NULL,
+            is_read BOOLEAN NOT NULL,
+            user_id UUID NOT NULL REFERENCES users (id),
+            PRIMARY KEY ({primary_key})
+        ) {partition_by}
+    """)
+    op.execute("CREATE INDEX ix_notifications_id ON notifications (id)")
+    op.execute(
+        "CREATE INDEX ix_notifications_user_id_is_read_created_at "
+        "ON notifications (user_id, is_read, created_at)"
+    )
+
+
+def _set_aside_old_table() -> None:
+    op.execute("ALTER TABLE notifications RENAME TO notifications_old")
+    op.execute("ALTER INDEX notifications_pkey RENAME TO notifications_old_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_notifications_id")
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_id_is_read_created_at")
+
+
+def _copy_back_and_drop_old() -> None:
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_old")
+    op.execute("DROP TABLE notifications_old")
+
+
+def upgrade() -> None:
+    relkind = op.get_bind().scalar(sa.text(
+        "SELECT relkind FROM pg_class WHERE relname = 'notifications' AND relnamespace = 'public'::regnamespace"
+    ))
+    if relkind == 'p':
+        # Bootstrapped with scripts/create_tables.py after this change
+        return
+
+    _set_aside_old_table()
+    _create_table(partitioned=True)
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
+
+    # One partition per month from the oldest row through two months ahead;
+    # the app's maintenance job keeps creating them from here on
+    op.execute("""
+        DO $$
+        DECLARE
+            m date;
+        BEGIN
+            FOR m IN
+                SELECT generate_series(
+                    date_trunc('month', coalesce((SELECT min(created_at) FROM notifications_old), now())),
+                    date_trunc('month', now()) + interval '2 months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+                    'notifications_' || to_char(m, 'YYYY_MM'), m, (m + interval '1 month')::date
+                );
+            END LOOP;
+        END $$;
+    """)
+
+    _copy_back_and_drop_old()
+
+
+def downgrade() -> None:
+    _set_aside_old_table()
+    _create_table(partitioned=False)
+    _copy_back_and_drop_old()
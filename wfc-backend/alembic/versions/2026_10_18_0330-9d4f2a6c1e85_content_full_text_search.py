@@ -0,0 +1,49 @@
+"""content full text search
+
+Revision ID: 9d4f2a6c1e85
+Revises: e81d3b6a9c27
+Create Date: 2026-10-18 03:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f2a6c1e85'
+down_revision = 'e81d3b6a9c27'
+branch_labels = None
+depends_on = None
+
+
+# (table, title column, body column); mirrors app.db.base.search_vector_column
+SEARCHABLE = [
+    ("sermons", "title", "description"),
+    ("blogs", "title", "content"),
+    ("prayer_requests", "title", "content"),
+]
+
+
+def upgrade() -> None:
+    # Stored generated columns are filled for existing rows as they are added
+    for table, title, body in SEARCHABLE:
+        op.execute(f"""
+            ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce({title}, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce({body}, '')), 'B')
+            ) STORED
+        """)
+
+    with op.get_context().autocommit_block():
+        for table, _, _ in SEARCHABLE:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search_vector "
+                f"ON {table} USING gin (search_vector)"
+            )
+
+
+def downgrade() -> None:
+    for table, _, _ in reversed(SEARCHABLE):
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
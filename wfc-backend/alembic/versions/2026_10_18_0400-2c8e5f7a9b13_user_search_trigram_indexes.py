@@ -0,0 +1,40 @@
+"""user search trigram indexes
+
+Revision ID: 2c8e5f7a9b13
+Revises: 9d4f2a6c1e85
+Create Date: 2026-10-18 04:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c8e5f7a9b13'
+down_revision = '9d4f2a6c1e85'
+branch_labels = None
+depends_on = None
+
+
+# (name, column) - GIN trigram indexes on users, built CONCURRENTLY
+INDEXES = [
+    ("ix_users_full_name_trgm", "full_name"),
+    ("ix_users_email_trgm", "email"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON users USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    # The extension is left installed; other objects may depend on it
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='users')
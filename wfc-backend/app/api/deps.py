@@ -1,31 +1,30 @@
-from typing import Generator, Optional
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.core.security import decode_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.core.security import decode_token_cached
 from app.core.constants import UserRole, UserStatus
 from app.models.user import User
 from app.models.admin import Admin
 from app.core.exceptions import AuthenticationError, PermissionDeniedError
+from app.services.auth_service import load_principal
 
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+async def authenticate_user(token: str, db: AsyncSession, token_type: str = "access") -> User:
     """
-    Get current authenticated user.
-    Validates JWT token and returns user if approved.
+    Resolve a member token (an access token unless `token_type` says
+    otherwise, e.g. "stream") to an approved user.
+    Token payloads and users are served from the principal cache,
+    so most calls cost no database round trip.
     """
-    token = credentials.credentials
-    payload = decode_token(token)
+    payload = decode_token_cached(token)
     
     # Validate token type
-    if payload.get("type") != "access":
+    if payload.get("type") != token_type:
         raise AuthenticationError("Invalid token type")
     
     user_id = payload.get("sub")
@@ -35,8 +34,8 @@ def get_current_user(
     if role != UserRole.MEMBER:
         raise AuthenticationError("Invalid user role")
     
-    # Fetch user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    # Fetch user (cached snapshot or database)
+    user = await load_principal(db, User, user_id)
     
     if not user:
         raise AuthenticationError("User not found")
@@ -48,16 +47,27 @@ def get_current_user(
     return user
 
 
-def get_current_admin(
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Get current authenticated user.
+    Validates JWT token and returns user if approved.
+    """
+    return await authenticate_user(credentials.credentials, db)
+
+
+async def get_current_admin(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Admin:
     """
     Get current authenticated admin.
     Validates JWT token and returns admin if active.
     """
     token = credentials.credentials
-    payload = decode_token(token)
+    payload = decode_token_cached(token)
     
     # Validate token type
     if payload.get("type") != "access":
@@ -70,21 +80,18 @@ def get_current_admin(
     if role != UserRole.ADMIN:
         raise PermissionDeniedError("Admin access required")
     
-    # Fetch admin from database
-    admin = db.query(Admin).filter(
-        Admin.id == admin_id,
-        Admin.is_active == True
-    ).first()
+    # Fetch admin (cached snapshot or database)
+    admin = await load_principal(db, Admin, admin_id)
     
-    if not admin:
+    if not admin or not admin.is_active:
         raise AuthenticationError("Admin not found or inactive")
     
     return admin
 
 
-def get_current_user_optional(
+async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Optional[User]:
     """
     Get current user if authenticated, otherwise None.
@@ -94,7 +101,7 @@ def get_current_user_optional(
         return None
     
     try:
-        return get_current_user(credentials, db)
+        return await get_current_user(credentials, db)
     except:
         return None
 
@@ -1,21 +1,22 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.schemas.auth import AdminLogin, TokenResponse
 from app.schemas.admin import AdminCreate, AdminResponse
 from app.schemas.common import SuccessResponse
 from app.core.security import (
-    verify_password,
+    password_hasher,
     create_access_token,
     create_refresh_token,
-    get_password_hash,
     validate_password_strength
 )
 from app.core.constants import UserRole
 from app.core.exceptions import AuthenticationError, ConflictError, ValidationError
 from app.models.admin import Admin
 from app.api.deps import get_current_admin
+from app.services.auth_service import invalidate_admin
 
 router = APIRouter()
 
@@ -23,7 +24,7 @@ router = APIRouter()
 @router.post("/create", response_model=AdminResponse, status_code=status.HTTP_201_CREATED)
 async def create_admin(
     admin_data: AdminCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create admin account (Pastor).
@@ -31,7 +32,7 @@ async def create_admin(
     In production, add authentication or disable this endpoint.
     """
     # Check if admin with email already exists
-    existing_admin = db.query(Admin).filter(Admin.email == admin_data.email).first()
+    existing_admin = await db.scalar(select(Admin).where(Admin.email == admin_data.email))
     if existing_admin:
         raise ConflictError("Admin with this email already exists")
     
@@ -43,14 +44,14 @@ async def create_admin(
     # Create admin
     new_admin = Admin(
         email=admin_data.email,
-        password_hash=get_password_hash(admin_data.password),
+        password_hash=await password_hasher.hash(admin_data.password),
         display_name=admin_data.display_name,
         is_active=True
     )
     
     db.add(new_admin)
-    db.commit()
-    db.refresh(new_admin)
+    await db.commit()
+    await db.refresh(new_admin)
     
     return new_admin
 
@@ -58,28 +59,34 @@ async def create_admin(
 @router.post("/login", response_model=TokenResponse)
 async def admin_login(
     credentials: AdminLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Admin/Pastor login - returns access and refresh tokens
     """
     # Find admin by email
-    admin = db.query(Admin).filter(Admin.email == credentials.email).first()
+    admin = await db.scalar(select(Admin).where(Admin.email == credentials.email))
     
     if not admin:
         raise AuthenticationError("Invalid email or password")
     
-    # Verify password
-    if not verify_password(credentials.password, admin.password_hash):
+    # Verify password (off the event loop)
+    is_valid, new_hash = await password_hasher.verify_and_update(
+        credentials.password, admin.password_hash
+    )
+    if not is_valid:
         raise AuthenticationError("Invalid email or password")
     
     # Check if admin is active
     if not admin.is_active:
         raise AuthenticationError("Admin account is inactive")
     
-    # Update last login
+    # Update last login, upgrading an outdated hash in the same commit
     admin.last_login = datetime.utcnow()
-    db.commit()
+    if new_hash:
+        admin.password_hash = new_hash
+    await db.commit()
+    invalidate_admin(admin.id)
     
     # Create tokens
     token_data = {
@@ -117,7 +124,7 @@ async def get_current_admin_info(current_admin: Admin = Depends(get_current_admi
 async def change_admin_password(
     password_data: AdminLogin,  # Reusing for simplicity, or create AdminPasswordChange
     current_admin: Admin = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Change admin password
@@ -130,7 +137,8 @@ async def change_admin_password(
         raise ValidationError(error_msg)
     
     # Update password
-    current_admin.password_hash = get_password_hash(password_data.password)
-    db.commit()
+    current_admin.password_hash = await password_hasher.hash(password_data.password)
+    await db.commit()
+    invalidate_admin(current_admin.id)
     
     return {"message": "Admin password changed successfully", "success": True}
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.schemas.auth import UserRegister, UserLogin, TokenResponse
 from app.schemas.user import UserResponse
 from app.core.security import (
-    get_password_hash,
-    verify_password,
+    password_hasher,
     create_access_token,
     create_refresh_token,
     validate_password_strength
@@ -15,6 +15,7 @@ from app.core.exceptions import ConflictError, AuthenticationError, ValidationEr
 from app.models.user import User
 from app.models.branch import Branch
 from app.api.deps import get_current_user
+from app.services.auth_service import invalidate_user
 
 router = APIRouter()
 
@@ -22,13 +23,13 @@ router = APIRouter()
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def signup(
     user_data: UserRegister,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register new user - account will be in pending status until admin approves
     """
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise ConflictError("Email already registered")
     
@@ -38,7 +39,7 @@ async def signup(
         raise ValidationError(error_msg)
     
     # Verify branch exists
-    branch = db.query(Branch).filter(Branch.id == user_data.branch_id).first()
+    branch = await db.scalar(select(Branch).where(Branch.id == user_data.branch_id))
     if not branch:
         raise ValidationError("Invalid branch ID")
     
@@ -46,14 +47,14 @@ async def signup(
     new_user = User(
         email=user_data.email,
         full_name=user_data.full_name,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await password_hasher.hash(user_data.password),
         branch_id=user_data.branch_id,
         status=UserStatus.PENDING
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
@@ -61,19 +62,22 @@ async def signup(
 @router.post("/login", response_model=TokenResponse)
 async def login(
     credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Member login - returns access and refresh tokens
     """
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email))
     
     if not user:
         raise AuthenticationError("Invalid email or password")
     
-    # Verify password
-    if not verify_password(credentials.password, user.password_hash):
+    # Verify password (off the event loop)
+    is_valid, new_hash = await password_hasher.verify_and_update(
+        credentials.password, user.password_hash
+    )
+    if not is_valid:
         raise AuthenticationError("Invalid email or password")
     
     # Check if user is approved
@@ -83,6 +87,12 @@ async def login(
         else:
             raise AuthenticationError("Account has been revoked")
     
+    # Transparently upgrade hashes made with an outdated cost factor
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+        invalidate_user(user.id)
+    
     # Create tokens
     token_data = {
         "sub": str(user.id),
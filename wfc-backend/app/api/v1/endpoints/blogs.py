@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.session import get_db
+from datetime import datetime
+import uuid
+from app.db.session import get_async_db
 from app.schemas.blog import (
     BlogCreate,
     BlogUpdate,
@@ -10,12 +14,18 @@ from app.schemas.blog import (
     BlogViewCreate
 )
 from app.schemas.common import SuccessResponse
-from app.core.constants import BlogStatus
+from app.core.constants import BlogStatus, NotificationType
 from app.core.exceptions import NotFoundError
 from app.models.blog import Blog
 from app.models.blog_view import BlogView
 from app.models.user import User
 from app.api.deps import get_current_admin, get_current_user
+from app.repositories.blog_repository import blog_stats_query, blog_with_stats
+from app.services.analytics_service import invalidate_dashboard_stats
+from app.services.notification_service import notify_all_members
+from app.services.view_buffer import BLOG, FULL, view_buffer
+from app.utils.pagination import CursorParams, cursor_params, keyset_paginate, set_page_headers
+from app.utils.validators import validate_uuid
 
 router = APIRouter()
 
@@ -23,7 +33,7 @@ router = APIRouter()
 @router.post("", response_model=BlogResponse, status_code=status.HTTP_201_CREATED)
 async def create_blog(
     blog_data: BlogCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
@@ -38,108 +48,82 @@ async def create_blog(
     )
     
     db.add(new_blog)
-    db.commit()
-    db.refresh(new_blog)
+    await db.commit()
+    invalidate_dashboard_stats()
+    await db.refresh(new_blog)
     
-    # TODO: If published, send notification to all users
+    if new_blog.status == BlogStatus.PUBLISHED:
+        notify_all_members(f"New blog post: {new_blog.title}", NotificationType.BLOG_PUBLISHED)
     
     return new_blog
 
 
 @router.get("", response_model=List[BlogWithStats])
 async def get_all_blogs(
+    response: Response,
     status: str = None,
-    db: Session = Depends(get_db),
+    page: CursorParams = Depends(cursor_params),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all published blogs (members see only published)
+    Get published blogs, newest first (members see only published)
+    Paginated by cursor: pass X-Next-Cursor back as ?cursor=
     """
-    query = db.query(Blog).filter(Blog.status == BlogStatus.PUBLISHED)
+    query = blog_stats_query(current_user.id).where(Blog.status == BlogStatus.PUBLISHED)
     
-    blogs = query.order_by(Blog.created_at.desc()).all()
+    blogs = await keyset_paginate(db, query, (Blog.created_at, Blog.id), page)
+    set_page_headers(response, blogs)
     
-    result = []
-    for blog in blogs:
-        # Get view count
-        total_views = db.query(BlogView).filter(
-            BlogView.blog_id == blog.id
-        ).count()
-        
-        # Check if current user viewed
-        user_view = db.query(BlogView).filter(
-            BlogView.blog_id == blog.id,
-            BlogView.user_id == current_user.id
-        ).first()
-        
-        blog_dict = BlogWithStats.from_orm(blog).dict()
-        blog_dict['total_views'] = total_views
-        blog_dict['user_has_viewed'] = user_view is not None
-        
-        result.append(blog_dict)
-    
-    return result
+    return [blog_with_stats(row) for row in blogs.items]
 
 
 @router.get("/admin/all", response_model=List[BlogResponse])
 async def get_all_blogs_admin(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: CursorParams = Depends(cursor_params),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
-    Get all blogs including drafts (Admin only)
+    Get all blogs including drafts, newest first (Admin only)
     """
-    blogs = db.query(Blog).order_by(Blog.created_at.desc()).all()
-    return blogs
+    blogs = await keyset_paginate(db, select(Blog), (Blog.created_at, Blog.id), page)
+    set_page_headers(response, blogs)
+    return blogs.items
 
 
 @router.get("/{blog_id}", response_model=BlogWithStats)
 async def get_blog(
     blog_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get blog by ID
     """
-    blog = db.query(Blog).filter(Blog.id == blog_id).first()
-    
-    if not blog:
-        raise NotFoundError("Blog")
+    row = (await db.execute(blog_stats_query(current_user.id).where(
+        Blog.id == blog_id
+    ))).first()
     
     # Members can only view published blogs
-    if blog.status != BlogStatus.PUBLISHED:
+    if not row or row.Blog.status != BlogStatus.PUBLISHED:
         raise NotFoundError("Blog")
     
-    # Get view count
-    total_views = db.query(BlogView).filter(
-        BlogView.blog_id == blog.id
-    ).count()
-    
-    # Check if current user viewed
-    user_view = db.query(BlogView).filter(
-        BlogView.blog_id == blog.id,
-        BlogView.user_id == current_user.id
-    ).first()
-    
-    blog_dict = BlogWithStats.from_orm(blog).dict()
-    blog_dict['total_views'] = total_views
-    blog_dict['user_has_viewed'] = user_view is not None
-    
-    return blog_dict
+    return blog_with_stats(row)
 
 
 @router.put("/{blog_id}", response_model=BlogResponse)
 async def update_blog(
     blog_id: str,
     blog_data: BlogUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
     Update blog (Admin only)
     """
-    blog = db.query(Blog).filter(Blog.id == blog_id).first()
+    blog = await db.scalar(select(Blog).where(Blog.id == blog_id))
     
     if not blog:
         raise NotFoundError("Blog")
@@ -151,14 +135,21 @@ async def update_blog(
     if blog_data.content:
         blog.content = blog_data.content
     
+    newly_published = False
     if blog_data.status:
+        newly_published = (
+            blog_data.status == BlogStatus.PUBLISHED and blog.status != BlogStatus.PUBLISHED
+        )
         blog.status = blog_data.status
     
     if blog_data.featured_image is not None:
         blog.featured_image = blog_data.featured_image
     
-    db.commit()
-    db.refresh(blog)
+    await db.commit()
+    await db.refresh(blog)
+    
+    if newly_published:
+        notify_all_members(f"New blog post: {blog.title}", NotificationType.BLOG_PUBLISHED)
     
     return blog
 
@@ -166,19 +157,20 @@ async def update_blog(
 @router.delete("/{blog_id}", response_model=SuccessResponse)
 async def delete_blog(
     blog_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
     Delete blog (Admin only)
     """
-    blog = db.query(Blog).filter(Blog.id == blog_id).first()
+    blog = await db.scalar(select(Blog).where(Blog.id == blog_id))
     
     if not blog:
         raise NotFoundError("Blog")
     
-    db.delete(blog)
-    db.commit()
+    await db.delete(blog)
+    await db.commit()
+    invalidate_dashboard_stats()
     
     return {"message": "Blog deleted successfully", "success": True}
 
@@ -186,56 +178,63 @@ async def delete_blog(
 @router.post("/{blog_id}/view", response_model=SuccessResponse)
 async def mark_blog_viewed(
     blog_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Mark blog as viewed by current user
+    Queued in the view buffer while it runs (unless it is full),
+    written now otherwise
     """
-    blog = db.query(Blog).filter(Blog.id == blog_id).first()
+    if not validate_uuid(blog_id):
+        raise NotFoundError("Blog")
+    
+    blog = await db.scalar(select(Blog).where(Blog.id == blog_id))
     
     if not blog:
         raise NotFoundError("Blog")
     
-    # Check if already viewed
-    existing_view = db.query(BlogView).filter(
-        BlogView.blog_id == blog_id,
-        BlogView.user_id == current_user.id
-    ).first()
-    
-    if existing_view:
+    if view_buffer.running and view_buffer.add(BLOG, blog_id, current_user.id) != FULL:
+        return {"message": "Blog view recorded", "success": True}
+    
+    # Insert unless already viewed (unique (blog_id, user_id) absorbs races)
+    now = datetime.utcnow()
+    inserted = await db.scalar(pg_insert(BlogView).values(
+        id=uuid.uuid4(),
+        blog_id=blog.id,
+        user_id=current_user.id,
+        viewed_at=now,
+        created_at=now,
+        updated_at=now
+    ).on_conflict_do_nothing(
+        index_elements=[BlogView.blog_id, BlogView.user_id]
+    ).returning(BlogView.id))
+    await db.commit()
+    
+    if not inserted:
         return {"message": "Blog already marked as viewed", "success": True}
     
-    # Create view record
-    new_view = BlogView(
-        blog_id=blog_id,
-        user_id=current_user.id
-    )
-    
-    db.add(new_view)
-    db.commit()
-    
     return {"message": "Blog marked as viewed", "success": True}
 
 
 @router.get("/{blog_id}/readers")
 async def get_blog_readers(
     blog_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
     Get list of users who read the blog (Admin only)
     """
-    blog = db.query(Blog).filter(Blog.id == blog_id).first()
+    blog = await db.scalar(select(Blog).where(Blog.id == blog_id))
     
     if not blog:
         raise NotFoundError("Blog")
     
     # Get readers
-    readers = db.query(User).join(BlogView).filter(
+    readers = (await db.scalars(select(User).join(BlogView).where(
         BlogView.blog_id == blog_id
-    ).all()
+    ))).all()
     
     return {
         "blog_id": str(blog.id),
@@ -1,84 +1,57 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.core.constants import UserStatus, EventCrossBranchStatus
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.models.user import User
 from app.models.sermon import Sermon
-from app.models.blog import Blog
 from app.models.event import Event
 from app.models.prayer_request import PrayerRequest
 from app.api.deps import get_current_admin
+from app.services import analytics_service
 
 router = APIRouter()
 
 
 @router.get("/stats")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
     Get overview statistics for admin dashboard
+    Computed in one query and cached briefly; admin mutations invalidate it
     """
-    # User statistics
-    total_users = db.query(User).count()
-    pending_users = db.query(User).filter(User.status == UserStatus.PENDING).count()
-    approved_users = db.query(User).filter(User.status == UserStatus.APPROVED).count()
-    revoked_users = db.query(User).filter(User.status == UserStatus.REVOKED).count()
-    
-    # Content statistics
-    total_sermons = db.query(Sermon).count()
-    total_blogs = db.query(Blog).count()
-    total_events = db.query(Event).count()
-    total_prayers = db.query(PrayerRequest).count()
-    
-    # Pending actions
-    pending_cross_branch = db.query(Event).filter(
-        Event.cross_branch_status == EventCrossBranchStatus.PENDING
-    ).count()
-    
-    return {
-        "users": {
-            "total": total_users,
-            "pending": pending_users,
-            "approved": approved_users,
-            "revoked": revoked_users
-        },
-        "content": {
-            "sermons": total_sermons,
-            "blogs": total_blogs,
-            "events": total_events,
-            "prayers": total_prayers
-        },
-        "pending_actions": {
-            "user_approvals": pending_users,
-            "cross_branch_requests": pending_cross_branch
-        }
-    }
+    return await analytics_service.get_dashboard_stats(db)
 
 
 @router.get("/recent-activity")
 async def get_recent_activity(
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
     Get recent activity across the platform
     """
     # Recent user registrations
-    recent_users = db.query(User).order_by(User.created_at.desc()).limit(limit).all()
+    recent_users = (await db.scalars(
+        select(User).order_by(User.created_at.desc()).limit(limit)
+    )).all()
     
     # Recent sermons
-    recent_sermons = db.query(Sermon).order_by(Sermon.created_at.desc()).limit(limit).all()
+    recent_sermons = (await db.scalars(
+        select(Sermon).order_by(Sermon.created_at.desc()).limit(limit)
+    )).all()
     
     # Recent events
-    recent_events = db.query(Event).order_by(Event.created_at.desc()).limit(limit).all()
+    recent_events = (await db.scalars(
+        select(Event).order_by(Event.created_at.desc()).limit(limit)
+    )).all()
     
     # Recent prayer requests
-    recent_prayers = db.query(PrayerRequest).order_by(
+    recent_prayers = (await db.scalars(select(PrayerRequest).order_by(
         PrayerRequest.created_at.desc()
-    ).limit(limit).all()
+    ).limit(limit))).all()
     
     return {
         "recent_users": [
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy import select, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.schemas.event import (
     EventCreate,
     EventUpdate,
@@ -12,12 +13,16 @@ from app.schemas.event import (
     EventCrossBranchApproval
 )
 from app.schemas.common import SuccessResponse
-from app.core.constants import EventCrossBranchStatus
+from app.core.constants import EventCrossBranchStatus, NotificationType
 from app.core.exceptions import NotFoundError, PermissionDeniedError, ValidationError
 from app.models.event import Event
 from app.models.branch import Branch
 from app.models.user import User
 from app.api.deps import get_current_admin, get_current_user
+from app.services.analytics_service import invalidate_dashboard_stats
+from app.services.notification_service import notify_users
+from app.utils.datetime_helpers import to_naive_utc, utc_now
+from app.utils.pagination import CursorParams, cursor_params, keyset_paginate, set_page_headers
 
 router = APIRouter()
 
@@ -25,14 +30,14 @@ router = APIRouter()
 @router.post("", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
 async def create_event(
     event_data: EventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Create event for user's branch
     """
     # Verify branch exists
-    branch = db.query(Branch).filter(Branch.id == event_data.branch_id).first()
+    branch = await db.scalar(select(Branch).where(Branch.id == event_data.branch_id))
     if not branch:
         raise ValidationError("Invalid branch ID")
     
@@ -53,81 +58,115 @@ async def create_event(
     )
     
     db.add(new_event)
-    db.commit()
-    db.refresh(new_event)
+    await db.commit()
+    await db.refresh(new_event)
     
     return new_event
 
 
+def window_bound(value: Optional[str], name: str) -> Optional[datetime]:
+    """
+    Parse a ?from=/?to= bound: "now" or an ISO 8601 date/datetime.
+    Values with an offset (Z, +05:30) are converted to naive UTC, the
+    way event_date is stored; values without one are taken as UTC.
+    """
+    if not value:
+        return None
+    if value.strip().lower() == "now":
+        return utc_now()
+    try:
+        return to_naive_utc(datetime.fromisoformat(value.strip()))
+    except ValueError:
+        raise ValidationError(f"'{name}' must be 'now' or an ISO 8601 date/datetime")
+
+
+def event_window(query, from_date: Optional[str], to_date: Optional[str]):
+    """Restrict an event query to event_date in [from, to)"""
+    from_date = window_bound(from_date, "from")
+    to_date = window_bound(to_date, "to")
+    if from_date:
+        query = query.where(Event.event_date >= from_date)
+    if to_date:
+        query = query.where(Event.event_date < to_date)
+    return query
+
+
 @router.get("", response_model=List[EventWithBranch])
 async def get_events(
-    db: Session = Depends(get_db),
+    response: Response,
+    from_date: Optional[str] = Query(None, alias="from", description="'now' or ISO 8601"),
+    to_date: Optional[str] = Query(None, alias="to", description="'now' or ISO 8601"),
+    page: CursorParams = Depends(cursor_params),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get events visible to current user:
+    Get events visible to current user, ordered by event date:
     - Their branch events
     - Approved cross-branch events
+    Optional ?from=/&to= window (e.g. from=now for upcoming events)
     """
-    # Get user's branch events
-    branch_events = db.query(Event, Branch.branch_name, User.full_name).join(
-        Branch, Event.branch_id == Branch.id
-    ).join(
-        User, Event.created_by == User.id
-    ).filter(
-        Event.branch_id == current_user.branch_id
-    ).all()
-    
-    # Get approved cross-branch events from other branches
-    cross_branch_events = db.query(Event, Branch.branch_name, User.full_name).join(
+    query = select(Event, Branch.branch_name, User.full_name).join(
         Branch, Event.branch_id == Branch.id
     ).join(
         User, Event.created_by == User.id
-    ).filter(
-        Event.branch_id != current_user.branch_id,
-        Event.is_cross_branch == True,
-        Event.cross_branch_status == EventCrossBranchStatus.APPROVED
-    ).all()
+    ).where(
+        or_(
+            Event.branch_id == current_user.branch_id,
+            and_(
+                Event.is_cross_branch == True,
+                Event.cross_branch_status == EventCrossBranchStatus.APPROVED
+            )
+        )
+    )
+    query = event_window(query, from_date, to_date)
     
-    # Combine results
-    all_events = branch_events + cross_branch_events
+    events = await keyset_paginate(
+        db, query, (Event.event_date, Event.id), page, descending=False
+    )
+    set_page_headers(response, events)
     
     result = []
-    for event, branch_name, creator_name in all_events:
-        event_dict = EventWithBranch.from_orm(event).dict()
+    for event, branch_name, creator_name in events.items:
+        event_dict = EventResponse.from_orm(event).dict()
         event_dict['branch_name'] = branch_name
         event_dict['creator_name'] = creator_name
         result.append(event_dict)
     
-    # Sort by event date
-    result.sort(key=lambda x: x['event_date'])
-    
     return result
 
 
 @router.get("/admin/all", response_model=List[EventWithBranch])
 async def get_all_events_admin(
+    response: Response,
     branch_id: str = None,
-    db: Session = Depends(get_db),
+    from_date: Optional[str] = Query(None, alias="from", description="'now' or ISO 8601"),
+    to_date: Optional[str] = Query(None, alias="to", description="'now' or ISO 8601"),
+    page: CursorParams = Depends(cursor_params),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
     Get all events from all branches (Admin only)
     """
-    query = db.query(Event, Branch.branch_name, User.full_name).join(
+    query = select(Event, Branch.branch_name, User.full_name).join(
         Branch, Event.branch_id == Branch.id
     ).join(
         User, Event.created_by == User.id
     )
     
     if branch_id:
-        query = query.filter(Event.branch_id == branch_id)
+        query = query.where(Event.branch_id == branch_id)
+    query = event_window(query, from_date, to_date)
     
-    events = query.order_by(Event.event_date).all()
+    events = await keyset_paginate(
+        db, query, (Event.event_date, Event.id), page, descending=False
+    )
+    set_page_headers(response, events)
     
     result = []
-    for event, branch_name, creator_name in events:
-        event_dict = EventWithBranch.from_orm(event).dict()
+    for event, branch_name, creator_name in events.items:
+        event_dict = EventResponse.from_orm(event).dict()
         event_dict['branch_name'] = branch_name
         event_dict['creator_name'] = creator_name
         result.append(event_dict)
@@ -138,17 +177,17 @@ async def get_all_events_admin(
 @router.get("/{event_id}", response_model=EventWithBranch)
 async def get_event(
     event_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get event by ID (only if user has access)
     """
-    result = db.query(Event, Branch.branch_name, User.full_name).join(
+    result = (await db.execute(select(Event, Branch.branch_name, User.full_name).join(
         Branch, Event.branch_id == Branch.id
     ).join(
         User, Event.created_by == User.id
-    ).filter(Event.id == event_id).first()
+    ).where(Event.id == event_id))).first()
     
     if not result:
         raise NotFoundError("Event")
@@ -165,7 +204,7 @@ async def get_event(
     if not (is_same_branch or is_approved_cross_branch):
         raise PermissionDeniedError("You don't have access to this event")
     
-    event_dict = EventWithBranch.from_orm(event).dict()
+    event_dict = EventResponse.from_orm(event).dict()
     event_dict['branch_name'] = branch_name
     event_dict['creator_name'] = creator_name
     
@@ -176,13 +215,13 @@ async def get_event(
 async def update_event(
     event_id: str,
     event_data: EventUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Update event (only event creator can update)
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     
     if not event:
         raise NotFoundError("Event")
@@ -207,8 +246,8 @@ async def update_event(
     if event_data.event_image is not None:
         event.event_image = event_data.event_image
     
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
     
     return event
 
@@ -216,13 +255,13 @@ async def update_event(
 @router.delete("/{event_id}", response_model=SuccessResponse)
 async def delete_event(
     event_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Delete event (only event creator can delete)
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     
     if not event:
         raise NotFoundError("Event")
@@ -231,8 +270,8 @@ async def delete_event(
     if str(event.created_by) != str(current_user.id):
         raise PermissionDeniedError("Only event creator can delete this event")
     
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await db.commit()
     
     return {"message": "Event deleted successfully", "success": True}
 
@@ -240,13 +279,13 @@ async def delete_event(
 @router.put("/{event_id}/request-cross-branch", response_model=SuccessResponse)
 async def request_cross_branch(
     event_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Request cross-branch visibility for event
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     
     if not event:
         raise NotFoundError("Event")
@@ -262,7 +301,7 @@ async def request_cross_branch(
     event.is_cross_branch = True
     event.cross_branch_status = EventCrossBranchStatus.PENDING
     
-    db.commit()
+    await db.commit()
     
     # TODO: Send notification to admin
     
@@ -272,13 +311,13 @@ async def request_cross_branch(
 @router.put("/{event_id}/approve-cross-branch", response_model=SuccessResponse)
 async def approve_cross_branch(
     event_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
     Approve cross-branch event request (Admin only)
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     
     if not event:
         raise NotFoundError("Event")
@@ -287,9 +326,14 @@ async def approve_cross_branch(
         raise ValidationError("Event is not pending cross-branch approval")
     
     event.cross_branch_status = EventCrossBranchStatus.APPROVED
-    db.commit()
+    await db.commit()
+    invalidate_dashboard_stats()
     
-    # TODO: Send notification to event creator
+    notify_users(
+        [event.created_by],
+        f"Your event \"{event.title}\" is now visible to all branches",
+        NotificationType.EVENT_APPROVED
+    )
     
     return {"message": "Cross-branch event approved", "success": True}
 
@@ -297,13 +341,13 @@ async def approve_cross_branch(
 @router.put("/{event_id}/reject-cross-branch", response_model=SuccessResponse)
 async def reject_cross_branch(
     event_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
     Reject cross-branch event request (Admin only)
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     
     if not event:
         raise NotFoundError("Event")
@@ -313,32 +357,44 @@ async def reject_cross_branch(
     
     event.is_cross_branch = False
     event.cross_branch_status = EventCrossBranchStatus.REJECTED
-    db.commit()
+    await db.commit()
+    invalidate_dashboard_stats()
     
-    # TODO: Send notification to event creator
+    notify_users(
+        [event.created_by],
+        f"Your cross-branch request for \"{event.title}\" was not approved",
+        NotificationType.EVENT_REJECTED
+    )
     
     return {"message": "Cross-branch event rejected", "success": True}
 
 
 @router.get("/admin/pending-cross-branch", response_model=List[EventWithBranch])
 async def get_pending_cross_branch_requests(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: CursorParams = Depends(cursor_params),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
-    Get all pending cross-branch event requests (Admin only)
+    Get pending cross-branch event requests (Admin only)
     """
-    events = db.query(Event, Branch.branch_name, User.full_name).join(
+    query = select(Event, Branch.branch_name, User.full_name).join(
         Branch, Event.branch_id == Branch.id
     ).join(
         User, Event.created_by == User.id
-    ).filter(
+    ).where(
         Event.cross_branch_status == EventCrossBranchStatus.PENDING
-    ).all()
+    )
+    
+    events = await keyset_paginate(
+        db, query, (Event.event_date, Event.id), page, descending=False
+    )
+    set_page_headers(response, events)
     
     result = []
-    for event, branch_name, creator_name in events:
-        event_dict = EventWithBranch.from_orm(event).dict()
+    for event, branch_name, creator_name in events.items:
+        event_dict = EventResponse.from_orm(event).dict()
         event_dict['branch_name'] = branch_name
         event_dict['creator_name'] = creator_name
         result.append(event_dict)
@@ -1,69 +1,177 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.db.session import get_db
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.config import settings
+from app.core.constants import UserRole
+from app.core.security import create_stream_ticket
+from app.db.session import AsyncSessionLocal, get_async_db
 from app.schemas.notification import (
     NotificationResponse,
     NotificationMarkRead
 )
 from app.schemas.common import SuccessResponse
-from app.core.exceptions import NotFoundError, PermissionDeniedError
+from app.core.exceptions import AuthenticationError, NotFoundError, PermissionDeniedError
 from app.models.notification import Notification
 from app.models.user import User
-from app.api.deps import get_current_user
+from app.api.deps import authenticate_user, get_current_user
+from app.repositories.notification_repository import (
+    delete_notification_stmt,
+    mark_read_stmt,
+    unread_count_query,
+)
+from app.services.notification_hub import StreamEvent, notification_hub
+from app.utils.pagination import CursorParams, cursor_params, keyset_paginate, set_page_headers
 
 router = APIRouter()
 
+stream_security = HTTPBearer(auto_error=False)
+
+
+def sse_message(event: StreamEvent) -> str:
+    """Format one hub event as a server-sent event"""
+    name, data = event
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
 
 @router.get("", response_model=List[NotificationResponse])
 async def get_notifications(
+    response: Response,
     unread_only: bool = False,
-    db: Session = Depends(get_db),
+    page: CursorParams = Depends(cursor_params),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all notifications for current user
+    Get notifications for current user, newest first
     """
-    query = db.query(Notification).filter(
+    query = select(Notification).where(
         Notification.user_id == current_user.id
     )
     
+    exact_total = None
     if unread_only:
-        query = query.filter(Notification.is_read == False)
+        query = query.where(Notification.is_read == False)
+        if page.include_total:
+            # The unread counter is exact; no need to ask the planner
+            exact_total = await db.scalar(unread_count_query(current_user.id))
+            page = page.model_copy(update={"include_total": False})
     
-    notifications = query.order_by(Notification.created_at.desc()).all()
+    notifications = await keyset_paginate(
+        db, query, (Notification.created_at, Notification.id), page
+    )
+    if exact_total is not None:
+        notifications.approximate_total = exact_total
+    set_page_headers(response, notifications)
     
-    return notifications
+    return notifications.items
 
 
 @router.get("/unread-count")
 async def get_unread_count(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get count of unread notifications
+    Get count of unread notifications (the user's unread counter)
     """
-    count = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.is_read == False
-    ).count()
+    count = await db.scalar(unread_count_query(current_user.id))
     
     return {"unread_count": count}
 
 
+@router.post("/stream-ticket")
+async def create_notification_stream_ticket(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Issue a short-lived ticket for GET /notifications/stream?ticket=
+    (EventSource cannot send an Authorization header). Fetch a new one
+    before reconnecting once it has expired.
+    """
+    ticket = create_stream_ticket({"sub": str(current_user.id), "role": UserRole.MEMBER})
+    
+    return {"ticket": ticket, "expires_in": settings.NOTIFICATION_STREAM_TICKET_SECONDS}
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    ticket: Optional[str] = Query(None, description="Ticket from POST /notifications/stream-ticket"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(stream_security)
+):
+    """
+    Server-sent events for the current user, replacing unread-count polling.
+    Authenticate with a bearer access token or, from EventSource, a
+    stream ticket; access tokens are not accepted in the URL.
+    Events:
+    - `unread`: {"unread_count": n} on connect and after read-all,
+      {"delta": +1/-1} as notifications arrive or are read
+    - `notification`: a new notification
+    - `resync`: events were dropped; refetch the list and count
+    Comment lines are sent as keepalives.
+    """
+    if credentials:
+        token, token_type = credentials.credentials, "access"
+    elif ticket:
+        token, token_type = ticket, "stream"
+    else:
+        raise AuthenticationError("Not authenticated")
+    
+    # Short-lived session: the stream must not hold a pooled connection.
+    # Subscribe before counting so a notification published in between
+    # is queued rather than missing from both the count and the stream.
+    async with AsyncSessionLocal() as db:
+        user = await authenticate_user(token, db, token_type)
+        queue = notification_hub.subscribe(user.id)
+        try:
+            unread = await db.scalar(unread_count_query(user.id))
+        except BaseException:
+            notification_hub.unsubscribe(user.id, queue)
+            raise
+    
+    async def events():
+        try:
+            yield sse_message(("unread", {"unread_count": unread}))
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), settings.NOTIFICATION_STREAM_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield sse_message(event)
+        finally:
+            notification_hub.unsubscribe(user.id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.put("/{notification_id}/read", response_model=SuccessResponse)
 async def mark_notification_read(
     notification_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Mark notification as read
     """
-    notification = db.query(Notification).filter(
+    notification = await db.scalar(select(Notification).where(
         Notification.id == notification_id
-    ).first()
+    ))
     
     if not notification:
         raise NotFoundError("Notification")
@@ -72,26 +180,28 @@ async def mark_notification_read(
     if str(notification.user_id) != str(current_user.id):
         raise PermissionDeniedError("Not your notification")
     
-    notification.is_read = True
-    db.commit()
+    # Only an unread -> read change moves the counter
+    row = (await db.execute(mark_read_stmt(current_user.id, notification.id))).one()
+    await db.commit()
+    
+    if row.marked:
+        await notification_hub.publish_unread(current_user.id, delta=-row.marked)
     
     return {"message": "Notification marked as read", "success": True}
 
 
 @router.put("/read-all", response_model=SuccessResponse)
 async def mark_all_read(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Mark all notifications as read
     """
-    db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.is_read == False
-    ).update({"is_read": True})
+    row = (await db.execute(mark_read_stmt(current_user.id))).one()
+    await db.commit()
     
-    db.commit()
+    await notification_hub.publish_unread(current_user.id, count=row.unread_notification_count)
     
     return {"message": "All notifications marked as read", "success": True}
 
@@ -99,15 +209,15 @@ async def mark_all_read(
 @router.delete("/{notification_id}", response_model=SuccessResponse)
 async def delete_notification(
     notification_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Delete notification
     """
-    notification = db.query(Notification).filter(
+    notification = await db.scalar(select(Notification).where(
         Notification.id == notification_id
-    ).first()
+    ))
     
     if not notification:
         raise NotFoundError("Notification")
@@ -116,7 +226,10 @@ async def delete_notification(
     if str(notification.user_id) != str(current_user.id):
         raise PermissionDeniedError("Not your notification")
     
-    db.delete(notification)
-    db.commit()
+    row = (await db.execute(delete_notification_stmt(current_user.id, notification.id))).one()
+    await db.commit()
+    
+    if row.was_unread:
+        await notification_hub.publish_unread(current_user.id, delta=-row.was_unread)
     
     return {"message": "Notification deleted successfully", "success": True}
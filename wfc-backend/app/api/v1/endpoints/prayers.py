@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.schemas.prayer import (
     PrayerRequestCreate,
     PrayerRequestUpdate,
@@ -10,11 +12,15 @@ from app.schemas.prayer import (
     PastorResponse
 )
 from app.schemas.common import SuccessResponse
+from app.core.constants import NotificationType
 from app.core.exceptions import NotFoundError, PermissionDeniedError
 from app.models.prayer_request import PrayerRequest
 from app.models.user import User
-from app.models.branch import Branch
 from app.api.deps import get_current_admin, get_current_user
+from app.repositories.prayer_repository import prayer_with_author, prayer_with_author_query
+from app.services.notification_service import notify_users
+from app.services.prayer_service import get_prayer_wall, invalidate_prayer
+from app.utils.pagination import CursorParams, cursor_params, set_page_headers
 
 router = APIRouter()
 
@@ -22,7 +28,7 @@ router = APIRouter()
 @router.post("", response_model=PrayerRequestResponse, status_code=status.HTTP_201_CREATED)
 async def create_prayer_request(
     prayer_data: PrayerRequestCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -35,74 +41,61 @@ async def create_prayer_request(
     )
     
     db.add(new_prayer)
-    db.commit()
-    db.refresh(new_prayer)
+    await db.commit()
+    await db.refresh(new_prayer)
+    invalidate_prayer(new_prayer)
     
     return new_prayer
 
 
 @router.get("", response_model=List[PrayerRequestWithUser])
 async def get_all_prayers(
-    db: Session = Depends(get_db),
+    page: CursorParams = Depends(cursor_params),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all prayer requests from all branches (global visibility)
+    Get prayer requests from all branches, newest first (global visibility)
     """
-    prayers = db.query(PrayerRequest, User.full_name, Branch.branch_name).join(
-        User, PrayerRequest.user_id == User.id
-    ).join(
-        Branch, User.branch_id == Branch.id
-    ).order_by(PrayerRequest.created_at.desc()).all()
-    
-    result = []
-    for prayer, user_name, branch_name in prayers:
-        prayer_dict = PrayerRequestWithUser.from_orm(prayer).dict()
-        prayer_dict['user_name'] = user_name
-        prayer_dict['user_branch'] = branch_name
-        result.append(prayer_dict)
-    
-    return result
+    prayers = await get_prayer_wall(db, page)
+    
+    # Pages are cached already serialized
+    response = JSONResponse(prayers.items)
+    set_page_headers(response, prayers)
+    
+    return response
 
 
 @router.get("/{prayer_id}", response_model=PrayerRequestWithUser)
 async def get_prayer(
     prayer_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get prayer request by ID
     """
-    result = db.query(PrayerRequest, User.full_name, Branch.branch_name).join(
-        User, PrayerRequest.user_id == User.id
-    ).join(
-        Branch, User.branch_id == Branch.id
-    ).filter(PrayerRequest.id == prayer_id).first()
+    row = (await db.execute(prayer_with_author_query().where(
+        PrayerRequest.id == prayer_id
+    ))).first()
     
-    if not result:
+    if not row:
         raise NotFoundError("Prayer request")
     
-    prayer, user_name, branch_name = result
-    
-    prayer_dict = PrayerRequestWithUser.from_orm(prayer).dict()
-    prayer_dict['user_name'] = user_name
-    prayer_dict['user_branch'] = branch_name
-    
-    return prayer_dict
+    return prayer_with_author(row)
 
 
 @router.put("/{prayer_id}", response_model=PrayerRequestResponse)
 async def update_prayer(
     prayer_id: str,
     prayer_data: PrayerRequestUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Update prayer request (only creator can update)
     """
-    prayer = db.query(PrayerRequest).filter(PrayerRequest.id == prayer_id).first()
+    prayer = await db.scalar(select(PrayerRequest).where(PrayerRequest.id == prayer_id))
     
     if not prayer:
         raise NotFoundError("Prayer request")
@@ -118,8 +111,9 @@ async def update_prayer(
     if prayer_data.content:
         prayer.content = prayer_data.content
     
-    db.commit()
-    db.refresh(prayer)
+    await db.commit()
+    await db.refresh(prayer)
+    invalidate_prayer(prayer)
     
     return prayer
 
@@ -127,13 +121,13 @@ async def update_prayer(
 @router.delete("/{prayer_id}", response_model=SuccessResponse)
 async def delete_prayer(
     prayer_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Delete prayer request (only creator can delete)
     """
-    prayer = db.query(PrayerRequest).filter(PrayerRequest.id == prayer_id).first()
+    prayer = await db.scalar(select(PrayerRequest).where(PrayerRequest.id == prayer_id))
     
     if not prayer:
         raise NotFoundError("Prayer request")
@@ -142,8 +136,9 @@ async def delete_prayer(
     if str(prayer.user_id) != str(current_user.id):
         raise PermissionDeniedError("You can only delete your own prayer requests")
     
-    db.delete(prayer)
-    db.commit()
+    await db.delete(prayer)
+    await db.commit()
+    invalidate_prayer(prayer)
     
     return {"message": "Prayer request deleted successfully", "success": True}
 
@@ -152,20 +147,25 @@ async def delete_prayer(
 async def add_pastor_response(
     prayer_id: str,
     response_data: PastorResponse,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """
     Add pastor response to prayer request (Admin only)
     """
-    prayer = db.query(PrayerRequest).filter(PrayerRequest.id == prayer_id).first()
+    prayer = await db.scalar(select(PrayerRequest).where(PrayerRequest.id == prayer_id))
     
     if not prayer:
         raise NotFoundError("Prayer request")
     
     prayer.pastor_response = response_data.response
-    db.commit()
+    await db.commit()
+    invalidate_prayer(prayer)
     
-    # TODO: Send notification to prayer requester
+    notify_users(
+        [prayer.user_id],
+        "A pastor has responded to your prayer request",
+        NotificationType.PRAYER_RESPONSE
+    )
     
     return {"message": "Response added successfully", "success": True}
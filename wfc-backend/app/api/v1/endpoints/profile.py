@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.schemas.user import UserUpdate, UserResponse
 from app.schemas.auth import PasswordChange
 from app.schemas.common import SuccessResponse
-from app.core.security import verify_password, get_password_hash, validate_password_strength
+from app.core.security import password_hasher, validate_password_strength
 from app.core.exceptions import ValidationError, AuthenticationError
 from app.models.user import User
 from app.api.deps import get_current_user
+from app.services.auth_service import invalidate_user
+from app.services.prayer_service import invalidate_prayer_wall
 
 router = APIRouter()
 
@@ -24,20 +26,25 @@ async def get_profile(current_user: User = Depends(get_current_user)):
 async def update_profile(
     profile_data: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update current user's profile
     """
     # Update fields if provided
+    renamed = bool(profile_data.full_name) and profile_data.full_name != current_user.full_name
     if profile_data.full_name:
         current_user.full_name = profile_data.full_name
     
     if profile_data.profile_image is not None:
         current_user.profile_image = profile_data.profile_image
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    invalidate_user(current_user.id)
+    if renamed:
+        # Author names are baked into cached prayer wall pages
+        invalidate_prayer_wall()
     
     return current_user
 
@@ -46,13 +53,13 @@ async def update_profile(
 async def change_password(
     password_data: PasswordChange,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Change user password
     """
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not await password_hasher.verify(password_data.current_password, current_user.password_hash):
         raise AuthenticationError("Current password is incorrect")
     
     # Validate new password strength
@@ -61,7 +68,8 @@ async def change_password(
         raise ValidationError(error_msg)
     
     # Update password
-    current_user.password_hash = get_password_hash(password_data.new_password)
-    db.commit()
+    current_user.password_hash = await password_hasher.hash(password_data.new_password)
+    await db.commit()
+    invalidate_user(current_user.id)
     
     return {"message": "Password changed successfully", "success": True}
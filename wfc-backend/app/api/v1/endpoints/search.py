@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.db.session import get_async_db
+from app.schemas.search import SearchResult
+from app.core.constants import SearchKind
+from app.models.user import User
+from app.api.deps import get_current_user
+from app.repositories.search_repository import search_query, search_result
+from app.utils.pagination import CursorParams, cursor_params, keyset_paginate, set_page_headers
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[SearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200, description='Words, "quoted phrases", OR, -excluded'),
+    kind: Optional[List[SearchKind]] = Query(None, description="Limit to these content types"),
+    page: CursorParams = Depends(cursor_params),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Full-text search across sermons, published blogs and prayer requests,
+    best match first, with highlighted snippets
+    """
+    query = search_query(q, kind)
+    
+    results = await keyset_paginate(
+        db, query, (query.selected_columns.rank, query.selected_columns.id), page
+    )
+    set_page_headers(response, results)
+    
+    return [search_result(row) for row in results.items]
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.schemas.sermon_category import (
     SermonCategoryCreate,
     SermonCategoryUpdate,
@@ -12,7 +13,7 @@ from app.schemas.sermon_category import (
 )
 from app.schemas.common import SuccessResponse
 from app.core.exceptions import NotFoundError, ConflictError, AuthenticationError
-from app.core.security import decode_token
+from app.core.security import decode_token_cached
 from app.core.constants import UserRole
 
 from app.models.sermon_category import SermonCategory
@@ -36,7 +37,7 @@ async def get_current_actor(
 
     Used ONLY for READ operations
     """
-    payload = decode_token(credentials.credentials)
+    payload = decode_token_cached(credentials.credentials)
 
     if payload.get("type") != "access":
         raise AuthenticationError("Invalid token type")
@@ -55,12 +56,12 @@ async def get_current_actor(
 @router.post("", response_model=SermonCategoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category_data: SermonCategoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin=Depends(get_current_admin)
 ):
-    existing = db.query(SermonCategory).filter(
+    existing = await db.scalar(select(SermonCategory).where(
         SermonCategory.name == category_data.name
-    ).first()
+    ))
 
     if existing:
         raise ConflictError("Category with this name already exists")
@@ -71,8 +72,8 @@ async def create_category(
     )
 
     db.add(new_category)
-    db.commit()
-    db.refresh(new_category)
+    await db.commit()
+    await db.refresh(new_category)
 
     return new_category
 
@@ -82,16 +83,16 @@ async def create_category(
 # =========================================================
 @router.get("", response_model=List[SermonCategoryWithCount])
 async def get_all_categories(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     actor = Depends(get_current_actor),
 ):
-    categories = db.query(SermonCategory).all()
+    categories = (await db.scalars(select(SermonCategory))).all()
     result = []
 
     for category in categories:
-        sermon_count = db.query(Sermon).filter(
+        sermon_count = await db.scalar(select(func.count()).select_from(Sermon).where(
             Sermon.category_id == category.id
-        ).count()
+        ))
 
         # Build the response dict manually instead of using from_orm
         category_dict = {
@@ -114,12 +115,12 @@ async def get_all_categories(
 @router.get("/{category_id}", response_model=SermonCategoryResponse)
 async def get_category(
     category_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     actor=Depends(get_current_actor)
 ):
-    category = db.query(SermonCategory).filter(
+    category = await db.scalar(select(SermonCategory).where(
         SermonCategory.id == category_id
-    ).first()
+    ))
 
     if not category:
         raise NotFoundError("Category")
@@ -134,21 +135,21 @@ async def get_category(
 async def update_category(
     category_id: str,
     category_data: SermonCategoryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin=Depends(get_current_admin)
 ):
-    category = db.query(SermonCategory).filter(
+    category = await db.scalar(select(SermonCategory).where(
         SermonCategory.id == category_id
-    ).first()
+    ))
 
     if not category:
         raise NotFoundError("Category")
 
     if category_data.name:
-        existing = db.query(SermonCategory).filter(
+        existing = await db.scalar(select(SermonCategory).where(
             SermonCategory.name == category_data.name,
             SermonCategory.id != category_id
-        ).first()
+        ))
 
         if existing:
             raise ConflictError("Category with this name already exists")
@@ -158,8 +159,8 @@ async def update_category(
     if category_data.description is not None:
         category.description = category_data.description
 
-    db.commit()
-    db.refresh(category)
+    await db.commit()
+    await db.refresh(category)
 
     return category
 
@@ -170,27 +171,27 @@ async def update_category(
 @router.delete("/{category_id}", response_model=SuccessResponse)
 async def delete_category(
     category_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin=Depends(get_current_admin)
 ):
-    category = db.query(SermonCategory).filter(
+    category = await db.scalar(select(SermonCategory).where(
         SermonCategory.id == category_id
-    ).first()
+    ))
 
     if not category:
         raise NotFoundError("Category")
 
-    sermon_count = db.query(Sermon).filter(
+    sermon_count = await db.scalar(select(func.count()).select_from(Sermon).where(
         Sermon.category_id == category_id
-    ).count()
+    ))
 
     if sermon_count > 0:
         raise ConflictError(
             f"Cannot delete category with {sermon_count} sermons"
         )
 
-    db.delete(category)
-    db.commit()
+    await db.delete(category)
+    await db.commit()
 
     return {
         "message": "Category deleted successfully",
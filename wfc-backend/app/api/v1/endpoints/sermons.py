@@ -1,12 +1,17 @@
 # app/api/v1/endpoints/sermons.py
 
-from fastapi import APIRouter, Depends, status,Form, File, UploadFile
+import csv
+import io
+
+from fastapi import APIRouter, Depends, Response, status,Form, File, UploadFile
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_async_db
 from app.schemas.sermon import (
     SermonCreate,
     SermonUpdate,
@@ -14,22 +19,40 @@ from app.schemas.sermon import (
     SermonWithStats,
     SermonViewCreate,
     SermonLikeToggle,
+    SermonEngagementResponse,
+    SermonAnalytics,
+    SermonAudienceMember,
 )
 from app.schemas.common import SuccessResponse
 from app.core.exceptions import NotFoundError, ValidationError, AuthenticationError
-from app.core.security import decode_token
-from app.core.constants import UserRole
+from app.core.security import decode_token_cached
+from app.core.constants import NotificationType, SermonAudience, UserRole
 from app.models.sermon import Sermon
-from app.models.sermon_view import SermonView
 from app.models.sermon_category import SermonCategory
 from app.models.user import User
 from app.api.deps import get_current_admin, get_current_user
+from app.repositories.sermon_repository import (
+    sermon_stats_query,
+    sermon_with_stats,
+    record_view_stmt,
+    toggle_like_stmt,
+    sermon_analytics_query,
+    sermon_audience_query,
+    view_state_query,
+)
 from app.services.vimeo import upload_video_to_vimeo
+from app.services.analytics_service import invalidate_dashboard_stats
+from app.services.notification_service import notify_all_members
+from app.services.view_buffer import FULL, QUEUED, SERMON, view_buffer
+from app.utils.pagination import CursorParams, cursor_params, keyset_paginate, set_page_headers
+from app.utils.validators import validate_uuid
 
 router = APIRouter()
 
 security = HTTPBearer()
 
+EXPORT_BATCH_SIZE = 1000
+
 # =========================================================
 # SHARED AUTH (USER OR ADMIN) – READ ACCESS ONLY
 # =========================================================
@@ -43,7 +66,7 @@ async def get_current_actor(
     - Active ADMIN
     Used ONLY for READ operations on sermons.
     """
-    payload = decode_token(credentials.credentials)
+    payload = decode_token_cached(credentials.credentials)
     if payload.get("type") != "access":
         raise AuthenticationError("Invalid token type")
 
@@ -54,6 +77,26 @@ async def get_current_actor(
     return payload
 
 
+def actor_member_id(actor: dict) -> Optional[str]:
+    """Return the member's user id from an actor payload (None for admins)"""
+    if actor.get("role") == UserRole.MEMBER:
+        return actor.get("sub")
+    return None
+
+
+def engagement_response(sermon_id: str, row, message: str) -> dict:
+    """Build the view/like response from a record_view/toggle_like row"""
+    return {
+        "message": message,
+        "success": True,
+        "sermon_id": sermon_id,
+        "total_views": row.total_views,
+        "total_likes": row.total_likes,
+        "user_has_viewed": True,
+        "user_has_liked": bool(row.user_has_liked),
+    }
+
+
 # =========================================================
 # CREATE SERMON (ADMIN ONLY)
 # =========================================================
@@ -65,23 +108,23 @@ async def get_current_actor(
 )
 async def create_sermon(
     sermon_data: SermonCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin),
 ):
     """
     Create sermon with Vimeo video metadata (Admin only)
     """
     # Verify category exists
-    category = db.query(SermonCategory).filter(
+    category = await db.scalar(select(SermonCategory).where(
         SermonCategory.id == sermon_data.category_id
-    ).first()
+    ))
     if not category:
         raise ValidationError("Invalid category ID")
 
     # Check if video_id already exists
-    existing = db.query(Sermon).filter(
+    existing = await db.scalar(select(Sermon).where(
         Sermon.video_id == sermon_data.video_id
-    ).first()
+    ))
     if existing:
         raise ValidationError("Sermon with this video already exists")
 
@@ -97,10 +140,11 @@ async def create_sermon(
     )
 
     db.add(new_sermon)
-    db.commit()
-    db.refresh(new_sermon)
+    await db.commit()
+    invalidate_dashboard_stats()
+    await db.refresh(new_sermon)
+    notify_all_members(f"New sermon: {new_sermon.title}", NotificationType.SERMON_UPLOADED)
 
-    # TODO: Create notification for all users
     return new_sermon
 
 
@@ -110,40 +154,24 @@ async def create_sermon(
 
 @router.get("", response_model=List[SermonWithStats])
 async def get_all_sermons(
+    response: Response,
     category_id: Optional[str] = None,
-    db: Session = Depends(get_db),
+    page: CursorParams = Depends(cursor_params),
+    db: AsyncSession = Depends(get_async_db),
     actor = Depends(get_current_actor),
 ):
     """
-    Get all sermons with view statistics (User + Admin)
+    Get sermons with view statistics, newest first (User + Admin)
+    Paginated by cursor: pass X-Next-Cursor back as ?cursor=
     """
-    query = db.query(Sermon)
+    query = sermon_stats_query(user_id=actor_member_id(actor))
     if category_id:
-        query = query.filter(Sermon.category_id == category_id)
-
-    sermons = query.order_by(Sermon.created_at.desc()).all()
-    result = []
+        query = query.where(Sermon.category_id == category_id)
 
-    for sermon in sermons:
-        # Get view stats
-        total_views = db.query(SermonView).filter(
-            SermonView.sermon_id == sermon.id
-        ).count()
-        total_likes = db.query(SermonView).filter(
-            SermonView.sermon_id == sermon.id,
-            SermonView.liked == True,
-        ).count()
+    result = await keyset_paginate(db, query, (Sermon.created_at, Sermon.id), page)
+    set_page_headers(response, result)
 
-        # For list views we do not need per-user flags; set them to False
-        sermon_dict = SermonWithStats.from_orm(sermon).dict()
-        sermon_dict["total_views"] = total_views
-        sermon_dict["total_likes"] = total_likes
-        sermon_dict["user_has_viewed"] = False
-        sermon_dict["user_has_liked"] = False
-
-        result.append(sermon_dict)
-
-    return result
+    return [sermon_with_stats(row) for row in result.items]
 
 
 # =========================================================
@@ -153,31 +181,19 @@ async def get_all_sermons(
 @router.get("/{sermon_id}", response_model=SermonWithStats)
 async def get_sermon(
     sermon_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     actor = Depends(get_current_actor),
 ):
     """
     Get sermon by ID with statistics (User + Admin)
     """
-    sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
-    if not sermon:
+    row = (await db.execute(sermon_stats_query(user_id=actor_member_id(actor)).where(
+        Sermon.id == sermon_id
+    ))).first()
+    if not row:
         raise NotFoundError("Sermon")
 
-    total_views = db.query(SermonView).filter(
-        SermonView.sermon_id == sermon.id
-    ).count()
-    total_likes = db.query(SermonView).filter(
-        SermonView.sermon_id == sermon.id,
-        SermonView.liked == True,
-    ).count()
-
-    sermon_dict = SermonWithStats.from_orm(sermon).dict()
-    sermon_dict["total_views"] = total_views
-    sermon_dict["total_likes"] = total_likes
-    sermon_dict["user_has_viewed"] = False
-    sermon_dict["user_has_liked"] = False
-
-    return sermon_dict
+    return sermon_with_stats(row)
 
 
 # =========================================================
@@ -188,13 +204,13 @@ async def get_sermon(
 async def update_sermon(
     sermon_id: str,
     sermon_data: SermonUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin),
 ):
     """
     Update sermon (Admin only)
     """
-    sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
+    sermon = await db.scalar(select(Sermon).where(Sermon.id == sermon_id))
     if not sermon:
         raise NotFoundError("Sermon")
 
@@ -207,15 +223,15 @@ async def update_sermon(
 
     if sermon_data.category_id:
         # Verify category exists
-        category = db.query(SermonCategory).filter(
+        category = await db.scalar(select(SermonCategory).where(
             SermonCategory.id == sermon_data.category_id
-        ).first()
+        ))
         if not category:
             raise ValidationError("Invalid category ID")
         sermon.category_id = sermon_data.category_id
 
-    db.commit()
-    db.refresh(sermon)
+    await db.commit()
+    await db.refresh(sermon)
 
     return sermon
 
@@ -227,22 +243,23 @@ async def update_sermon(
 @router.delete("/{sermon_id}", response_model=SuccessResponse)
 async def delete_sermon(
     sermon_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin),
 ):
     """
     Delete sermon (Admin only)
     Also deletes from Vimeo (handled in service layer)
     """
-    sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
+    sermon = await db.scalar(select(Sermon).where(Sermon.id == sermon_id))
     if not sermon:
         raise NotFoundError("Sermon")
 
     video_id = sermon.video_id
 
     # Delete from database (cascade will delete views)
-    db.delete(sermon)
-    db.commit()
+    await db.delete(sermon)
+    await db.commit()
+    invalidate_dashboard_stats()
 
     # TODO: Delete from Vimeo using video_id
     return {"message": "Sermon deleted successfully", "success": True}
@@ -252,139 +269,177 @@ async def delete_sermon(
 # MARK SERMON VIEWED (USER ONLY)
 # =========================================================
 
-@router.post("/{sermon_id}/view", response_model=SuccessResponse)
+@router.post("/{sermon_id}/view", response_model=SermonEngagementResponse)
 async def mark_sermon_viewed(
     sermon_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Mark sermon as viewed by current user (Member only)
+    Idempotent; returns the sermon's updated counts. While the view
+    buffer runs the view is queued and written within a flush interval,
+    and the counts include it ahead of the write. A view the buffer
+    cannot take (it is full) is written now instead.
     """
-    sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
-    if not sermon:
+    if view_buffer.running:
+        if not validate_uuid(sermon_id):
+            raise NotFoundError("Sermon")
+        row = (await db.execute(view_state_query(sermon_id, current_user.id))).first()
+        if not row:
+            raise NotFoundError("Sermon")
+        
+        outcome = view_buffer.add(SERMON, sermon_id, current_user.id)
+        if outcome != FULL:
+            newly_viewed = outcome == QUEUED and not row.user_has_viewed
+            message = "Sermon marked as viewed" if newly_viewed else "Sermon already marked as viewed"
+            return {
+                "message": message,
+                "success": True,
+                "sermon_id": sermon_id,
+                # A view still in the buffer is not in view_count yet
+                "total_views": row.total_views + (0 if row.user_has_viewed else 1),
+                "total_likes": row.total_likes,
+                "user_has_viewed": True,
+                "user_has_liked": bool(row.user_has_liked),
+            }
+
+    row = (await db.execute(record_view_stmt(sermon_id, current_user.id))).first()
+    if not row:
         raise NotFoundError("Sermon")
+    await db.commit()
 
-    # Check if already viewed
-    existing_view = db.query(SermonView).filter(
-        SermonView.sermon_id == sermon_id,
-        SermonView.user_id == current_user.id,
-    ).first()
-
-    if existing_view:
-        return {"message": "Sermon already marked as viewed", "success": True}
-
-    # Create view record
-    new_view = SermonView(
-        sermon_id=sermon_id,
-        user_id=current_user.id,
-        liked=False,
-    )
-
-    db.add(new_view)
-    db.commit()
-
-    return {"message": "Sermon marked as viewed", "success": True}
+    message = "Sermon marked as viewed" if row.newly_viewed else "Sermon already marked as viewed"
+    return engagement_response(sermon_id, row, message)
 
 
 # =========================================================
 # TOGGLE SERMON LIKE (USER ONLY)
 # =========================================================
 
-@router.post("/{sermon_id}/like", response_model=SuccessResponse)
+@router.post("/{sermon_id}/like", response_model=SermonEngagementResponse)
 async def toggle_sermon_like(
     sermon_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Toggle like on sermon (automatically marks as viewed)
+    Returns the new like state and the sermon's updated counts
     """
-    sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
-    if not sermon:
+    row = (await db.execute(toggle_like_stmt(sermon_id, current_user.id))).first()
+    if not row:
         raise NotFoundError("Sermon")
+    await db.commit()
 
-    # Check if already viewed
-    view = db.query(SermonView).filter(
-        SermonView.sermon_id == sermon_id,
-        SermonView.user_id == current_user.id,
-    ).first()
-
-    if not view:
-        # Create view record with like
-        view = SermonView(
-            sermon_id=sermon_id,
-            user_id=current_user.id,
-            liked=True,
-        )
-        db.add(view)
-        message = "Sermon liked"
-    else:
-        # Toggle like
-        view.liked = not view.liked
-        message = "Sermon liked" if view.liked else "Sermon unliked"
-
-    db.commit()
-
-    return {"message": message, "success": True}
+    message = "Sermon liked" if row.user_has_liked else "Sermon unliked"
+    return engagement_response(sermon_id, row, message)
 
 
 # =========================================================
 # SERMON ANALYTICS (ADMIN ONLY)
 # =========================================================
 
-@router.get("/{sermon_id}/analytics")
+@router.get("/{sermon_id}/analytics", response_model=SermonAnalytics)
 async def get_sermon_analytics(
     sermon_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin),
 ):
     """
-    Get detailed sermon analytics (Admin only)
-    Shows who watched, who didn't, likes count
+    Get sermon engagement totals (Admin only)
+    Who watched, liked or didn't watch is listed by
+    /{sermon_id}/analytics/{audience} (paginated) and .../export (CSV)
     """
-    sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
-    if not sermon:
+    row = (await db.execute(sermon_analytics_query(sermon_id))).first()
+    if not row:
         raise NotFoundError("Sermon")
 
-    # Get all approved users
-    all_users = db.query(User).filter(User.status == "approved").all()
-
-    # Get users who viewed
-    viewed_users = db.query(User).join(SermonView).filter(
-        SermonView.sermon_id == sermon_id
-    ).all()
-
-    # Get users who liked
-    liked_users = db.query(User).join(SermonView).filter(
-        SermonView.sermon_id == sermon_id,
-        SermonView.liked == True,
-    ).all()
-
-    # Calculate who didn't watch
-    viewed_user_ids = {user.id for user in viewed_users}
-    not_watched = [
-        {"id": str(user.id), "name": user.full_name, "email": user.email}
-        for user in all_users
-        if user.id not in viewed_user_ids
-    ]
-
     return {
-        "sermon_id": str(sermon.id),
-        "sermon_title": sermon.title,
-        "total_views": len(viewed_users),
-        "total_likes": len(liked_users),
-        "total_users": len(all_users),
-        "viewed_by": [
-            {"id": str(user.id), "name": user.full_name, "email": user.email}
-            for user in viewed_users
-        ],
-        "liked_by": [
-            {"id": str(user.id), "name": user.full_name, "email": user.email}
-            for user in liked_users
-        ],
-        "not_watched_by": not_watched,
+        "sermon_id": sermon_id,
+        "sermon_title": row.title,
+        "total_views": row.total_views,
+        "total_likes": row.total_likes,
+        "total_users": row.total_users,
+        "total_not_watched": row.total_not_watched,
     }
+
+
+@router.get("/{sermon_id}/analytics/{audience}", response_model=List[SermonAudienceMember])
+async def get_sermon_audience(
+    sermon_id: str,
+    audience: SermonAudience,
+    response: Response,
+    page: CursorParams = Depends(cursor_params),
+    db: AsyncSession = Depends(get_async_db),
+    current_admin = Depends(get_current_admin),
+):
+    """
+    List members who viewed, liked or have not watched a sermon,
+    by name (Admin only). Paginated by cursor: pass X-Next-Cursor back
+    as ?cursor=
+    """
+    if not await db.scalar(select(Sermon.id).where(Sermon.id == sermon_id)):
+        raise NotFoundError("Sermon")
+
+    users = await keyset_paginate(
+        db,
+        sermon_audience_query(sermon_id, audience),
+        (User.full_name, User.id),
+        page,
+        descending=False,
+    )
+    set_page_headers(response, users)
+
+    return [
+        {"id": user.id, "name": user.full_name, "email": user.email}
+        for user in users.items
+    ]
+
+
+@router.get("/{sermon_id}/analytics/{audience}/export")
+async def export_sermon_audience(
+    sermon_id: str,
+    audience: SermonAudience,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin = Depends(get_current_admin),
+):
+    """
+    Download a sermon audience list as CSV (Admin only)
+    Rows are streamed from a server-side cursor, so memory use does not
+    grow with the number of members.
+    """
+    if not await db.scalar(select(Sermon.id).where(Sermon.id == sermon_id)):
+        raise NotFoundError("Sermon")
+
+    query = sermon_audience_query(sermon_id, audience).order_by(User.full_name, User.id)
+
+    async def rows():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["id", "name", "email"])
+        # Own session: the request's session is closed once streaming starts
+        async with AsyncSessionLocal() as stream_db:
+            result = await stream_db.stream_scalars(
+                query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            async for users in result.partitions():
+                for user in users:
+                    writer.writerow([user.id, user.full_name, user.email])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return StreamingResponse(
+        rows(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="sermon-{sermon_id}-{audience.value}.csv"'
+        },
+    )
+
+
 @router.post(
     "/upload",
     response_model=SermonResponse,
@@ -395,16 +450,16 @@ async def upload_sermon_video(
     description: str = Form(""),
     category_id: str = Form(...),
     video_file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin),
 ):
     """
     Upload a sermon video, push to Vimeo, store metadata (Admin only).
     """
     # Validate category
-    category = db.query(SermonCategory).filter(
+    category = await db.scalar(select(SermonCategory).where(
         SermonCategory.id == category_id
-    ).first()
+    ))
     if not category:
         raise ValidationError("Invalid category ID")
 
@@ -431,7 +486,9 @@ async def upload_sermon_video(
     )
 
     db.add(new_sermon)
-    db.commit()
-    db.refresh(new_sermon)
+    await db.commit()
+    invalidate_dashboard_stats()
+    await db.refresh(new_sermon)
+    notify_all_members(f"New sermon: {new_sermon.title}", NotificationType.SERMON_UPLOADED)
 
     return new_sermon
\ No newline at end of file
@@ -1,32 +1,73 @@
-from fastapi import APIRouter, Depends, Query, Body
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import Optional
-from app.db.session import get_db
+import logging
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, exists
+from typing import List, Optional, Tuple
+from uuid import UUID
+from app.db.session import get_async_db
 from app.schemas.common import SuccessResponse
-from app.core.constants import UserStatus
+from app.schemas.user import BulkUserAction
+from app.core.constants import NotificationType, UserStatus
 from app.core.exceptions import NotFoundError, PermissionDeniedError
 from app.models.user import User
-from app.models.branch import Branch
 from app.api.deps import get_current_admin
+from app.repositories.user_repository import (
+    branch_name_criterion,
+    bulk_set_status_stmt,
+    user_listing_query,
+    user_search_criterion,
+    user_search_order,
+)
+from app.services.auth_service import invalidate_user, invalidate_users
+from app.services.analytics_service import invalidate_dashboard_stats
+from app.services.notification_service import notify_users
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-def user_to_dict(user):
-    """Convert User object to dictionary safely"""
+def user_to_dict(user: User) -> dict:
+    """Serialize a User whose branch is already loaded"""
+    branch = user.branch
     return {
         "user_id": str(user.id),
         "email": user.email,
-        "full_name": user.full_name if hasattr(user, 'full_name') else None,
-        "phone": user.phone if hasattr(user, 'phone') else None,
-        "address": user.address if hasattr(user, 'address') else None,
+        "full_name": user.full_name,
+        # Not collected at registration; kept for API compatibility
+        "phone": None,
+        "address": None,
         "status": user.status,
         "branch_id": str(user.branch_id) if user.branch_id else None,
-        "branch_name": user.branch.branch_name if user.branch else None,
-        "profile_image": user.profile_image if hasattr(user, 'profile_image') else None,
-        "created_at": user.created_at.isoformat() if hasattr(user, 'created_at') and user.created_at else None,
-        "updated_at": user.updated_at.isoformat() if hasattr(user, 'updated_at') and user.updated_at else None,
+        "branch_name": branch.branch_name if branch else None,
+        "profile_image": user.profile_image,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+    }
+
+
+async def fetch_user_page(db: AsyncSession, query, page: int, limit: int) -> Tuple[List[User], int]:
+    """Run a user_listing_query page; returns (users, total)"""
+    offset = (page - 1) * limit
+    rows = (await db.execute(query.offset(offset).limit(limit))).all()
+    if rows:
+        return [row.User for row in rows], rows[0].total
+    if offset == 0:
+        return [], 0
+    # Past the last page there is no row to carry the window count
+    total = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+    return [], total
+
+
+def page_response(users: List[User], total: int, page: int, limit: int) -> dict:
+    return {
+        "users": [user_to_dict(user) for user in users],
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "total_pages": (total + limit - 1) // limit if total > 0 else 1
+        }
     }
 
 
@@ -34,67 +75,53 @@ def user_to_dict(user):
 async def get_pending_users(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """Get all pending user registrations (Admin only)"""
-    offset = (page - 1) * limit
-    total = db.query(User).filter(User.status == UserStatus.PENDING).count()
-    
-    pending_users = db.query(User).outerjoin(
-        Branch, User.branch_id == Branch.id
-    ).filter(
+    query = user_listing_query().where(
         User.status == UserStatus.PENDING
-    ).offset(offset).limit(limit).all()
+    ).order_by(User.created_at.desc(), User.id)
     
-    result = [user_to_dict(user) for user in pending_users]
+    users, total = await fetch_user_page(db, query, page, limit)
     
-    return {
-        "users": result,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": (total + limit - 1) // limit if total > 0 else 1
-        }
-    }
+    return page_response(users, total, page, limit)
 
 
 @router.get("", response_model=dict)
 async def get_all_users(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    search: Optional[str] = Query(None),
+    search: Optional[str] = Query(None, max_length=255, description="Name or email; substring and fuzzy"),
     status: Optional[str] = Query(None),
-    branch: Optional[str] = Query(None),
-    sort_by: str = Query("created_at"),
+    branch_id: Optional[UUID] = Query(None),
+    branch: Optional[str] = Query(None, description="Part of a branch name; branch_id is faster"),
+    sort_by: Optional[str] = Query(None, description="Defaults to relevance when searching, else created_at"),
     sort_order: str = Query("desc"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """Get all users with optional filters (Admin only)"""
-    offset = (page - 1) * limit
-    query = db.query(User).outerjoin(Branch, User.branch_id == Branch.id)
+    query = user_listing_query()
     
+    search = search.strip() if search else None
     if search:
-        search_term = f"%{search}%"
-        search_filters = [
-            User.email.ilike(search_term),
-            User.full_name.ilike(search_term)
-        ]
-        if hasattr(User, 'phone'):
-            search_filters.append(User.phone.ilike(search_term))
-        query = query.filter(or_(*search_filters))
+        query = query.where(user_search_criterion(search))
     
     if status:
-        query = query.filter(User.status == status)
+        query = query.where(User.status == status)
     
-    if branch:
-        query = query.filter(Branch.branch_name.ilike(f"%{branch}%"))
+    if branch_id:
+        query = query.where(User.branch_id == branch_id)
+    elif branch:
+        query = query.where(branch_name_criterion(branch))
     
-    total = query.count()
+    if sort_by is None:
+        sort_by = "relevance" if search else "created_at"
     
-    if sort_by == "created_at" and hasattr(User, 'created_at'):
+    if sort_by == "relevance" and search:
+        query = query.order_by(*user_search_order(search))
+    elif sort_by == "created_at":
         query = query.order_by(User.created_at.desc() if sort_order == "desc" else User.created_at.asc())
     elif sort_by == "email":
         query = query.order_by(User.email.desc() if sort_order == "desc" else User.email.asc())
@@ -103,28 +130,22 @@ async def get_all_users(
     elif sort_by == "status":
         query = query.order_by(User.status.desc() if sort_order == "desc" else User.status.asc())
     
-    users = query.offset(offset).limit(limit).all()
-    result = [user_to_dict(user) for user in users]
+    # Stable pages when the sort column has ties
+    query = query.order_by(User.id)
     
-    return {
-        "users": result,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": (total + limit - 1) // limit if total > 0 else 1
-        }
-    }
+    users, total = await fetch_user_page(db, query, page, limit)
+    
+    return page_response(users, total, page, limit)
 
 
 @router.post("/{user_id}/approve", response_model=SuccessResponse)
 async def approve_user(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """Approve user - works for PENDING and REVOKED users (Admin only)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     
     if not user:
         raise NotFoundError("User")
@@ -138,14 +159,17 @@ async def approve_user(
     
     old_status = user.status
     user.status = UserStatus.APPROVED
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_user(user.id)
+    invalidate_dashboard_stats()
+    notify_users([user.id], "Your account has been approved. Welcome!", NotificationType.USER_APPROVED)
     
     message = f"User {user.email} approved successfully"
     if old_status == UserStatus.REVOKED:
         message = f"User {user.email} access restored successfully"
     
-    print(f"✅ {message} (was: {old_status})")
+    logger.info("%s (was: %s)", message, old_status)
     
     return {"message": message, "success": True}
 
@@ -153,11 +177,11 @@ async def approve_user(
 @router.post("/{user_id}/reject", response_model=SuccessResponse)
 async def reject_user(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """Reject user - marks as REVOKED instead of deleting (Admin only)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     
     if not user:
         raise NotFoundError("User")
@@ -167,10 +191,12 @@ async def reject_user(
     
     old_status = user.status
     user.status = UserStatus.REVOKED
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_user(user.id)
+    invalidate_dashboard_stats()
     
-    print(f"🔴 Revoked {user.email} (was: {old_status})")
+    logger.info("Revoked %s (was: %s)", user.email, old_status)
     
     return {"message": f"User {user.email} access revoked successfully", "success": True}
 
@@ -178,11 +204,11 @@ async def reject_user(
 @router.post("/{user_id}/revoke", response_model=SuccessResponse)
 async def revoke_user(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """Revoke user access (Admin only)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     
     if not user:
         raise NotFoundError("User")
@@ -192,217 +218,117 @@ async def revoke_user(
     
     old_status = user.status
     user.status = UserStatus.REVOKED
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_user(user.id)
+    invalidate_dashboard_stats()
     
-    print(f"🔴 Revoked {user.email} (was: {old_status})")
+    logger.info("Revoked %s (was: %s)", user.email, old_status)
     
     return {"message": f"User {user.email} access revoked successfully", "success": True}
 
 
 @router.post("/bulk-approve", response_model=dict)
 async def bulk_approve_users(
-    payload: dict = Body(...),
-    db: Session = Depends(get_db),
+    payload: BulkUserAction,
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """Bulk approve multiple users - works for PENDING and REVOKED users (Admin only)"""
-    user_ids = payload.get("user_ids", [])
-    
-    print(f"🟢 Bulk Approve - Received payload: {payload}")
-    
-    # Handle nested dict from frontend
-    if isinstance(user_ids, dict):
-        print("⚠️  user_ids is a dict, extracting...")
-        if 'userIds' in user_ids:
-            user_ids = user_ids['userIds']
-            print(f"🔄 Extracted: {user_ids}")
-        else:
-            return {
-                "message": "Invalid payload structure",
-                "success": False,
-                "approved_count": 0
-            }
-    
-    if not user_ids or not isinstance(user_ids, list):
-        print(f"❌ Invalid user_ids: {user_ids}")
-        return {
-            "message": "Invalid user_ids provided - must be a non-empty array",
-            "success": False,
-            "approved_count": 0
-        }
-    
-    # Ensure all IDs are strings
-    user_ids_str = [str(uid) for uid in user_ids]
-    print(f"🟢 Searching for users: {user_ids_str}")
-    
-    # ✅ CRITICAL FIX: Query PENDING OR REVOKED users
-    users = db.query(User).filter(
-        User.id.in_(user_ids_str),
-        or_(User.status == UserStatus.PENDING, User.status == UserStatus.REVOKED)
-    ).all()
-    
-    print(f"🟢 Found {len(users)} users (pending/revoked) to approve")
-    
-    if len(users) == 0:
-        print(f"⚠️  No pending or revoked users found. Checking all statuses...")
-        # Debug: Check what status they actually have
-        all_users = db.query(User).filter(User.id.in_(user_ids_str)).all()
-        for u in all_users:
-            print(f"   User {u.email} has status: {u.status}")
-    
-    # Approve each user
-    approved_count = 0
-    restored_count = 0
-    for user in users:
-        old_status = user.status
-        user.status = UserStatus.APPROVED
-        
-        if old_status == UserStatus.REVOKED:
-            restored_count += 1
-            print(f"♻️  Restored: {user.email} (was: {old_status})")
-        else:
-            print(f"✅ Approved: {user.email} (was: {old_status})")
-        
-        approved_count += 1
-    
-    # Commit transaction
-    try:
-        db.commit()
-        print(f"🟢 COMMITTED: {approved_count} users approved ({restored_count} restored)")
-    except Exception as e:
-        db.rollback()
-        print(f"❌ COMMIT FAILED: {str(e)}")
-        return {
-            "message": f"Database error: {str(e)}",
-            "success": False,
-            "approved_count": 0
-        }
-    
-    message = f"{approved_count} user(s) approved successfully"
+    approved = (await db.execute(bulk_set_status_stmt(
+        payload.user_ids,
+        UserStatus.APPROVED,
+        (UserStatus.PENDING, UserStatus.REVOKED),
+    ))).all()
+    await db.commit()
+    
+    approved_ids = [row.id for row in approved]
+    restored_count = sum(1 for row in approved if row.old_status == UserStatus.REVOKED)
+    
+    if approved_ids:
+        invalidate_users(approved_ids)
+        invalidate_dashboard_stats()
+        notify_users(
+            approved_ids,
+            "Your account has been approved. Welcome!",
+            NotificationType.USER_APPROVED
+        )
+    logger.info(
+        "Bulk approve: %d of %d user(s) approved (%d restored)",
+        len(approved_ids), len(payload.user_ids), restored_count
+    )
+    
+    message = f"{len(approved_ids)} user(s) approved successfully"
     if restored_count > 0:
-        message = f"{approved_count} user(s) approved ({restored_count} restored from revoked)"
+        message = f"{len(approved_ids)} user(s) approved ({restored_count} restored from revoked)"
     
     return {
         "message": message,
         "success": True,
-        "approved_count": approved_count
+        "approved_count": len(approved_ids)
     }
 
 
 @router.post("/bulk-reject", response_model=dict)
 async def bulk_reject_users(
-    payload: dict = Body(...),
-    db: Session = Depends(get_db),
+    payload: BulkUserAction,
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """Bulk reject/revoke multiple users - marks as REVOKED (Admin only)"""
-    user_ids = payload.get("user_ids", [])
-    
-    print(f"🔴 FULL PAYLOAD RECEIVED: {payload}")
-    print(f"🔴 user_ids TYPE: {type(user_ids)}")
-    print(f"🔴 user_ids VALUE: {user_ids}")
-    
-    # Handle nested dict from frontend
-    if isinstance(user_ids, dict):
-        print("⚠️  ERROR: user_ids is a dict, not a list!")
-        if 'userIds' in user_ids:
-            user_ids = user_ids['userIds']
-            print(f"🔄 Extracted from nested dict: {user_ids}")
-        else:
+    revoked = (await db.execute(bulk_set_status_stmt(
+        payload.user_ids,
+        UserStatus.REVOKED,
+        (UserStatus.PENDING, UserStatus.APPROVED),
+    ))).all()
+    await db.commit()
+    
+    if not revoked:
+        # Only distinguish "already revoked" from "unknown ids" when nothing changed
+        found = await db.scalar(select(exists().where(User.id.in_(payload.user_ids))))
+        if not found:
             return {
-                "message": "Invalid payload structure. Expected user_ids to be an array.",
+                "message": "No users found with the provided IDs",
                 "success": False,
                 "rejected_count": 0
             }
     
-    if not user_ids or not isinstance(user_ids, list):
-        print(f"❌ VALIDATION FAILED: user_ids={user_ids}, is_list={isinstance(user_ids, list)}")
-        return {
-            "message": "Invalid user_ids provided - must be a non-empty array",
-            "success": False,
-            "rejected_count": 0
-        }
-    
-    # Ensure all IDs are strings
-    user_ids_str = [str(uid) for uid in user_ids]
-    print(f"🔴 Searching for users with IDs: {user_ids_str}")
-    
-    # Fetch users regardless of current status
-    users = db.query(User).filter(
-        User.id.in_(user_ids_str)
-    ).all()
-    
-    print(f"🔴 Found {len(users)} users to revoke")
-    
-    if len(users) == 0:
-        print("⚠️  No users found with those IDs!")
-        return {
-            "message": "No users found with the provided IDs",
-            "success": False,
-            "rejected_count": 0
-        }
-    
-    # Change status to REVOKED instead of deleting
-    rejected_count = 0
-    for user in users:
-        old_status = user.status
-        
-        # Skip if already revoked
-        if user.status == UserStatus.REVOKED:
-            print(f"⚠️  Skipping {user.email} - already revoked")
-            continue
-        
-        # Set to REVOKED to preserve data
-        user.status = UserStatus.REVOKED
-        rejected_count += 1
-        print(f"🔄 Changed {user.email}: {old_status} → REVOKED")
-    
-    # Commit the transaction
-    try:
-        db.commit()
-        print(f"✅ SUCCESSFULLY COMMITTED: {rejected_count} users revoked")
-    except Exception as e:
-        db.rollback()
-        print(f"❌ COMMIT FAILED: {str(e)}")
-        return {
-            "message": f"Database error: {str(e)}",
-            "success": False,
-            "rejected_count": 0
-        }
+    revoked_ids = [row.id for row in revoked]
+    if revoked_ids:
+        invalidate_users(revoked_ids)
+        invalidate_dashboard_stats()
+    logger.info("Bulk reject: %d of %d user(s) revoked", len(revoked_ids), len(payload.user_ids))
     
     return {
-        "message": f"{rejected_count} user(s) revoked successfully",
+        "message": f"{len(revoked_ids)} user(s) revoked successfully",
         "success": True,
-        "rejected_count": rejected_count
+        "rejected_count": len(revoked_ids)
     }
 
 
 @router.get("/{user_id}", response_model=dict)
 async def get_user_by_id(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """Get user details by ID (Admin only)"""
-    user = db.query(User).outerjoin(
-        Branch, User.branch_id == Branch.id
-    ).filter(User.id == user_id).first()
+    row = (await db.execute(user_listing_query().where(User.id == user_id))).first()
     
-    if not user:
+    if not row:
         raise NotFoundError("User")
     
-    return user_to_dict(user)
+    return user_to_dict(row.User)
 
 
 @router.get("/{user_id}/activity", response_model=list)
 async def get_user_activity(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
     """Get user activity history (Admin only)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     
     if not user:
         raise NotFoundError("User")
@@ -11,7 +11,8 @@ from app.api.v1.endpoints import (
     notifications,
     profile,
     vimeo,
-    dashboard
+    dashboard,
+    search
 )
 
 api_router = APIRouter()
@@ -84,6 +85,13 @@ api_router.include_router(
     tags=["Notifications"]
 )
 
+# Search routes
+api_router.include_router(
+    search.router,
+    prefix="/search",
+    tags=["Search"]
+)
+
 # Vimeo integration routes
 api_router.include_router(
     vimeo.router,
@@ -0,0 +1,80 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    In-process LRU cache with per-entry expiry.
+    Entries are dropped after `ttl` seconds (or a per-call override) and
+    the least recently used entry is evicted once `maxsize` is reached.
+    Intended for use from the event loop; it does no locking.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry (refreshing its LRU position) or default"""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self._misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self._misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; `ttl` overrides the cache default for this entry"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        """Drop a single entry if present"""
+        self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Drop every entry for which predicate(key, value) holds; returns the count"""
+        keys = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        """Size and hit/miss counters for health reporting"""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
@@ -25,6 +25,42 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing (bcrypt runs on a bounded thread pool)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    
+    # Auth caches (verified tokens and the users/admins they resolve to)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Sermon engagement counters (0 disables the periodic repair job)
+    SERMON_COUNTER_RECONCILE_INTERVAL_SECONDS: int = 3600
+    
+    # Admin dashboard stats cache
+    DASHBOARD_STATS_TTL_SECONDS: int = 30
+    
+    # Prayer wall page cache
+    PRAYER_WALL_CACHE_TTL_SECONDS: int = 60
+    PRAYER_WALL_CACHE_MAX_PAGES: int = 500
+    
+    # Write-behind buffer for sermon/blog view events
+    VIEW_BUFFER_ENABLED: bool = True
+    VIEW_BUFFER_FLUSH_INTERVAL_MS: int = 500
+    VIEW_BUFFER_MAX_BATCH: int = 500  # flush early once this many views are queued
+    VIEW_BUFFER_MAX_PENDING: int = 20000  # views are written directly beyond this
+    
+    # Notification stream ("memory" for one worker, "postgres" for LISTEN/NOTIFY across workers)
+    NOTIFICATION_PUBSUB_BACKEND: str = "memory"
+    NOTIFICATION_STREAM_KEEPALIVE_SECONDS: int = 15
+    NOTIFICATION_STREAM_TICKET_SECONDS: int = 60  # lifetime of a /notifications/stream ticket
+    
+    # Notification storage: monthly partitions and retention (0 disables each rule)
+    NOTIFICATION_MAINTENANCE_INTERVAL_SECONDS: int = 86400
+    NOTIFICATION_PARTITIONS_AHEAD: int = 2  # months created in advance
+    NOTIFICATION_RETENTION_DAYS: int = 180  # read notifications older than this are deleted
+    NOTIFICATION_MAX_AGE_DAYS: int = 730  # monthly partitions older than this are dropped
+    
     # Database
     DATABASE_URL: str
     SUPABASE_URL: str = ""
@@ -35,6 +71,12 @@ class Settings(BaseSettings):
     VIMEO_ACCESS_TOKEN: str
     VIMEO_CLIENT_ID: str
     VIMEO_CLIENT_SECRET: str
+    VIMEO_UPLOAD_CHUNK_SIZE: int = 16 * 1024 * 1024  # bytes per tus PATCH
+    VIMEO_TIMEOUT_SECONDS: float = 10.0
+    VIMEO_MAX_RETRIES: int = 3
+    VIMEO_METADATA_TTL_SECONDS: int = 3600  # once a video is available
+    VIMEO_METADATA_PENDING_TTL_SECONDS: int = 30  # while uploading/transcoding
+    VIMEO_METADATA_STALE_SECONDS: int = 86400  # served stale while refreshing
     
     # Cloudinary (Optional)
     CLOUDINARY_CLOUD_NAME: str = ""
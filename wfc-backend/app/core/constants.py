@@ -27,11 +27,26 @@ class NotificationType(str, Enum):
     SERMON_UPLOADED = "sermon_uploaded"
     BLOG_PUBLISHED = "blog_published"
     EVENT_APPROVED = "event_approved"
+    EVENT_REJECTED = "event_rejected"
     USER_APPROVED = "user_approved"
     PRAYER_RESPONSE = "prayer_response"
     CROSS_BRANCH_REQUEST = "cross_branch_request"
 
 
+class SermonAudience(str, Enum):
+    """Member lists on the sermon analytics page"""
+    VIEWED = "viewed"
+    LIKED = "liked"
+    NOT_WATCHED = "not_watched"
+
+
+class SearchKind(str, Enum):
+    """Content types covered by full-text search"""
+    SERMON = "sermon"
+    BLOG = "blog"
+    PRAYER = "prayer"
+
+
 class MediaType(str, Enum):
     """Media asset types"""
     PROFILE = "profile"
@@ -50,6 +65,9 @@ DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
 MIN_PAGE_SIZE = 1
 
+# Largest id list accepted by the bulk user actions
+MAX_BULK_USER_IDS = 10000
+
 # Branch names (will be seeded in database)
 BRANCH_1_NAME = "Branch 1"
 BRANCH_2_NAME = "Branch 2"
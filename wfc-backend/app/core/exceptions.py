@@ -47,6 +47,16 @@ class ConflictError(HTTPException):
         )
 
 
+class ServiceBusyError(HTTPException):
+    """Raised when a bounded worker pool is saturated"""
+    def __init__(self, detail: str = "Service busy, please retry", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
 class VimeoServiceError(HTTPException):
     """Raised when Vimeo service encounters an error"""
     def __init__(self, detail: str = "Vimeo service error"):
@@ -1,12 +1,23 @@
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.exceptions import ServiceBusyError
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -19,6 +30,111 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool.
+    bcrypt releases the GIL, so hashing overlaps with request handling
+    instead of stalling the event loop. Callers beyond `max_queue`
+    waiting jobs are rejected with 503 rather than piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    def _track(self, func: Callable, *args):
+        with self._lock:
+            self._active += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    async def run(self, func: Callable, *args):
+        """Run a blocking hash function on the pool"""
+        with self._lock:
+            if self._pending - self._active >= self.max_queue:
+                self._rejected += 1
+                raise ServiceBusyError("Too many authentication requests, please retry")
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), self._track, func, *args
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password for storage"""
+        return await self.run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash"""
+        return await self.run(pwd_context.verify, plain_password, hashed_password)
+
+    async def verify_and_update(
+        self,
+        plain_password: str,
+        hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and, if the stored hash uses outdated
+        settings (e.g. a lower bcrypt cost), return a fresh hash.
+        Returns: (is_valid, new_hash_or_None)
+        """
+        valid, new_hash = await self.run(
+            pwd_context.verify_and_update, plain_password, hashed_password
+        )
+        if valid and new_hash:
+            with self._lock:
+                self._rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> Dict[str, int]:
+        """Pool metrics: queue depth, in-flight work and totals"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "rehashed": self._rehashed,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (called on application shutdown)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -31,7 +147,8 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     to_encode.update({
         "exp": expire,
         "type": "access",
-        "iat": datetime.utcnow()
+        "iat": datetime.utcnow(),
+        "jti": uuid.uuid4().hex
     })
     
     encoded_jwt = jwt.encode(
@@ -50,7 +167,32 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     to_encode.update({
         "exp": expire,
         "type": "refresh",
-        "iat": datetime.utcnow()
+        "iat": datetime.utcnow(),
+        "jti": uuid.uuid4().hex
+    })
+    
+    encoded_jwt = jwt.encode(
+        to_encode, 
+        settings.JWT_SECRET_KEY, 
+        algorithm=settings.JWT_ALGORITHM
+    )
+    return encoded_jwt
+
+
+def create_stream_ticket(data: Dict[str, Any]) -> str:
+    """
+    Create a short-lived JWT that only opens the notification stream.
+    EventSource cannot send headers, so the ticket travels in the URL
+    instead of the member's access token.
+    """
+    to_encode = data.copy()
+    expire = datetime.utcnow() + timedelta(seconds=settings.NOTIFICATION_STREAM_TICKET_SECONDS)
+    
+    to_encode.update({
+        "exp": expire,
+        "type": "stream",
+        "iat": datetime.utcnow(),
+        "jti": uuid.uuid4().hex
     })
     
     encoded_jwt = jwt.encode(
@@ -78,6 +220,31 @@ def decode_token(token: str) -> Dict[str, Any]:
         )
 
 
+# Verified tokens -> decoded payload, so repeat requests skip the signature check
+token_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def decode_token_cached(token: str) -> Dict[str, Any]:
+    """
+    Decode a JWT, reusing the payload of a recently verified token.
+    Entries never outlive the token's own expiry.
+    """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
+    payload = decode_token(token)
+    exp = payload.get("exp")
+    ttl = settings.PRINCIPAL_CACHE_TTL_SECONDS
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+    token_cache.set(token, payload, ttl=ttl)
+    return payload
+
+
 def validate_password_strength(password: str) -> tuple[bool, str]:
     """
     Validate password meets security requirements
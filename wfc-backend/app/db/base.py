@@ -1,8 +1,12 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, Computed, DateTime
+from sqlalchemy.orm import deferred
 from datetime import datetime
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+
+# Text search configuration used by every search_vector column and query
+SEARCH_CONFIG = "english"
 
 Base = declarative_base()
 
@@ -35,3 +39,16 @@ class BaseModel(Base):
             column.name: getattr(self, column.name)
             for column in self.__table__.columns
         }
+
+
+def search_vector_column(title: str, body: str):
+    """
+    Stored generated tsvector over a title (weight A) and body (weight B)
+    column, kept current by Postgres on every write. Deferred so it is
+    never loaded with the entity.
+    """
+    expression = (
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({title}, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({body}, '')), 'B')"
+    )
+    return deferred(Column(TSVECTOR, Computed(expression, persisted=True)))
@@ -1,6 +1,8 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from app.core.config import settings
 
 # Create database engine
@@ -21,6 +23,35 @@ SessionLocal = sessionmaker(
 )
 
 
+def get_async_database_url(database_url: str) -> URL:
+    """
+    Derive the asyncpg URL from the configured (sync) DATABASE_URL.
+    libpq's `sslmode` query option is translated to asyncpg's `ssl`.
+    """
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    sslmode = url.query.get("sslmode")
+    if sslmode:
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    return url
+
+
+# Create async database engine (asyncpg) for request handlers
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+    echo=settings.DEBUG
+)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False  # Keep attributes loaded after commit (no lazy IO)
+)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency for getting database session.
@@ -31,3 +62,12 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for getting an async database session.
+    Handlers awaiting it release the event loop during database I/O.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,15 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.security import password_hasher, token_cache
+from app.services.auth_service import principal_cache
+from app.services.prayer_service import prayer_wall_cache
+from app.services.sermon_service import run_counter_reconciliation
+from app.services.vimeo_service import vimeo_service
+from app.services.view_buffer import view_buffer
+from app.services.notification_service import notification_dispatcher, run_notification_maintenance
+from app.services.notification_hub import notification_hub
 from app.api.v1.router import api_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop process-wide resources"""
+    background = []
+    if settings.SERMON_COUNTER_RECONCILE_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(
+            run_counter_reconciliation(settings.SERMON_COUNTER_RECONCILE_INTERVAL_SECONDS)
+        ))
+    if settings.NOTIFICATION_MAINTENANCE_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(
+            run_notification_maintenance(settings.NOTIFICATION_MAINTENANCE_INTERVAL_SECONDS)
+        ))
+    if settings.VIEW_BUFFER_ENABLED:
+        view_buffer.start()
+    notification_dispatcher.start()
+    await notification_hub.start()
+    
+    yield
+    
+    await view_buffer.stop()
+    await notification_dispatcher.stop()
+    await notification_hub.stop()
+    
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    await vimeo_service.aclose()
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     version="1.0.0",
     description="WFC Church Management Platform - Multi-Portal Backend API",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS Middleware - Must be configured before routes
@@ -19,7 +61,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # Browsers ignore "*" here when credentials are allowed
+    expose_headers=["X-Next-Cursor", "X-Approximate-Total", "Content-Disposition"],
 )
 
 # Include API Router
@@ -32,7 +75,15 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "wfc-backend",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "password_hasher": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "prayer_wall_cache": prayer_wall_cache.stats(),
+        "vimeo_metadata_cache": vimeo_service.metadata_stats(),
+        "view_buffer": view_buffer.stats(),
+        "notification_dispatcher": notification_dispatcher.stats(),
+        "notification_hub": notification_hub.stats()
     }
 
 # Root Endpoint
@@ -1,19 +1,27 @@
-from sqlalchemy import Column, String, Text, ForeignKey
+from sqlalchemy import Column, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-from app.db.base import BaseModel
+from app.db.base import BaseModel, search_vector_column
 from app.core.constants import BlogStatus
 
 
 class Blog(BaseModel):
     """Blog model - Pastor's Pen"""
     __tablename__ = "blogs"
+    __table_args__ = (
+        # Published feed ordered by creation date
+        Index("ix_blogs_status_created_at", "status", "created_at"),
+        Index("ix_blogs_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
     status = Column(String(50), default=BlogStatus.DRAFT, nullable=False)
     featured_image = Column(String(500), nullable=True)
     
+    # Full-text search document (GIN-indexed)
+    search_vector = search_vector_column("title", "content")
+    
     # Foreign Keys
     created_by = Column(UUID(as_uuid=True), ForeignKey("admins.id"), nullable=False)
     
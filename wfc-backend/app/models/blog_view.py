@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy import Column, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -8,6 +8,11 @@ from app.db.base import BaseModel
 class BlogView(BaseModel):
     """Tracks blog views"""
     __tablename__ = "blog_views"
+    __table_args__ = (
+        # One row per member and blog; also the (blog_id, user_id) lookup
+        UniqueConstraint("blog_id", "user_id", name="uq_blog_views_blog_id_user_id"),
+        Index("ix_blog_views_user_id", "user_id"),
+    )
     
     viewed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import BaseModel
@@ -8,6 +8,13 @@ from app.core.constants import EventCrossBranchStatus
 class Event(BaseModel):
     """Event model - branch and cross-branch events"""
     __tablename__ = "events"
+    __table_args__ = (
+        # Member feed: own-branch events and approved cross-branch events,
+        # each arm read in event_date order
+        Index("ix_events_branch_id_event_date", "branch_id", "event_date"),
+        Index("ix_events_cross_branch_status_event_date", "cross_branch_status", "event_date"),
+        Index("ix_events_created_by", "created_by"),
+    )
     
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
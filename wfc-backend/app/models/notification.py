@@ -1,13 +1,26 @@
-from sqlalchemy import Column, String, Text, Boolean, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
 from app.db.base import BaseModel
 from app.core.constants import NotificationType
 
 
 class Notification(BaseModel):
-    """Notification model - in-app notifications"""
+    """
+    Notification model - in-app notifications
+    Range-partitioned by month on created_at (see notification_service
+    for partition maintenance and retention)
+    """
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Per-user inbox and unread lookups, newest first
+        Index("ix_notifications_user_id_is_read_created_at", "user_id", "is_read", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    
+    # Partitioned tables need the partition key in the primary key
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, primary_key=True)
     
     message = Column(Text, nullable=False)
     notification_type = Column(String(50), nullable=False)
@@ -21,3 +34,12 @@ class Notification(BaseModel):
     
     def __repr__(self):
         return f"<Notification {self.notification_type} - Read: {self.is_read}>"
+
+
+# Catch-all partition so inserts never fail before the monthly
+# partitions exist; maintenance moves its rows into them
+event.listen(
+    Notification.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS notifications_default PARTITION OF notifications DEFAULT"),
+)
@@ -1,17 +1,24 @@
-from sqlalchemy import Column, String, Text, ForeignKey
+from sqlalchemy import Column, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-from app.db.base import BaseModel
+from app.db.base import BaseModel, search_vector_column
 
 
 class PrayerRequest(BaseModel):
     """Prayer request model - global visibility"""
     __tablename__ = "prayer_requests"
+    __table_args__ = (
+        Index("ix_prayer_requests_user_id", "user_id"),
+        Index("ix_prayer_requests_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
     pastor_response = Column(Text, nullable=True)
     
+    # Full-text search document (GIN-indexed)
+    search_vector = search_vector_column("title", "content")
+    
     # Foreign Keys
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     
@@ -1,12 +1,15 @@
-from sqlalchemy import Column, String, Text, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-from app.db.base import BaseModel
+from app.db.base import BaseModel, search_vector_column
 
 
 class Sermon(BaseModel):
     """Sermon model - stores sermon video metadata"""
     __tablename__ = "sermons"
+    __table_args__ = (
+        Index("ix_sermons_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
@@ -15,6 +18,13 @@ class Sermon(BaseModel):
     thumbnail_url = Column(String(500), nullable=True)  # Vimeo thumbnail
     duration = Column(String(50), nullable=True)  # Video duration
     
+    # Full-text search document (GIN-indexed)
+    search_vector = search_vector_column("title", "description")
+    
+    # Denormalized engagement counters (kept in step with sermon_views)
+    view_count = Column(Integer, default=0, server_default="0", nullable=False)
+    like_count = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Foreign Keys
     category_id = Column(UUID(as_uuid=True), ForeignKey("sermon_categories.id"), nullable=False)
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("admins.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Boolean, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -8,6 +8,12 @@ from app.db.base import BaseModel
 class SermonView(BaseModel):
     """Tracks sermon views and likes"""
     __tablename__ = "sermon_views"
+    __table_args__ = (
+        # One row per member and sermon; also the (sermon_id, user_id) lookup
+        UniqueConstraint("sermon_id", "user_id", name="uq_sermon_views_sermon_id_user_id"),
+        Index("ix_sermon_views_sermon_id_liked", "sermon_id", "liked"),
+        Index("ix_sermon_views_user_id", "user_id"),
+    )
     
     viewed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     liked = Column(Boolean, default=False, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import BaseModel
@@ -8,13 +8,26 @@ from app.core.constants import UserStatus
 class User(BaseModel):
     """User model - represents church members"""
     __tablename__ = "users"
+    __table_args__ = (
+        # Status-filtered admin lists ordered by signup date
+        Index("ix_users_status_created_at", "status", "created_at"),
+        Index("ix_users_branch_id", "branch_id"),
+        # Substring and fuzzy admin search (pg_trgm)
+        Index("ix_users_full_name_trgm", "full_name", postgresql_using="gin",
+              postgresql_ops={"full_name": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin",
+              postgresql_ops={"email": "gin_trgm_ops"}),
+    )
     
     full_name = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
-    status = Column(String(50), default=UserStatus.PENDING, nullable=False, index=True)
+    status = Column(String(50), default=UserStatus.PENDING, nullable=False)
     profile_image = Column(String(500), nullable=True)
     
+    # Denormalized unread badge; kept exact by notification_repository statements
+    unread_notification_count = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Foreign Keys
     branch_id = Column(UUID(as_uuid=True), ForeignKey("branches.id"), nullable=False)
     
@@ -28,3 +41,11 @@ class User(BaseModel):
     
     def __repr__(self):
         return f"<User {self.email} - {self.status}>"
+
+
+# The trigram indexes need the extension before the table is created
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
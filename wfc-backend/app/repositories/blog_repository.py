@@ -0,0 +1,68 @@
+import uuid
+from typing import Sequence, Tuple
+from sqlalchemy import Select, select, values, column, func, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.blog import Blog
+from app.models.blog_view import BlogView
+from app.models.user import User
+from app.schemas.blog import BlogResponse
+
+
+def blog_stats_query(user_id) -> Select:
+    """
+    Build a select yielding (Blog, total_views, user_has_viewed) rows.
+
+    The view count is a correlated COUNT and the per-user flag an EXISTS,
+    both served by the blog_views indexes and evaluated only for the rows
+    actually returned, so a page of blogs costs one round trip.
+    """
+    total_views = select(func.count(BlogView.id)).where(
+        BlogView.blog_id == Blog.id
+    ).scalar_subquery()
+    user_has_viewed = exists().where(
+        BlogView.blog_id == Blog.id,
+        BlogView.user_id == user_id,
+    )
+
+    return select(
+        Blog,
+        total_views.label("total_views"),
+        user_has_viewed.label("user_has_viewed"),
+    )
+
+
+def blog_with_stats(row) -> dict:
+    """Serialize a row produced by blog_stats_query"""
+    blog_dict = BlogResponse.from_orm(row.Blog).dict()
+    blog_dict["total_views"] = row.total_views
+    blog_dict["user_has_viewed"] = bool(row.user_has_viewed)
+    return blog_dict
+
+
+def record_blog_views_batch_stmt(rows: Sequence[Tuple]):
+    """
+    Insert many (blog_id, user_id, viewed_at) views in one statement,
+    skipping deleted blogs or members and views that already exist.
+    Returns the ids of the inserted rows.
+    """
+    incoming = values(
+        column("id", BlogView.id.type),
+        column("blog_id", BlogView.blog_id.type),
+        column("user_id", BlogView.user_id.type),
+        column("viewed_at", BlogView.viewed_at.type),
+        name="incoming",
+    ).data([(uuid.uuid4(), *row) for row in rows])
+
+    return pg_insert(BlogView).from_select(
+        ["id", "blog_id", "user_id", "viewed_at", "created_at", "updated_at"],
+        select(
+            incoming.c.id,
+            incoming.c.blog_id,
+            incoming.c.user_id,
+            incoming.c.viewed_at,
+            incoming.c.viewed_at,
+            incoming.c.viewed_at,
+        ).join(Blog, Blog.id == incoming.c.blog_id).join(User, User.id == incoming.c.user_id),
+    ).on_conflict_do_nothing(
+        index_elements=[BlogView.blog_id, BlogView.user_id]
+    ).returning(BlogView.id)
@@ -0,0 +1,182 @@
+import re
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import Delete, Select, Update, insert, update, delete, select, func, literal, text, tuple_
+from sqlalchemy.sql.elements import TextClause
+from app.core.constants import UserStatus
+from app.models.notification import Notification
+from app.models.user import User
+from app.utils.datetime_helpers import add_months
+
+DEFAULT_PARTITION = "notifications_default"
+PARTITION_NAME = re.compile(r"^notifications_(\d{4})_(\d{2})$")
+
+# Serializes partition DDL between workers (pg advisory lock key)
+PARTITION_LOCK_KEY = 0x6E6F7469
+
+
+def _adjust_unread(user_filter, delta) -> Update:
+    """UPDATE users' unread counters by `delta`, leaving updated_at alone"""
+    return update(User).where(user_filter).values(
+        unread_notification_count=User.unread_notification_count + delta,
+        updated_at=User.updated_at,
+    )
+
+
+def notify_members_stmt(
+    message: str,
+    notification_type: str,
+    *criteria,
+    created_at: Optional[datetime] = None,
+) -> Select:
+    """
+    Build one INSERT ... SELECT writing a notification for every approved
+    member matching `criteria` (all approved members when none are
+    given). Rows are generated inside the database, so fan-out to any
+    number of members is a single statement and no user rows are read
+    back into Python. Each recipient's unread counter moves in the same
+    statement. Returns (id, user_id) of the inserted rows.
+    """
+    now = created_at or datetime.utcnow()
+    inserted = insert(Notification).from_select(
+        ["id", "user_id", "message", "notification_type", "is_read", "created_at", "updated_at"],
+        select(
+            func.gen_random_uuid(),
+            User.id,
+            literal(message),
+            literal(notification_type),
+            literal(False),
+            literal(now),
+            literal(now),
+        ).where(User.status == UserStatus.APPROVED, *criteria),
+    ).returning(Notification.id, Notification.user_id).cte("inserted")
+
+    bumped = _adjust_unread(User.id == inserted.c.user_id, 1).returning(
+        inserted.c.id, inserted.c.user_id
+    ).cte("bumped")
+
+    return select(bumped.c.id, bumped.c.user_id)
+
+
+def mark_read_stmt(user_id, notification_id=None) -> Select:
+    """
+    Mark one notification (or all of them) read for a member and lower
+    the unread counter by the rows that actually changed.
+    Returns (marked, unread_count).
+    """
+    criteria = [Notification.user_id == user_id, Notification.is_read == False]
+    if notification_id is not None:
+        criteria.append(Notification.id == notification_id)
+
+    marked = update(Notification).where(*criteria).values(
+        is_read=True,
+        # onupdate defaults are not applied inside a CTE
+        updated_at=datetime.utcnow(),
+    ).returning(Notification.id).cte("marked")
+    changed = select(func.count()).select_from(marked).scalar_subquery()
+
+    adjusted = _adjust_unread(User.id == user_id, -changed).returning(
+        User.unread_notification_count
+    ).cte("adjusted")
+
+    return select(changed.label("marked"), adjusted.c.unread_notification_count)
+
+
+def delete_notification_stmt(user_id, notification_id) -> Select:
+    """
+    Delete a member's notification, lowering the unread counter if it
+    was unread. Returns (deleted, was_unread, unread_count).
+    """
+    deleted = delete(Notification).where(
+        Notification.id == notification_id,
+        Notification.user_id == user_id,
+    ).returning(Notification.is_read).cte("deleted")
+    unread_deleted = select(func.count()).select_from(deleted).where(
+        deleted.c.is_read == False
+    ).scalar_subquery()
+
+    adjusted = _adjust_unread(User.id == user_id, -unread_deleted).returning(
+        User.unread_notification_count
+    ).cte("adjusted")
+
+    return select(
+        select(func.count()).select_from(deleted).scalar_subquery().label("deleted"),
+        unread_deleted.label("was_unread"),
+        adjusted.c.unread_notification_count,
+    )
+
+
+def unread_count_query(user_id) -> Select:
+    """The member's unread badge: a primary-key lookup, not a COUNT"""
+    return select(User.unread_notification_count).where(User.id == user_id)
+
+
+# =========================================================
+# PARTITIONS AND RETENTION
+# =========================================================
+
+def partition_name(month: datetime) -> str:
+    return f"notifications_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """Month a monthly partition covers (None for other partitions)"""
+    match = PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def list_partitions_query() -> TextClause:
+    return text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'notifications'::regclass
+    """)
+
+
+def create_partition_statements(month: datetime) -> List[TextClause]:
+    """
+    Statements (one transaction) creating the partition for `month`.
+    Rows that landed in the default partition for that month are moved
+    into it first, since ATTACH refuses to orphan them.
+    """
+    name = partition_name(month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    in_month = "created_at >= :start AND created_at < :end"
+    return [
+        text(f"CREATE TABLE {name} (LIKE notifications INCLUDING DEFAULTS)"),
+        text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_month}").bindparams(**bounds),
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}").bindparams(**bounds),
+        text(
+            f"ALTER TABLE notifications ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+        ),
+    ]
+
+
+def purge_read_stmt(cutoff: datetime, batch_size: int) -> Delete:
+    """Delete up to batch_size read notifications created before cutoff"""
+    batch = select(Notification.id, Notification.created_at).where(
+        Notification.is_read == True,
+        Notification.created_at < cutoff,
+    ).limit(batch_size)
+    return delete(Notification).where(
+        tuple_(Notification.id, Notification.created_at).in_(batch)
+    )
+
+
+def release_partition_unread_stmt(name: str) -> TextClause:
+    """Take a partition's unread rows off their users' unread counters"""
+    return text(f"""
+        UPDATE users u
+        SET unread_notification_count = u.unread_notification_count - p.unread
+        FROM (
+            SELECT user_id, count(*) AS unread
+            FROM {name}
+            WHERE NOT is_read
+            GROUP BY user_id
+        ) p
+        WHERE p.user_id = u.id
+    """)
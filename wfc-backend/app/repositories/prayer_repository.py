@@ -0,0 +1,29 @@
+from sqlalchemy import Select, select
+from app.models.branch import Branch
+from app.models.prayer_request import PrayerRequest
+from app.models.user import User
+from app.schemas.prayer import PrayerRequestResponse
+
+# Unique sort key of the prayer wall, newest first
+PRAYER_WALL_ORDER = (PrayerRequest.created_at, PrayerRequest.id)
+
+
+def prayer_with_author_query() -> Select:
+    """Build a select yielding (PrayerRequest, user_name, user_branch) rows"""
+    return select(
+        PrayerRequest,
+        User.full_name.label("user_name"),
+        Branch.branch_name.label("user_branch"),
+    ).join(
+        User, PrayerRequest.user_id == User.id
+    ).join(
+        Branch, User.branch_id == Branch.id
+    )
+
+
+def prayer_with_author(row) -> dict:
+    """Serialize a row produced by prayer_with_author_query"""
+    prayer_dict = PrayerRequestResponse.from_orm(row.PrayerRequest).dict()
+    prayer_dict["user_name"] = row.user_name
+    prayer_dict["user_branch"] = row.user_branch
+    return prayer_dict
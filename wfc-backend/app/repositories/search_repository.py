@@ -0,0 +1,86 @@
+import html
+from typing import Optional, Sequence
+from sqlalchemy import Float, Select, select, func, literal, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from app.core.constants import BlogStatus, SearchKind
+from app.db.base import SEARCH_CONFIG
+from app.models.blog import Blog
+from app.models.prayer_request import PrayerRequest
+from app.models.sermon import Sermon
+
+# ts_rank_cd normalization 1: divide by 1 + log(document length), so long
+# blog posts do not outrank a sermon whose title matches
+RANK_NORMALIZATION = 1
+
+HEADLINE_OPTIONS = (
+    'StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, '
+    'MaxFragments=2, FragmentDelimiter=" ... "'
+)
+
+
+def _sources():
+    """(kind, model, body column, visibility criteria) per searchable type"""
+    return [
+        (SearchKind.SERMON, Sermon, Sermon.description, ()),
+        (SearchKind.BLOG, Blog, Blog.content, (Blog.status == BlogStatus.PUBLISHED,)),
+        (SearchKind.PRAYER, PrayerRequest, PrayerRequest.content, ()),
+    ]
+
+
+def search_query(term: str, kinds: Optional[Sequence[SearchKind]] = None) -> Select:
+    """
+    Build a select yielding (kind, id, title, created_at, rank, snippet)
+    rows for content matching `term` (web-search syntax: quoted phrases,
+    OR, -exclusions).
+
+    Each content type is matched through its GIN-indexed search_vector
+    and ranked in the same UNION ALL. Callers order and limit by
+    (rank, id); the costly ts_headline call is in the outer select
+    list, which Postgres evaluates after the sort and LIMIT, so only
+    the returned page is highlighted.
+    """
+    config = literal(SEARCH_CONFIG, REGCONFIG)
+    query = func.websearch_to_tsquery(config, term)
+
+    matches = union_all(*[
+        select(
+            literal(kind.value).label("kind"),
+            model.id.label("id"),
+            model.title.label("title"),
+            func.coalesce(body, "").label("body"),
+            model.created_at.label("created_at"),
+            func.ts_rank_cd(
+                model.search_vector, query, RANK_NORMALIZATION, type_=Float
+            ).label("rank"),
+        ).where(model.search_vector.op("@@")(query), *criteria)
+        for kind, model, body, criteria in _sources()
+        if not kinds or kind in kinds
+    ]).subquery("matches")
+
+    return select(
+        matches.c.kind,
+        matches.c.id,
+        matches.c.title,
+        matches.c.created_at,
+        matches.c.rank,
+        func.ts_headline(config, matches.c.body, query, HEADLINE_OPTIONS).label("snippet"),
+    )
+
+
+def _escape_headline(snippet: str) -> str:
+    """HTML-escape a headline, keeping only the <mark> tags ts_headline added"""
+    return html.escape(snippet, quote=False).replace(
+        "&lt;mark&gt;", "<mark>"
+    ).replace("&lt;/mark&gt;", "</mark>")
+
+
+def search_result(row) -> dict:
+    """Serialize a row produced by search_query"""
+    return {
+        "kind": row.kind,
+        "id": row.id,
+        "title": row.title,
+        "snippet": _escape_headline(row.snippet),
+        "rank": row.rank,
+        "created_at": row.created_at,
+    }
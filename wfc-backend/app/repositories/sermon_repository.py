@@ -0,0 +1,285 @@
+import uuid
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+from sqlalchemy import (
+    Select, Update, select, update, values, column,
+    func, exists, literal, literal_column, case, or_,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only
+from app.core.constants import SermonAudience, UserStatus
+from app.models.sermon import Sermon
+from app.models.sermon_view import SermonView
+from app.models.user import User
+from app.schemas.sermon import SermonResponse
+
+
+def sermon_stats_query(user_id: Optional[str] = None) -> Select:
+    """
+    Build a select yielding (Sermon, total_views, total_likes,
+    user_has_viewed, user_has_liked) rows.
+
+    Totals are read from the denormalized counters on sermons and the
+    per-user flags from correlated EXISTS checks, so any number of
+    sermons is fetched in a single round trip.
+    """
+    if user_id:
+        user_has_viewed = exists().where(
+            SermonView.sermon_id == Sermon.id,
+            SermonView.user_id == user_id,
+        )
+        user_has_liked = exists().where(
+            SermonView.sermon_id == Sermon.id,
+            SermonView.user_id == user_id,
+            SermonView.liked == True,
+        )
+    else:
+        user_has_viewed = literal(False)
+        user_has_liked = literal(False)
+
+    return select(
+        Sermon,
+        Sermon.view_count.label("total_views"),
+        Sermon.like_count.label("total_likes"),
+        user_has_viewed.label("user_has_viewed"),
+        user_has_liked.label("user_has_liked"),
+    )
+
+
+def sermon_with_stats(row) -> dict:
+    """Serialize a row produced by sermon_stats_query"""
+    sermon_dict = SermonResponse.from_orm(row.Sermon).dict()
+    sermon_dict["total_views"] = row.total_views
+    sermon_dict["total_likes"] = row.total_likes
+    sermon_dict["user_has_viewed"] = bool(row.user_has_viewed)
+    sermon_dict["user_has_liked"] = bool(row.user_has_liked)
+    return sermon_dict
+
+
+def view_state_query(sermon_id, user_id) -> Select:
+    """
+    Build a select yielding the sermon's (total_views, total_likes,
+    user_has_viewed, user_has_liked) before a buffered view is written:
+    a primary-key lookup plus two EXISTS probes on sermon_views.
+    No row comes back if the sermon does not exist.
+    """
+    return select(
+        Sermon.view_count.label("total_views"),
+        Sermon.like_count.label("total_likes"),
+        exists().where(
+            SermonView.sermon_id == Sermon.id,
+            SermonView.user_id == user_id,
+        ).label("user_has_viewed"),
+        exists().where(
+            SermonView.sermon_id == Sermon.id,
+            SermonView.user_id == user_id,
+            SermonView.liked == True,
+        ).label("user_has_liked"),
+    ).where(Sermon.id == sermon_id)
+
+
+def _view_row(sermon_id, user_id, liked: bool) -> Select:
+    """SELECT producing a new sermon_views row, or nothing if the sermon is gone"""
+    now = datetime.utcnow()
+    return select(
+        literal(uuid.uuid4(), SermonView.id.type),
+        Sermon.id,
+        literal(user_id, SermonView.user_id.type),
+        literal(liked),
+        literal(now),
+        literal(now),
+        literal(now),
+    ).where(Sermon.id == sermon_id)
+
+
+_VIEW_COLUMNS = ["id", "sermon_id", "user_id", "liked", "viewed_at", "created_at", "updated_at"]
+
+
+def _viewed_by_member(sermon_id, *criteria):
+    return exists().where(
+        SermonView.sermon_id == sermon_id,
+        SermonView.user_id == User.id,
+        *criteria,
+    )
+
+
+def sermon_analytics_query(sermon_id) -> Select:
+    """
+    Build a select yielding one (title, total_views, total_likes,
+    total_users, total_not_watched) row for the sermon.
+
+    Totals come from the sermon's counters; "not watched" is an
+    anti-join count of approved members with no view row, so no member
+    rows leave the database.
+    """
+    total_users = select(func.count()).select_from(User).where(
+        User.status == UserStatus.APPROVED
+    ).scalar_subquery()
+    total_not_watched = select(func.count()).select_from(User).where(
+        User.status == UserStatus.APPROVED,
+        ~_viewed_by_member(sermon_id),
+    ).scalar_subquery()
+
+    return select(
+        Sermon.title,
+        Sermon.view_count.label("total_views"),
+        Sermon.like_count.label("total_likes"),
+        total_users.label("total_users"),
+        total_not_watched.label("total_not_watched"),
+    ).where(Sermon.id == sermon_id)
+
+
+def sermon_audience_query(sermon_id, audience: SermonAudience) -> Select:
+    """
+    Build a select of the members who viewed, liked or have not watched
+    a sermon, as User entities carrying only the listed columns.
+    Semi-/anti-joins keep it to one row per member; callers paginate or
+    stream it ordered by (full_name, id).
+    """
+    if audience == SermonAudience.VIEWED:
+        criterion = _viewed_by_member(sermon_id)
+    elif audience == SermonAudience.LIKED:
+        criterion = _viewed_by_member(sermon_id, SermonView.liked == True)
+    else:
+        criterion = (User.status == UserStatus.APPROVED) & ~_viewed_by_member(sermon_id)
+
+    return select(User).options(
+        load_only(User.id, User.full_name, User.email, raiseload=True)
+    ).where(criterion)
+
+
+def record_view_stmt(sermon_id, user_id) -> Select:
+    """
+    One statement that records a member's view and returns
+    (total_views, total_likes, user_has_liked, newly_viewed) for the sermon.
+
+    INSERT ... ON CONFLICT DO NOTHING makes repeat and concurrent views
+    idempotent, and the counter only moves when a row was inserted.
+    No row comes back if the sermon does not exist.
+    """
+    inserted = pg_insert(SermonView).from_select(
+        _VIEW_COLUMNS, _view_row(sermon_id, user_id, False)
+    ).on_conflict_do_nothing(
+        index_elements=[SermonView.sermon_id, SermonView.user_id]
+    ).returning(SermonView.sermon_id).cte("inserted")
+
+    bumped = update(Sermon).where(
+        Sermon.id == sermon_id,
+        exists(select(inserted.c.sermon_id)),
+    ).values(
+        view_count=Sermon.view_count + 1,
+        updated_at=Sermon.updated_at,
+    ).returning(Sermon.view_count).cte("bumped")
+
+    # Sub-statements share one snapshot: this sees the pre-existing row, if any
+    previous_like = select(SermonView.liked).where(
+        SermonView.sermon_id == sermon_id,
+        SermonView.user_id == user_id,
+    ).scalar_subquery()
+
+    return select(
+        func.coalesce(select(bumped.c.view_count).scalar_subquery(), Sermon.view_count).label("total_views"),
+        Sermon.like_count.label("total_likes"),
+        func.coalesce(previous_like, False).label("user_has_liked"),
+        exists(select(inserted.c.sermon_id)).label("newly_viewed"),
+    ).where(Sermon.id == sermon_id)
+
+
+def toggle_like_stmt(sermon_id, user_id) -> Select:
+    """
+    One statement that flips a member's like (creating the view row
+    liked on first tap) and returns (total_views, total_likes,
+    user_has_liked) after the change.
+
+    The upsert takes the row lock, so concurrent taps serialize and the
+    counters move by exactly the state change each one made. No row
+    comes back if the sermon does not exist.
+    """
+    upserted = pg_insert(SermonView).from_select(
+        _VIEW_COLUMNS, _view_row(sermon_id, user_id, True)
+    )
+    upserted = upserted.on_conflict_do_update(
+        index_elements=[SermonView.sermon_id, SermonView.user_id],
+        set_={"liked": ~SermonView.liked, "updated_at": upserted.excluded.updated_at},
+    ).returning(
+        SermonView.liked.label("liked"),
+        literal_column("xmax = 0").label("inserted"),
+    ).cte("upserted")
+
+    bumped = update(Sermon).where(Sermon.id == sermon_id).values(
+        view_count=Sermon.view_count + case((upserted.c.inserted, 1), else_=0),
+        like_count=Sermon.like_count + case((upserted.c.liked, 1), else_=-1),
+        updated_at=Sermon.updated_at,
+    ).returning(
+        Sermon.view_count.label("total_views"),
+        Sermon.like_count.label("total_likes"),
+        upserted.c.liked.label("user_has_liked"),
+    ).cte("bumped")
+
+    return select(bumped.c.total_views, bumped.c.total_likes, bumped.c.user_has_liked)
+
+
+def record_views_batch_stmt(rows: Sequence[Tuple]) -> Select:
+    """
+    Record many (sermon_id, user_id, viewed_at) views in one statement.
+    Rows for deleted sermons or members are skipped, repeats are
+    absorbed by ON CONFLICT, and each sermon's view_count moves by the
+    rows actually inserted. Returns (inserted rows, sermons bumped).
+    """
+    incoming = values(
+        column("id", SermonView.id.type),
+        column("sermon_id", SermonView.sermon_id.type),
+        column("user_id", SermonView.user_id.type),
+        column("viewed_at", SermonView.viewed_at.type),
+        name="incoming",
+    ).data([(uuid.uuid4(), *row) for row in rows])
+
+    inserted = pg_insert(SermonView).from_select(
+        _VIEW_COLUMNS,
+        select(
+            incoming.c.id,
+            incoming.c.sermon_id,
+            incoming.c.user_id,
+            literal(False),
+            incoming.c.viewed_at,
+            incoming.c.viewed_at,
+            incoming.c.viewed_at,
+        ).join(Sermon, Sermon.id == incoming.c.sermon_id).join(User, User.id == incoming.c.user_id),
+    ).on_conflict_do_nothing(
+        index_elements=[SermonView.sermon_id, SermonView.user_id]
+    ).returning(SermonView.sermon_id).cte("inserted")
+
+    per_sermon = select(
+        inserted.c.sermon_id, func.count().label("views")
+    ).group_by(inserted.c.sermon_id).subquery()
+    bumped = update(Sermon).where(Sermon.id == per_sermon.c.sermon_id).values(
+        view_count=Sermon.view_count + per_sermon.c.views,
+        updated_at=Sermon.updated_at,
+    ).returning(Sermon.id).cte("bumped")
+
+    return select(
+        select(func.count()).select_from(inserted).scalar_subquery(),
+        select(func.count()).select_from(bumped).scalar_subquery(),
+    )
+
+
+def reconcile_counters_stmt() -> Update:
+    """
+    Recompute view_count/like_count from sermon_views for every sermon
+    whose counters drifted; returns the ids of the repaired rows.
+    """
+    views = select(func.count(SermonView.id)).where(
+        SermonView.sermon_id == Sermon.id
+    ).scalar_subquery()
+    likes = select(func.count(SermonView.id)).where(
+        SermonView.sermon_id == Sermon.id,
+        SermonView.liked == True,
+    ).scalar_subquery()
+
+    return update(Sermon).where(
+        or_(Sermon.view_count != views, Sermon.like_count != likes)
+    ).values(
+        view_count=views,
+        like_count=likes,
+        updated_at=Sermon.updated_at,
+    ).returning(Sermon.id).execution_options(synchronize_session=False)
@@ -0,0 +1,98 @@
+from typing import Sequence
+from sqlalchemy import Select, Update, any_, bindparam, case, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.sql.elements import ColumnElement
+from app.models.branch import Branch
+from app.models.user import User
+
+
+def user_listing_query() -> Select:
+    """
+    Build a select yielding (User, total) rows for the admin user lists.
+
+    The branch is outer-joined once and populated on each user from the
+    same row (contains_eager), so serializing a page never lazy-loads.
+    `total` is count(*) OVER () across every row the filtered query
+    matches, computed before LIMIT/OFFSET, so the page and its total
+    come back in one round trip.
+    """
+    return select(
+        User, func.count().over().label("total")
+    ).outerjoin(User.branch).options(contains_eager(User.branch))
+
+
+def _escape_like(term: str) -> str:
+    """Make LIKE wildcards in user input match literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def user_search_criterion(term: str) -> ColumnElement:
+    """
+    Match members whose name or email contains `term`, or whose name is
+    a close fuzzy match (typos, transpositions). Every branch can use
+    the pg_trgm GIN indexes on users.full_name and users.email.
+    """
+    contains = f"%{_escape_like(term)}%"
+    return or_(
+        User.full_name.ilike(contains, escape="\\"),
+        User.email.ilike(contains, escape="\\"),
+        # word_similarity(term, full_name) above pg_trgm.word_similarity_threshold
+        literal(term).op("<%")(User.full_name),
+    )
+
+
+def branch_name_criterion(term: str) -> ColumnElement:
+    """
+    Match users whose branch name contains `term` (case-insensitive,
+    LIKE wildcards in the input matched literally). Needs the Branch
+    join that user_listing_query provides.
+    """
+    return Branch.branch_name.ilike(f"%{_escape_like(term)}%", escape="\\")
+
+
+def user_search_order(term: str) -> list:
+    """
+    Relevance order for user_search_criterion matches: exact email, then
+    name/email/word prefixes, then substrings, then fuzzy-only matches
+    by trigram word similarity; ties by name. Similarity is computed
+    only for the fuzzy rows, as it costs more than the whole match
+    when a short term hits thousands of members.
+    """
+    prefix = f"{_escape_like(term)}%"
+    relevance = case(
+        (func.lower(User.email) == term.lower(), 0),
+        (or_(
+            User.full_name.ilike(prefix, escape="\\"),
+            User.email.ilike(prefix, escape="\\"),
+            User.full_name.ilike(f"% {prefix}", escape="\\"),
+        ), 1),
+        (or_(
+            User.full_name.ilike(f"%{prefix}", escape="\\"),
+            User.email.ilike(f"%{prefix}", escape="\\"),
+        ), 2),
+        # 3..4, closest first
+        else_=4 - func.word_similarity(term, User.full_name),
+    )
+    return [relevance, User.full_name, User.id]
+
+
+def bulk_set_status_stmt(user_ids: Sequence, status: str, from_statuses: Sequence[str]) -> Update:
+    """
+    One UPDATE moving every listed user currently in `from_statuses` to
+    `status`, i.e. UPDATE ... WHERE id = ANY(:ids) AND status IN (...).
+    The ids travel as a single array parameter, however many there are.
+    Rows are locked and read in the FROM subquery, so RETURNING yields
+    (id, email, old_status) for exactly the users that changed.
+    """
+    ids = bindparam("user_ids", list(user_ids), type_=ARRAY(UUID(as_uuid=True)))
+    previous = select(User.id, User.status).where(
+        User.id == any_(ids),
+        User.status.in_(from_statuses),
+    ).with_for_update().subquery("previous")
+
+    return update(User).where(User.id == previous.c.id).values(
+        status=status,
+    ).returning(
+        User.id, User.email, previous.c.status.label("old_status")
+    ).execution_options(synchronize_session=False)
@@ -31,6 +31,9 @@ from app.schemas.sermon import (
     SermonUpdate,
     SermonResponse,
     SermonWithStats,
+    SermonEngagementResponse,
+    SermonAnalytics,
+    SermonAudienceMember,
     SermonViewCreate,
     SermonLikeToggle
 )
@@ -68,6 +71,7 @@ from app.schemas.notification import (
     NotificationMarkRead,
     NotificationMarkAllRead
 )
+from app.schemas.search import SearchResult
 from app.schemas.vimeo import (
     VimeoUploadRequest,
     VimeoUploadResponse,
@@ -105,6 +109,7 @@ __all__ = [
     "SermonUpdate",
     "SermonResponse",
     "SermonWithStats",
+    "SermonEngagementResponse",
     "SermonViewCreate",
     "SermonLikeToggle",
     # Sermon Category
@@ -136,6 +141,8 @@ __all__ = [
     "NotificationResponse",
     "NotificationMarkRead",
     "NotificationMarkAllRead",
+    # Search
+    "SearchResult",
     # Vimeo
     "VimeoUploadRequest",
     "VimeoUploadResponse",
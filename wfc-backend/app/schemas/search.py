@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from datetime import datetime
+from uuid import UUID
+from app.core.constants import SearchKind
+
+
+class SearchResult(BaseModel):
+    """One ranked full-text search hit"""
+    kind: SearchKind
+    id: UUID
+    title: str
+    snippet: str  # HTML-escaped, matches wrapped in <mark></mark>
+    rank: float
+    created_at: datetime
@@ -47,6 +47,34 @@ class SermonWithStats(SermonResponse):
     user_has_liked: bool = False
 
 
+class SermonEngagementResponse(BaseModel):
+    """Result of a view/like action with the sermon's updated counts"""
+    message: str
+    success: bool = True
+    sermon_id: UUID
+    total_views: int
+    total_likes: int
+    user_has_viewed: bool = True
+    user_has_liked: bool = False
+
+
+class SermonAnalytics(BaseModel):
+    """Sermon engagement totals (member lists are paginated separately)"""
+    sermon_id: UUID
+    sermon_title: str
+    total_views: int
+    total_likes: int
+    total_users: int
+    total_not_watched: int
+
+
+class SermonAudienceMember(BaseModel):
+    """One member in a sermon analytics list"""
+    id: UUID
+    name: str
+    email: str
+
+
 class SermonViewCreate(BaseModel):
     """Mark sermon as viewed"""
     sermon_id: UUID
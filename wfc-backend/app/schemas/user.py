@@ -1,8 +1,8 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
-from app.core.constants import UserStatus
+from app.core.constants import MAX_BULK_USER_IDS, UserStatus
 
 
 class UserBase(BaseModel):
@@ -65,6 +65,14 @@ class UserApproval(BaseModel):
 
 
 class BulkUserAction(BaseModel):
-    """Bulk user action schema - accepts both UUID and string"""
-    user_ids: List[str]  # Changed from UUID to str
+    """Bulk user action schema"""
+    user_ids: List[UUID] = Field(..., min_length=1, max_length=MAX_BULK_USER_IDS)
     reason: Optional[str] = None
+
+    @field_validator("user_ids", mode="before")
+    @classmethod
+    def unwrap_nested_ids(cls, value):
+        """Older admin clients send {"user_ids": {"userIds": [...]}}"""
+        if isinstance(value, dict) and "userIds" in value:
+            return value["userIds"]
+        return value
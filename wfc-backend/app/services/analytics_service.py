@@ -0,0 +1,83 @@
+from sqlalchemy import Select, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.constants import UserStatus, EventCrossBranchStatus
+from app.models.user import User
+from app.models.sermon import Sermon
+from app.models.blog import Blog
+from app.models.event import Event
+from app.models.prayer_request import PrayerRequest
+
+
+# Holds the single dashboard payload. Admin mutations drop it; member
+# activity (signups, events, prayers) shows up within the TTL.
+dashboard_cache = TTLCache(maxsize=1, ttl=settings.DASHBOARD_STATS_TTL_SECONDS)
+
+DASHBOARD_KEY = "dashboard_stats"
+
+
+def _count(model, *criteria):
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+
+def dashboard_stats_query() -> Select:
+    """
+    One statement for every dashboard number: user status buckets come
+    from a single FILTERed pass over users, content totals from scalar
+    subqueries evaluated in the same round trip.
+    """
+    users = select(
+        func.count().label("total"),
+        func.count().filter(User.status == UserStatus.PENDING).label("pending"),
+        func.count().filter(User.status == UserStatus.APPROVED).label("approved"),
+        func.count().filter(User.status == UserStatus.REVOKED).label("revoked"),
+    ).select_from(User).subquery()
+
+    return select(
+        users.c.total,
+        users.c.pending,
+        users.c.approved,
+        users.c.revoked,
+        _count(Sermon).label("sermons"),
+        _count(Blog).label("blogs"),
+        _count(Event).label("events"),
+        _count(PrayerRequest).label("prayers"),
+        _count(
+            Event, Event.cross_branch_status == EventCrossBranchStatus.PENDING
+        ).label("cross_branch_requests"),
+    )
+
+
+async def get_dashboard_stats(db: AsyncSession) -> dict:
+    """Dashboard overview, cached for DASHBOARD_STATS_TTL_SECONDS"""
+    stats = dashboard_cache.get(DASHBOARD_KEY)
+    if stats is not None:
+        return stats
+
+    row = (await db.execute(dashboard_stats_query())).one()
+    stats = {
+        "users": {
+            "total": row.total,
+            "pending": row.pending,
+            "approved": row.approved,
+            "revoked": row.revoked
+        },
+        "content": {
+            "sermons": row.sermons,
+            "blogs": row.blogs,
+            "events": row.events,
+            "prayers": row.prayers
+        },
+        "pending_actions": {
+            "user_approvals": row.pending,
+            "cross_branch_requests": row.cross_branch_requests
+        }
+    }
+    dashboard_cache.set(DASHBOARD_KEY, stats)
+    return stats
+
+
+def invalidate_dashboard_stats() -> None:
+    """Drop the cached dashboard after an admin changes what it counts"""
+    dashboard_cache.pop(DASHBOARD_KEY)
@@ -0,0 +1,67 @@
+from typing import Iterable, Optional, Type, TypeVar
+from sqlalchemy import select, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+from app.models.admin import Admin
+
+
+# (model name, id) -> detached User/Admin snapshot.
+# Entries are dropped whenever a user's status or credentials change, and
+# otherwise expire after PRINCIPAL_CACHE_TTL_SECONDS, which bounds how long
+# another worker process can keep serving a stale principal.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+P = TypeVar("P", User, Admin)
+
+
+async def load_principal(db: AsyncSession, model: Type[P], principal_id: str) -> Optional[P]:
+    """
+    Return the User/Admin for a token subject, attached to `db`.
+    A cached snapshot is merged into the session without a SELECT;
+    otherwise the row is loaded once and cached for later requests.
+    """
+    key = (model.__name__, str(principal_id))
+    snapshot = principal_cache.get(key)
+    if snapshot is not None:
+        # load=False copies the cached state in without querying; the
+        # snapshot itself stays untouched by whatever the request changes
+        return await db.merge(snapshot, load=False)
+
+    principal = await db.scalar(select(model).where(model.id == principal_id))
+    if principal is None:
+        return None
+
+    principal_cache.set(key, _snapshot(principal))
+    return principal
+
+
+def _snapshot(principal: P) -> P:
+    """Copy the column state of a loaded row into a detached instance"""
+    model = type(principal)
+    snapshot = model(**{
+        attr.key: getattr(principal, attr.key)
+        for attr in inspect(model).column_attrs
+    })
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def invalidate_user(user_id) -> None:
+    """Forget a cached user after its status, profile or password changes"""
+    principal_cache.pop((User.__name__, str(user_id)))
+
+
+def invalidate_users(user_ids: Iterable) -> None:
+    for user_id in user_ids:
+        invalidate_user(user_id)
+
+
+def invalidate_admin(admin_id) -> None:
+    """Forget a cached admin after its credentials or state change"""
+    principal_cache.pop((Admin.__name__, str(admin_id)))
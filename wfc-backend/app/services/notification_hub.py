@@ -0,0 +1,270 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, async_engine
+from app.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "wfc_notifications"
+
+# NOTIFY payloads must stay under 8000 bytes; bigger audiences are
+# announced without recipients and each worker resolves its own
+MAX_NOTIFY_RECIPIENTS = 50
+
+# The LISTEN connection is pinged this often, and re-established after a
+# delay doubling from 1 s up to this cap whenever it is lost
+LISTEN_HEALTHCHECK_SECONDS = 30
+LISTEN_RETRY_MAX_SECONDS = 30
+
+# (event name, data); None tells a stream to close
+StreamEvent = Optional[Tuple[str, dict]]
+
+
+class NotificationHub:
+    """
+    In-process pub/sub for the notification stream.
+
+    Each open /notifications/stream connection subscribes a bounded
+    queue under its user id. Publishers push new notifications and
+    unread-count changes to the queues of that user's local streams.
+    A stream that falls behind gets a single "resync" event instead of
+    an unbounded backlog.
+
+    With the "postgres" backend every publish is sent as NOTIFY on
+    CHANNEL instead, and each worker process LISTENs and delivers to
+    its own subscribers, so a stream sees events whichever worker
+    handled the write. The LISTEN connection is supervised: when it
+    drops (e.g. a database restart) it is re-established and local
+    streams get a "resync", since NOTIFYs sent meanwhile are lost.
+    """
+
+    def __init__(self, backend: str = "memory", engine: AsyncEngine = async_engine, queue_size: int = 100):
+        self.backend = backend
+        self.engine = engine
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._listen_task: Optional[asyncio.Task] = None
+        self._remote: Set[asyncio.Task] = set()
+        self._stats = {"published": 0, "delivered": 0, "dropped": 0, "listen_reconnects": 0}
+        self._listening = False
+
+    # =========================================================
+    # SUBSCRIBERS
+    # =========================================================
+
+    def subscribe(self, user_id) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(str(user_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(str(user_id))
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[str(user_id)]
+
+    def _push(self, user_id: str, event: str, data: dict) -> None:
+        for queue in self._subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait((event, data))
+                self._stats["delivered"] += 1
+            except asyncio.QueueFull:
+                # Client is not reading: replace the backlog with one resync
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("resync", {}))
+                self._stats["dropped"] += 1
+
+    # =========================================================
+    # PUBLISHING
+    # =========================================================
+
+    async def publish_created(
+        self,
+        rows: Iterable[Tuple],
+        message: str,
+        notification_type: str,
+        created_at: datetime,
+    ) -> None:
+        """Announce freshly inserted (notification_id, user_id) rows"""
+        rows = list(rows)
+        self._stats["published"] += 1
+        if self.backend != "postgres":
+            self._deliver_created(rows, message, notification_type, created_at)
+            return
+
+        recipients = None
+        if len(rows) <= MAX_NOTIFY_RECIPIENTS:
+            recipients = {str(user_id): str(notification_id) for notification_id, user_id in rows}
+        await self._notify({
+            "kind": "created",
+            "message": message,
+            "notification_type": notification_type,
+            "created_at": created_at.isoformat(),
+            "recipients": recipients,
+        })
+
+    async def publish_unread(self, user_id, delta: int = 0, count: Optional[int] = None) -> None:
+        """Announce an unread-count change: a delta, or an absolute count"""
+        data = {"unread_count": count} if count is not None else {"delta": delta}
+        self._stats["published"] += 1
+        if self.backend != "postgres":
+            self._push(str(user_id), "unread", data)
+            return
+        await self._notify({"kind": "unread", "user_id": str(user_id), "data": data})
+
+    def _deliver_created(
+        self,
+        rows: List[Tuple],
+        message: str,
+        notification_type: str,
+        created_at: datetime,
+    ) -> None:
+        for notification_id, user_id in rows:
+            user_id = str(user_id)
+            if user_id not in self._subscribers:
+                continue
+            self._push(user_id, "notification", {
+                "id": str(notification_id),
+                "message": message,
+                "notification_type": notification_type,
+                "is_read": False,
+                "created_at": created_at.isoformat(),
+            })
+            self._push(user_id, "unread", {"delta": 1})
+
+    async def _notify(self, payload: dict) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execute(select(func.pg_notify(CHANNEL, json.dumps(payload))))
+                await conn.commit()
+        except Exception:
+            logger.exception("Failed to publish notification event")
+
+    # =========================================================
+    # LISTEN/NOTIFY BRIDGE
+    # =========================================================
+
+    async def start(self) -> None:
+        """LISTEN on CHANNEL when the postgres backend is configured"""
+        if self.backend != "postgres" or self._listen_task is not None:
+            return
+        self._listen_task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        """Close every open stream and the LISTEN connection"""
+        for queues in self._subscribers.values():
+            for queue in queues:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+        for task in list(self._remote):
+            task.cancel()
+        await asyncio.gather(*self._remote, return_exceptions=True)
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+            await asyncio.gather(self._listen_task, return_exceptions=True)
+            self._listen_task = None
+            self._listening = False
+
+    async def _listen_forever(self) -> None:
+        """Hold a LISTEN connection, re-establishing it whenever it is lost"""
+        delay = 1
+        connected_before = False
+        while True:
+            try:
+                await self._listen(resync=connected_before)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if self._listening:
+                    delay = 1
+                logger.warning("Notification LISTEN connection lost (%s); retrying in %ds", exc, delay)
+            connected_before = connected_before or self._listening
+            self._listening = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, LISTEN_RETRY_MAX_SECONDS)
+
+    async def _listen(self, resync: bool) -> None:
+        """LISTEN until the connection fails; raises when it does"""
+        conn = await self.engine.connect()
+        raw = (await conn.get_raw_connection()).driver_connection
+        lost = asyncio.Event()
+        raw.add_termination_listener(lambda _: lost.set())
+        try:
+            await raw.add_listener(CHANNEL, self._on_notify)
+            self._listening = True
+            if resync:
+                self._stats["listen_reconnects"] += 1
+                logger.info("Notification LISTEN connection re-established")
+                self._resync_all()
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), LISTEN_HEALTHCHECK_SECONDS)
+                except asyncio.TimeoutError:
+                    await asyncio.wait_for(raw.execute("SELECT 1"), LISTEN_HEALTHCHECK_SECONDS)
+            raise ConnectionError("connection closed")
+        except asyncio.CancelledError:
+            if not raw.is_closed():
+                await raw.remove_listener(CHANNEL, self._on_notify)
+            await conn.close()
+            raise
+        except Exception:
+            # A dead or hung connection must not go back to the pool
+            await conn.invalidate()
+            raise
+
+    def _resync_all(self) -> None:
+        """Tell every local stream to refetch after events may have been missed"""
+        for queues in self._subscribers.values():
+            for queue in queues:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("resync", {}))
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        task = asyncio.create_task(self._handle_remote(json.loads(payload)))
+        self._remote.add(task)
+        task.add_done_callback(self._remote.discard)
+
+    async def _handle_remote(self, payload: dict) -> None:
+        if payload["kind"] == "unread":
+            self._push(payload["user_id"], "unread", payload["data"])
+            return
+
+        created_at = datetime.fromisoformat(payload["created_at"])
+        recipients = payload["recipients"]
+        if recipients is not None:
+            rows = [(nid, uid) for uid, nid in recipients.items() if uid in self._subscribers]
+        else:
+            # Large fan-out: look up ids for this worker's subscribers only
+            local = list(self._subscribers)
+            if not local:
+                return
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(select(Notification.id, Notification.user_id).where(
+                    Notification.user_id.in_(local),
+                    Notification.created_at == created_at,
+                    Notification.notification_type == payload["notification_type"],
+                ))).all()
+        self._deliver_created(rows, payload["message"], payload["notification_type"], created_at)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "backend": self.backend,
+            "listening": self._listening,
+            "users": len(self._subscribers),
+            "streams": sum(len(queues) for queues in self._subscribers.values()),
+        }
+
+
+notification_hub = NotificationHub(backend=settings.NOTIFICATION_PUBSUB_BACKEND)
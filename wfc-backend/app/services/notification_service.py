@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Select, select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.constants import NotificationType
+from app.db.session import AsyncSessionLocal
+from app.models.user import User
+from app.repositories.notification_repository import (
+    PARTITION_LOCK_KEY,
+    create_partition_statements,
+    list_partitions_query,
+    notify_members_stmt,
+    partition_month,
+    partition_name,
+    purge_read_stmt,
+    release_partition_unread_stmt,
+)
+from app.utils.datetime_helpers import add_months, month_start
+from app.services.notification_hub import notification_hub
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """
+    Background writer for in-app notifications.
+
+    Endpoints queue a fan-out and return straight away; one worker task
+    runs each queued INSERT ... SELECT in its own session, so notifying
+    every member about a new sermon never holds up the admin's request.
+    Jobs run in order, one at a time, to keep the write load on the
+    database flat. Queued jobs are drained on shutdown. Once a job
+    commits, its rows are announced to open notification streams.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, shutdown_timeout: float = 10.0):
+        self.session_factory = session_factory
+        self.shutdown_timeout = shutdown_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "jobs": 0,
+            "notifications": 0,
+            "failures": 0,
+            "last_job_ms": 0.0,
+            "max_job_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the worker (called from the app lifespan)"""
+        if not self.running:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Finish queued jobs (up to shutdown_timeout), then stop the worker"""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        try:
+            await asyncio.wait_for(self._task, self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            logger.error("Dropped %d queued notification job(s) on shutdown", self._queue.qsize())
+        self._task = None
+
+    def enqueue(
+        self,
+        stmt: Select,
+        message: str,
+        notification_type: str,
+        created_at: datetime,
+    ) -> None:
+        """Queue a notification INSERT to run off the request path"""
+        if not self.running:
+            self.start()
+        self._queue.put_nowait((stmt, message, notification_type, created_at))
+
+    async def _run(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                return
+            await self._deliver(*job)
+
+    async def _deliver(
+        self,
+        stmt: Select,
+        message: str,
+        notification_type: str,
+        created_at: datetime,
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            async with self.session_factory() as db:
+                rows = (await db.execute(stmt)).all()
+                await db.commit()
+        except Exception:
+            self._stats["failures"] += 1
+            logger.exception("Notification job %r failed", notification_type)
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._stats["jobs"] += 1
+        self._stats["notifications"] += len(rows)
+        self._stats["last_job_ms"] = round(elapsed_ms, 2)
+        self._stats["max_job_ms"] = round(max(self._stats["max_job_ms"], elapsed_ms), 2)
+        await notification_hub.publish_created(rows, message, notification_type, created_at)
+
+    def stats(self) -> Dict[str, float]:
+        return {**self._stats, "queued": self._queue.qsize() if self._queue else 0}
+
+
+notification_dispatcher = NotificationDispatcher()
+
+
+def notify_all_members(message: str, notification_type: NotificationType) -> None:
+    """Notify every approved member, in the background"""
+    created_at = datetime.utcnow()
+    notification_dispatcher.enqueue(
+        notify_members_stmt(message, notification_type.value, created_at=created_at),
+        message,
+        notification_type.value,
+        created_at,
+    )
+
+
+def notify_users(user_ids: Iterable, message: str, notification_type: NotificationType) -> None:
+    """Notify specific (approved) members, in the background"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    created_at = datetime.utcnow()
+    notification_dispatcher.enqueue(
+        notify_members_stmt(message, notification_type.value, User.id.in_(user_ids), created_at=created_at),
+        message,
+        notification_type.value,
+        created_at,
+    )
+
+
+# =========================================================
+# PARTITION MAINTENANCE AND RETENTION
+# =========================================================
+
+async def _lock_partitions(db: AsyncSession) -> bool:
+    """Take the partition DDL lock for this transaction (False if another worker holds it)"""
+    return await db.scalar(select(func.pg_try_advisory_xact_lock(PARTITION_LOCK_KEY)))
+
+
+async def _partitions(db: AsyncSession) -> List[str]:
+    return list((await db.scalars(list_partitions_query())).all())
+
+
+async def ensure_notification_partitions(db: AsyncSession, months_ahead: int) -> List[str]:
+    """
+    Create the monthly partitions for this month and the next
+    `months_ahead` months. Returns the names of the partitions created
+    (none if another worker is already doing it).
+    """
+    if not await _lock_partitions(db):
+        await db.rollback()
+        return []
+
+    existing = {partition_month(name) for name in await _partitions(db)}
+    current = month_start(datetime.utcnow())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month in existing:
+            continue
+        for stmt in create_partition_statements(month):
+            await db.execute(stmt)
+        created.append(partition_name(month))
+    await db.commit()
+    return created
+
+
+async def purge_read_notifications(db: AsyncSession, older_than: timedelta, batch_size: int = 5000) -> int:
+    """
+    Delete read notifications older than `older_than`, in short batches
+    so the inbox index and user-facing writes are never blocked for long.
+    Unread rows are kept. Returns the number of rows deleted.
+    """
+    cutoff = datetime.utcnow() - older_than
+    deleted = 0
+    while True:
+        result = await db.execute(purge_read_stmt(cutoff, batch_size))
+        await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+async def drop_expired_notification_partitions(db: AsyncSession, older_than: timedelta) -> List[str]:
+    """
+    Drop monthly partitions that ended before `older_than` ago, read or
+    not; their unread rows come off the users' counters first.
+    Returns the names of the partitions dropped.
+    """
+    if not await _lock_partitions(db):
+        await db.rollback()
+        return []
+
+    cutoff = datetime.utcnow() - older_than
+    dropped = []
+    for name in sorted(await _partitions(db)):
+        month = partition_month(name)
+        if month is None or add_months(month, 1) > cutoff:
+            continue
+        await db.execute(release_partition_unread_stmt(name))
+        await db.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    await db.commit()
+    return dropped
+
+
+async def maintain_notifications(db: AsyncSession) -> Dict[str, object]:
+    """One maintenance pass: upcoming partitions, then retention"""
+    report = {
+        "partitions_created": await ensure_notification_partitions(
+            db, settings.NOTIFICATION_PARTITIONS_AHEAD
+        ),
+        "read_deleted": 0,
+        "partitions_dropped": [],
+    }
+    if settings.NOTIFICATION_RETENTION_DAYS > 0:
+        report["read_deleted"] = await purge_read_notifications(
+            db, timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+        )
+    if settings.NOTIFICATION_MAX_AGE_DAYS > 0:
+        report["partitions_dropped"] = await drop_expired_notification_partitions(
+            db, timedelta(days=settings.NOTIFICATION_MAX_AGE_DAYS)
+        )
+    return report
+
+
+async def run_notification_maintenance(interval_seconds: int) -> None:
+    """Maintain notification partitions now and then once per interval"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                report = await maintain_notifications(db)
+            if report["partitions_created"] or report["read_deleted"] or report["partitions_dropped"]:
+                logger.info("Notification maintenance: %s", report)
+        except Exception:
+            logger.exception("Notification maintenance failed")
+        await asyncio.sleep(interval_seconds)
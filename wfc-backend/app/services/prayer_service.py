@@ -0,0 +1,84 @@
+from typing import NamedTuple, Optional, Tuple
+from pydantic_core import to_jsonable_python
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.repositories.prayer_repository import (
+    PRAYER_WALL_ORDER,
+    prayer_with_author,
+    prayer_with_author_query,
+)
+from app.utils.pagination import CursorPage, CursorParams, decode_cursor, keyset_paginate
+
+
+class WallPage(NamedTuple):
+    """
+    A cached prayer wall page and the slice of the sort order it covers:
+    keys below `upper` (the request cursor; None on the first page) down
+    to `lower` (its last row; None when nothing follows).
+    """
+    page: CursorPage
+    upper: Optional[Tuple]
+    lower: Optional[Tuple]
+
+
+# (cursor, limit, include_total) -> WallPage, items already JSON-ready.
+# Writes made through this process drop only the pages whose window
+# holds the changed prayer; other workers catch up within the TTL.
+prayer_wall_cache = TTLCache(
+    maxsize=settings.PRAYER_WALL_CACHE_MAX_PAGES,
+    ttl=settings.PRAYER_WALL_CACHE_TTL_SECONDS,
+)
+
+# Bumped by every invalidation. A page read while one happened may
+# predate the write, so it is returned but not cached.
+_wall_generation = 0
+
+
+async def get_prayer_wall(db: AsyncSession, params: CursorParams) -> CursorPage:
+    """One page of the global prayer wall, newest first, served from cache when possible"""
+    key = (params.cursor, params.limit, params.include_total)
+    cached = prayer_wall_cache.get(key)
+    if cached is not None:
+        return cached.page
+
+    generation = _wall_generation
+    upper = decode_cursor(params.cursor, PRAYER_WALL_ORDER) if params.cursor else None
+    page = await keyset_paginate(db, prayer_with_author_query(), PRAYER_WALL_ORDER, params)
+
+    lower = None
+    if page.next_cursor:
+        last = page.items[-1].PrayerRequest
+        lower = tuple(getattr(last, column.key) for column in PRAYER_WALL_ORDER)
+    page.items = to_jsonable_python([prayer_with_author(row) for row in page.items])
+
+    if generation == _wall_generation:
+        prayer_wall_cache.set(key, WallPage(page, upper, lower))
+    return page
+
+
+def _bump_generation() -> None:
+    global _wall_generation
+    _wall_generation += 1
+
+
+def invalidate_prayer(prayer) -> int:
+    """
+    Drop the cached pages showing `prayer` (or where it now belongs, for
+    a new one). Returns the number of pages dropped.
+    """
+    _bump_generation()
+    position = tuple(getattr(prayer, column.key) for column in PRAYER_WALL_ORDER)
+
+    def shows(key, wall: WallPage) -> bool:
+        return (wall.upper is None or position < wall.upper) and (
+            wall.lower is None or position >= wall.lower
+        )
+
+    return prayer_wall_cache.pop_where(shows)
+
+
+def invalidate_prayer_wall() -> None:
+    """Drop every cached page, e.g. after an author's name changes"""
+    _bump_generation()
+    prayer_wall_cache.clear()
@@ -0,0 +1,31 @@
+import asyncio
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import AsyncSessionLocal
+from app.repositories.sermon_repository import reconcile_counters_stmt
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_sermon_counters(db: AsyncSession) -> int:
+    """
+    Repair drift between sermons.view_count/like_count and sermon_views
+    (e.g. after users are deleted or rows are edited by hand).
+    Returns the number of sermons whose counters were corrected.
+    """
+    repaired = (await db.scalars(reconcile_counters_stmt())).all()
+    await db.commit()
+    return len(repaired)
+
+
+async def run_counter_reconciliation(interval_seconds: int) -> None:
+    """Reconcile engagement counters forever, once per interval"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as db:
+                repaired = await reconcile_sermon_counters(db)
+            if repaired:
+                logger.warning("Repaired engagement counters on %d sermon(s)", repaired)
+        except Exception:
+            logger.exception("Sermon counter reconciliation failed")
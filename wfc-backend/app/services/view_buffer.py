@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import NotFoundError
+from app.db.session import AsyncSessionLocal
+from app.repositories.blog_repository import record_blog_views_batch_stmt
+from app.repositories.sermon_repository import record_views_batch_stmt
+
+logger = logging.getLogger(__name__)
+
+SERMON = "sermon"
+BLOG = "blog"
+
+# ViewBuffer.add outcomes
+QUEUED = "queued"  # newly buffered
+PENDING = "pending"  # the same view is already buffered
+FULL = "full"  # not buffered: the caller must write it itself
+
+# (content_id, user_id) as UUIDs -> first viewed_at seen since the last flush
+Pending = Dict[Tuple[uuid.UUID, uuid.UUID], datetime]
+
+# Each buffered row binds 4 parameters (id, content_id, user_id,
+# viewed_at) and asyncpg allows 32767 per statement
+MAX_ROWS_PER_STATEMENT = 32767 // 4
+
+
+class ViewBuffer:
+    """
+    Write-behind buffer for sermon and blog view events.
+
+    Views are held in memory keyed by (content, member), so a member
+    opening the same sermon five times before a flush costs one row.
+    The buffer is written every `flush_interval` seconds, or as soon as
+    `max_batch` views are queued, as multi-row INSERTs of at most
+    `max_batch` rows each. Callers never wait on a flush: once
+    `max_pending` views are queued (the database is down or cannot keep
+    up) add() returns FULL and the caller writes the view directly.
+    A failed flush puts its unwritten views back for the next attempt;
+    any that no longer fit under the cap are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.5,
+        max_batch: int = 500,
+        max_pending: int = 20000,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch = max(1, min(max_batch, MAX_ROWS_PER_STATEMENT))
+        self.max_pending = max_pending
+        self.session_factory = session_factory
+        self._pending: Dict[str, Pending] = {SERMON: {}, BLOG: {}}
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._overflowing = False
+        self._stats = {
+            "received": 0,
+            "coalesced": 0,
+            "overflowed": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "rows_written": 0,
+            "failures": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+        }
+
+    @property
+    def depth(self) -> int:
+        return sum(len(pending) for pending in self._pending.values())
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add(self, kind: str, content_id, user_id) -> str:
+        """
+        Queue one view without touching the database. Returns QUEUED,
+        PENDING (already buffered) or FULL (the buffer is at max_pending
+        and the view was not taken; the caller must write it itself).
+        """
+        try:
+            key = (uuid.UUID(str(content_id)), uuid.UUID(str(user_id)))
+        except ValueError:
+            # A malformed id would fail the whole batch at flush time
+            raise NotFoundError(kind.title())
+        pending = self._pending[kind]
+        self._stats["received"] += 1
+        if key in pending:
+            self._stats["coalesced"] += 1
+            return PENDING
+
+        depth = self.depth
+        if depth >= self.max_pending:
+            self._stats["overflowed"] += 1
+            if not self._overflowing:
+                self._overflowing = True
+                logger.error(
+                    "View buffer full (%d pending); views are written directly until it drains",
+                    self.max_pending,
+                )
+            return FULL
+        if self._overflowing:
+            self._overflowing = False
+            logger.warning("View buffer accepting views again")
+
+        pending[key] = datetime.utcnow()
+        if depth + 1 >= self.max_batch:
+            self._wake.set()
+        return QUEUED
+
+    def start(self) -> None:
+        """Start the periodic flush loop (called from the app lifespan)"""
+        if not self.running:
+            # Bind the loop primitives to the loop that runs the flusher
+            self._wake = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        if self.depth:
+            logger.error("Dropped %d buffered view(s) on shutdown", self.depth)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered views; returns the number of rows inserted"""
+        async with self._flush_lock:
+            batches = {kind: pending for kind, pending in self._pending.items() if pending}
+            if not batches:
+                return 0
+            self._pending = {SERMON: {}, BLOG: {}}
+
+            started = time.perf_counter()
+            written = 0
+            for kind, pending in batches.items():
+                rows = [(*key, viewed_at) for key, viewed_at in pending.items()]
+                for offset in range(0, len(rows), self.max_batch):
+                    try:
+                        written += await self._write(kind, rows[offset:offset + self.max_batch])
+                    except Exception:
+                        self._stats["failures"] += 1
+                        logger.exception("View buffer flush failed, retrying next interval")
+                        self._requeue(kind, rows[offset:])
+                        break
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stats["flushes"] += 1
+            self._stats["rows_written"] += written
+            self._stats["last_flush_ms"] = round(elapsed_ms, 2)
+            self._stats["max_flush_ms"] = round(max(self._stats["max_flush_ms"], elapsed_ms), 2)
+            return written
+
+    async def _write(self, kind: str, rows) -> int:
+        """Insert one chunk of (content_id, user_id, viewed_at) rows in its own transaction"""
+        async with self.session_factory() as db:
+            if kind == SERMON:
+                written, _ = (await db.execute(record_views_batch_stmt(rows))).one()
+            else:
+                written = len((await db.scalars(record_blog_views_batch_stmt(rows))).all())
+            await db.commit()
+        return written
+
+    def _requeue(self, kind: str, rows) -> None:
+        """Put unwritten rows back, keeping the earliest viewed_at, within max_pending"""
+        pending = self._pending[kind]
+        dropped = 0
+        for content_id, user_id, viewed_at in rows:
+            key = (content_id, user_id)
+            if key in pending:
+                pending[key] = min(pending[key], viewed_at)
+            elif self.depth < self.max_pending:
+                pending[key] = viewed_at
+            else:
+                dropped += 1
+        if dropped:
+            self._stats["dropped"] += dropped
+            logger.error("View buffer full; dropped %d views of a failed flush", dropped)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            **self._stats,
+            "depth": self.depth,
+            "sermon_depth": len(self._pending[SERMON]),
+            "blog_depth": len(self._pending[BLOG]),
+        }
+
+
+view_buffer = ViewBuffer(
+    flush_interval=settings.VIEW_BUFFER_FLUSH_INTERVAL_MS / 1000,
+    max_batch=settings.VIEW_BUFFER_MAX_BATCH,
+    max_pending=settings.VIEW_BUFFER_MAX_PENDING,
+)
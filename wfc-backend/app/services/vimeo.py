@@ -1,49 +1,226 @@
 # app/services/vimeo.py
 
+import asyncio
+import logging
+import os
+from typing import Callable, Optional
+
 import httpx
 from fastapi import UploadFile
 from app.core.config import settings
+from app.core.exceptions import VimeoServiceError
+
+logger = logging.getLogger(__name__)
+
+VIMEO_API_BASE = "https://api.vimeo.com"
+TUS_VERSION = "1.0.0"
+READ_BLOCK_SIZE = 256 * 1024
+
+# on_progress(bytes_uploaded, total_bytes)
+ProgressCallback = Callable[[int, int], None]
+
+
+def format_duration(seconds: Optional[int]) -> Optional[str]:
+    """Render a duration in seconds as m:ss (None while unknown)"""
+    if not seconds:
+        return None
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def _api_headers() -> dict:
+    return {
+        "Authorization": f"bearer {settings.VIMEO_ACCESS_TOKEN}",
+        "Accept": "application/vnd.vimeo.*+json;version=3.4",
+    }
+
+
+def _upload_size(file: UploadFile) -> int:
+    """Size of the spooled upload without reading it into memory"""
+    if getattr(file, "size", None) is not None:
+        return file.size
+    position = file.file.tell()
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(position)
+    return size
+
+
+async def create_tus_video(
+    client: httpx.AsyncClient,
+    title: str,
+    description: str,
+    size: int,
+    api_base: str = VIMEO_API_BASE,
+) -> dict:
+    """Create a video placeholder on Vimeo and return its tus upload ticket"""
+    resp = await client.post(
+        f"{api_base}/me/videos",
+        headers=_api_headers(),
+        json={
+            "name": title,
+            "description": description,
+            "upload": {"approach": "tus", "size": str(size)},
+        },
+    )
+    if resp.status_code not in (200, 201):
+        raise VimeoServiceError(f"Failed to create Vimeo upload: HTTP {resp.status_code}")
+    return resp.json()
+
+
+async def delete_video(
+    client: httpx.AsyncClient,
+    video_uri: str,
+    api_base: str = VIMEO_API_BASE,
+) -> None:
+    """Delete a video, e.g. the placeholder of a failed upload (errors are logged, not raised)"""
+    try:
+        resp = await client.delete(f"{api_base}{video_uri}", headers=_api_headers())
+        if resp.status_code not in (204, 404):
+            logger.warning("Failed to delete Vimeo video %s: HTTP %d", video_uri, resp.status_code)
+    except httpx.HTTPError as e:
+        logger.warning("Failed to delete Vimeo video %s: %s", video_uri, e)
+
+
+async def tus_offset(client: httpx.AsyncClient, upload_link: str) -> int:
+    """Ask the tus server how many bytes it has already stored"""
+    resp = await client.head(upload_link, headers={
+        "Tus-Resumable": TUS_VERSION,
+        "Accept": "application/vnd.vimeo.*+json;version=3.4",
+    })
+    if resp.status_code != 200 or "Upload-Offset" not in resp.headers:
+        raise VimeoServiceError(f"Failed to read upload offset: HTTP {resp.status_code}")
+    return int(resp.headers["Upload-Offset"])
+
+
+async def _read_range(file: UploadFile, start: int, length: int):
+    """Yield `length` bytes of the spooled upload from `start`, block by block"""
+    await file.seek(start)
+    remaining = length
+    while remaining:
+        block = await file.read(min(READ_BLOCK_SIZE, remaining))
+        if not block:
+            raise VimeoServiceError("Upload file ended before its declared size")
+        remaining -= len(block)
+        yield block
+
+
+async def tus_upload(
+    client: httpx.AsyncClient,
+    upload_link: str,
+    file: UploadFile,
+    size: int,
+    chunk_size: int,
+    offset: int = 0,
+    on_progress: Optional[ProgressCallback] = None,
+    max_retries: int = 3,
+) -> int:
+    """
+    Stream `file` to a tus upload link, one PATCH per `chunk_size` bytes.
+    Each PATCH body is read from the temp file in small blocks while it
+    is sent, so memory stays flat whatever the chunk or file size. After
+    a failed chunk the server's offset is re-read with HEAD and the
+    upload resumes from there instead of restarting the whole file.
+    Returns the final offset (== size on success).
+    """
+    failures = 0
+    while offset < size:
+        length = min(chunk_size, size - offset)
+        try:
+            resp = await client.patch(
+                upload_link,
+                content=_read_range(file, offset, length),
+                headers={
+                    "Tus-Resumable": TUS_VERSION,
+                    "Upload-Offset": str(offset),
+                    "Content-Length": str(length),
+                    "Content-Type": "application/offset+octet-stream",
+                    "Accept": "application/vnd.vimeo.*+json;version=3.4",
+                },
+            )
+            if resp.status_code != 204:
+                raise VimeoServiceError(f"Chunk rejected: HTTP {resp.status_code}")
+            offset = int(resp.headers["Upload-Offset"])
+            failures = 0
+        except (httpx.HTTPError, VimeoServiceError, KeyError, ValueError) as e:
+            failures += 1
+            if failures > max_retries:
+                raise VimeoServiceError(f"Vimeo upload failed at byte {offset}: {e}")
+            logger.warning("tus chunk at %d failed (%s), resuming", offset, e)
+            await asyncio.sleep(2 ** (failures - 1))
+            offset = await tus_offset(client, upload_link)
+
+        if on_progress:
+            on_progress(offset, size)
+
+    return offset
 
-VIMEO_UPLOAD_URL = "https://api.vimeo.com/me/videos"
 
 async def upload_video_to_vimeo(
     file: UploadFile,
     title: str,
     description: str,
+    client: Optional[httpx.AsyncClient] = None,
+    api_base: str = VIMEO_API_BASE,
+    chunk_size: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
 ) -> dict:
     """
-    Upload a video file to Vimeo and return metadata.
+    Upload a video file to Vimeo with the tus protocol and return metadata.
+    The file is streamed from its spooled temp file in chunks, so memory
+    use stays bounded whatever the recording's size. If the upload fails
+    for good, the placeholder video created for it is deleted again.
+    `client` and `api_base` can point at a local fake tus server in tests.
     """
-    headers = {
-        "Authorization": f"bearer {settings.VIMEO_ACCESS_TOKEN}",
-        "Accept": "application/vnd.vimeo.*+json;version=3.4",
-    }
+    size = _upload_size(file)
+    chunk_size = chunk_size or settings.VIMEO_UPLOAD_CHUNK_SIZE
 
-    async with httpx.AsyncClient(timeout=600) as client:
-        files = {
-            "file_data": (file.filename, await file.read(), file.content_type),
-        }
-        data = {
-            "name": title,
-            "description": description,
-        }
+    def log_progress(uploaded: int, total: int) -> None:
+        logger.info("Vimeo upload %r: %d/%d bytes", title, uploaded, total)
+        if on_progress:
+            on_progress(uploaded, total)
+
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0))
+
+    payload = {}
+    try:
+        try:
+            payload = await create_tus_video(client, title, description, size, api_base)
+            upload_link = payload.get("upload", {}).get("upload_link")
+            if not upload_link:
+                raise VimeoServiceError("Vimeo did not return an upload link")
 
-        resp = await client.post(VIMEO_UPLOAD_URL, headers=headers, files=files, data=data)
-        resp.raise_for_status()
-        payload = resp.json()
+            await tus_upload(
+                client,
+                upload_link,
+                file,
+                size,
+                chunk_size,
+                on_progress=log_progress,
+            )
+        except httpx.HTTPError as e:
+            raise VimeoServiceError(f"Vimeo upload failed: {e}")
+    except VimeoServiceError:
+        # Don't leave an empty video behind on the account
+        if payload.get("uri"):
+            await delete_video(client, payload["uri"], api_base)
+        raise
+    finally:
+        if owns_client:
+            await client.aclose()
 
-    # Extract metadata (adapt to actual Vimeo response)
+    # Extract metadata from the created video
     video_uri = payload.get("uri", "")  # e.g. "/videos/123456789"
     video_id = video_uri.split("/")[-1] if video_uri else None
     embed_url = f"https://player.vimeo.com/video/{video_id}" if video_id else None
     pictures = payload.get("pictures", {})
     sizes = pictures.get("sizes", []) if pictures else []
     thumbnail_url = sizes[-1]["link"] if sizes else None
-    duration = payload.get("duration", 0)
 
     return {
         "video_id": video_id,
         "embed_url": embed_url,
         "thumbnail_url": thumbnail_url,
-        "duration": duration or 0,
+        "duration": format_duration(payload.get("duration")),
     }
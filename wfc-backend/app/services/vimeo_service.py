@@ -0,0 +1,268 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Iterable, Optional, Set
+
+import httpx
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.exceptions import VimeoServiceError
+from app.services.vimeo import VIMEO_API_BASE, format_duration
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+PREFETCH_CONCURRENCY = 5
+
+
+class VimeoService:
+    """
+    Async Vimeo API client shared by all endpoints.
+    One pooled httpx.AsyncClient keeps connections to api.vimeo.com alive
+    between requests. Transient failures (connection errors, 429 and 5xx)
+    are retried with jittered exponential backoff; non-idempotent calls
+    are only retried when the request provably never reached Vimeo.
+
+    Video metadata is cached per video_id. Entries stay fresh for
+    `metadata_ttl` once a video is available but only `pending_ttl`
+    while it is still uploading/transcoding; after that they are served
+    stale (up to `stale_ttl` more) while one background refresh runs.
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        api_base: str = VIMEO_API_BASE,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        metadata_ttl: float = 3600.0,
+        pending_ttl: float = 30.0,
+        stale_ttl: float = 86400.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.access_token = access_token
+        self.api_base = api_base
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.metadata_ttl = metadata_ttl
+        self.pending_ttl = pending_ttl
+        self.stale_ttl = stale_ttl
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        # video_id -> (fresh_until, details); TTLCache expiry ends the stale window
+        self._metadata = TTLCache(maxsize=5000, ttl=metadata_ttl + stale_ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_base,
+                headers={
+                    "Authorization": f"bearer {self.access_token}",
+                    "Accept": "application/vnd.vimeo.*+json;version=3.4",
+                },
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=60.0,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    def _retry_delay(self, attempt: int, resp: Optional[httpx.Response]) -> float:
+        if resp is not None and resp.status_code == 429:
+            retry_after = resp.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), 30.0)
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send an API request, retrying transient failures.
+        `timeout` overrides the client default for this call only.
+        """
+        method = method.upper()
+        idempotent = method in IDEMPOTENT_METHODS
+        if timeout is not None:
+            kwargs["timeout"] = httpx.Timeout(timeout, connect=5.0)
+
+        attempt = 0
+        while True:
+            resp = None
+            try:
+                resp = await self.client.request(method, path, **kwargs)
+                retryable = resp.status_code in RETRY_STATUSES and (
+                    idempotent or resp.status_code == 429
+                )
+                if not retryable or attempt >= self.max_retries:
+                    return resp
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                # Never reached Vimeo: safe to retry any method
+                if attempt >= self.max_retries:
+                    raise VimeoServiceError(f"Vimeo is unreachable: {e}")
+            except httpx.TransportError as e:
+                if not idempotent or attempt >= self.max_retries:
+                    raise VimeoServiceError(f"Vimeo request failed: {e}")
+
+            delay = self._retry_delay(attempt, resp)
+            logger.warning(
+                "Vimeo %s %s failed (%s), retry %d in %.1fs",
+                method, path, resp.status_code if resp is not None else "network",
+                attempt + 1, delay,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def create_upload(self, name: str, size: int) -> dict:
+        """Create a video placeholder and return its tus upload ticket"""
+        resp = await self.request("POST", "/me/videos", json={
+            "name": name,
+            "upload": {"approach": "tus", "size": str(size)},
+        })
+        if resp.status_code not in (200, 201):
+            raise VimeoServiceError(f"Failed to get upload URL: HTTP {resp.status_code}")
+
+        data = resp.json()
+        video_id = data.get("uri", "").split("/")[-1]
+        return {
+            "upload_link": data.get("upload", {}).get("upload_link"),
+            "video_id": video_id,
+            "embed_url": f"https://player.vimeo.com/video/{video_id}",
+        }
+
+    async def fetch_video_details(self, video_id: str) -> dict:
+        """Fetch a video from Vimeo and return the fields the admin screens use"""
+        resp = await self.request("GET", f"/videos/{video_id}", params={
+            "fields": "uri,status,duration,pictures.sizes.link",
+        })
+        if resp.status_code != 200:
+            raise VimeoServiceError("Video not found on Vimeo")
+
+        data = resp.json()
+        thumbnail_url = None
+        if data.get("pictures") and data["pictures"].get("sizes"):
+            thumbnail_url = data["pictures"]["sizes"][-1]["link"]
+
+        return {
+            "video_id": video_id,
+            "embed_url": f"https://player.vimeo.com/video/{video_id}",
+            "thumbnail_url": thumbnail_url,
+            "duration": format_duration(data.get("duration")),
+            "status": data.get("status", "unknown"),
+        }
+
+    async def _refresh(self, video_id: str) -> dict:
+        """Fetch and cache one video, sharing the call between concurrent callers"""
+        future = self._inflight.get(video_id)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[video_id] = future
+        try:
+            details = await self.fetch_video_details(video_id)
+            fresh_for = self.metadata_ttl if details["status"] == "available" else self.pending_ttl
+            self._metadata.set(
+                video_id,
+                (time.monotonic() + fresh_for, details),
+                ttl=fresh_for + self.stale_ttl,
+            )
+            future.set_result(details)
+            return details
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._inflight[video_id]
+
+    def _refresh_in_background(self, video_id: str) -> None:
+        if video_id in self._inflight:
+            return
+        task = asyncio.create_task(self._refresh(video_id))
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Vimeo metadata refresh failed: %s", task.exception())
+
+    async def get_video_details(self, video_id: str) -> dict:
+        """
+        Video metadata, served from cache when possible.
+        A stale entry is returned immediately and refreshed in the
+        background; only a cold miss waits on the Vimeo API.
+        """
+        entry = self._metadata.get(video_id)
+        if entry is None:
+            return await self._refresh(video_id)
+
+        fresh_until, details = entry
+        if fresh_until <= time.monotonic():
+            self._refresh_in_background(video_id)
+        return details
+
+    async def prefetch(self, video_ids: Iterable[str]) -> None:
+        """Warm the cache for many videos with bounded concurrency"""
+        semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+
+        async def warm(video_id: str) -> None:
+            async with semaphore:
+                try:
+                    await self.get_video_details(video_id)
+                except VimeoServiceError as e:
+                    logger.warning("Prefetch of video %s failed: %s", video_id, e.detail)
+
+        await asyncio.gather(*(warm(video_id) for video_id in set(video_ids)))
+
+    def prefetch_in_background(self, video_ids: Iterable[str]) -> None:
+        """Start prefetch() without waiting for it"""
+        task = asyncio.create_task(self.prefetch(list(video_ids)))
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def metadata_stats(self) -> Dict[str, int]:
+        return {**self._metadata.stats(), "refreshing": len(self._inflight)}
+
+    async def delete_video(self, video_id: str) -> None:
+        resp = await self.request("DELETE", f"/videos/{video_id}")
+        if resp.status_code not in (200, 204):
+            raise VimeoServiceError("Failed to delete video from Vimeo")
+        self._metadata.pop(video_id)
+
+    async def aclose(self) -> None:
+        """Close pooled connections (called on application shutdown)"""
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+vimeo_service = VimeoService(
+    access_token=settings.VIMEO_ACCESS_TOKEN,
+    timeout=settings.VIMEO_TIMEOUT_SECONDS,
+    max_retries=settings.VIMEO_MAX_RETRIES,
+    metadata_ttl=settings.VIMEO_METADATA_TTL_SECONDS,
+    pending_ttl=settings.VIMEO_METADATA_PENDING_TTL_SECONDS,
+    stale_ttl=settings.VIMEO_METADATA_STALE_SECONDS,
+)
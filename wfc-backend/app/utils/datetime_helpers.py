@@ -8,6 +8,13 @@ def utc_now() -> datetime:
     return datetime.utcnow()
 
 
+def to_naive_utc(dt: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC (as stored); naive ones are taken as UTC"""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(pytz.utc).replace(tzinfo=None)
+
+
 def format_datetime(dt: datetime, format_string: str = "%Y-%m-%d %H:%M:%S") -> str:
     """Format datetime to string"""
     return dt.strftime(format_string)
@@ -31,6 +38,17 @@ def add_hours(dt: datetime, hours: int) -> datetime:
     return dt + timedelta(hours=hours)
 
 
+def month_start(dt: datetime) -> datetime:
+    """Midnight on the first day of dt's month"""
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """Add months to the first day of a month (pass month_start(dt))"""
+    month_index = dt.year * 12 + dt.month - 1 + months
+    return dt.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+
 def days_between(start: datetime, end: datetime) -> int:
     """Calculate days between two datetimes"""
     return (end - start).days
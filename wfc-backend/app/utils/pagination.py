@@ -1,7 +1,18 @@
-from typing import List, TypeVar, Generic
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, TypeVar, Generic
+from fastapi import Query as QueryParam, Response
 from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Query
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from app.core.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MIN_PAGE_SIZE
+from app.core.exceptions import ValidationError
 
 T = TypeVar('T')
 
@@ -68,3 +79,154 @@ def paginate(
         "has_next": page < total_pages,
         "has_previous": page > 1
     }
+
+
+# =========================================================
+# KEYSET (CURSOR) PAGINATION
+# =========================================================
+
+class CursorParams(BaseModel):
+    """Cursor pagination parameters"""
+    cursor: Optional[str] = None
+    limit: int = DEFAULT_PAGE_SIZE
+    include_total: bool = False
+
+
+class CursorPage(BaseModel):
+    """One page of keyset-paginated results"""
+    items: list
+    next_cursor: Optional[str] = None
+    approximate_total: Optional[int] = None
+
+
+def cursor_params(
+    cursor: Optional[str] = QueryParam(None, description="Opaque cursor from X-Next-Cursor"),
+    limit: int = QueryParam(DEFAULT_PAGE_SIZE, ge=MIN_PAGE_SIZE, le=MAX_PAGE_SIZE),
+    include_total: bool = QueryParam(False, description="Return X-Approximate-Total"),
+) -> CursorParams:
+    """Dependency collecting cursor pagination query parameters"""
+    return CursorParams(cursor=cursor, limit=limit, include_total=include_total)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort-key values into an opaque URL-safe cursor token"""
+    raw = json.dumps([
+        value.isoformat() if isinstance(value, datetime) else str(value)
+        for value in values
+    ])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, columns: Sequence) -> tuple:
+    """
+    Decode a cursor token back into typed sort-key values.
+    Raises ValidationError if the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(raw, list) or len(raw) != len(columns):
+            raise ValueError("cursor length mismatch")
+        return tuple(
+            _coerce_cursor_value(value, column)
+            for value, column in zip(raw, columns)
+        )
+    except (ValueError, TypeError, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValidationError("Invalid pagination cursor")
+
+
+def _coerce_cursor_value(value: str, column) -> Any:
+    """Convert a decoded cursor value to the column's python type"""
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return python_type(value)
+
+
+def _row_sort_key(row, columns: Sequence) -> tuple:
+    """
+    Read sort-key values from a result row: an entity, an entity-first
+    tuple, or a plain row that selects the sort columns themselves
+    """
+    entity = row
+    if isinstance(row, Row) and columns[0].key not in row._fields:
+        entity = row[0]
+    return tuple(getattr(entity, column.key) for column in columns)
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN wrapper used to read the planner's row estimate"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def approximate_count(db: AsyncSession, stmt: Select) -> int:
+    """
+    Estimate the number of rows a statement returns from the planner's
+    statistics instead of running COUNT(*) over the whole table.
+    """
+    plan = (await db.execute(_Explain(stmt))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def keyset_paginate(
+    db: AsyncSession,
+    stmt: Select,
+    columns: Sequence,
+    params: CursorParams,
+    descending: bool = True,
+) -> CursorPage:
+    """
+    Paginate a select by seeking past the last-seen sort key.
+
+    Args:
+        db: Async database session
+        stmt: Unordered select; a single entity yields entities, otherwise
+            rows that either select `columns` directly or whose first
+            element is the entity owning them
+        columns: Unique sort key, e.g. (Model.created_at, Model.id)
+        params: Cursor, page size and whether to estimate the total
+        descending: Sort newest-first (True) or oldest-first (False)
+
+    Returns:
+        CursorPage with the page's rows and the cursor for the next page
+    """
+    total = await approximate_count(db, stmt) if params.include_total else None
+
+    if params.cursor:
+        key = tuple_(*columns)
+        boundary = tuple_(*decode_cursor(params.cursor, columns))
+        stmt = stmt.where(key < boundary if descending else key > boundary)
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    result = await db.execute(stmt.order_by(*order).limit(params.limit + 1))
+    if len(stmt.column_descriptions) == 1:
+        rows = result.scalars().all()
+    else:
+        rows = result.all()
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        next_cursor = encode_cursor(_row_sort_key(rows[-1], columns))
+
+    return CursorPage(items=rows, next_cursor=next_cursor, approximate_total=total)
+
+
+def set_page_headers(response: Response, page: CursorPage) -> None:
+    """Expose the next cursor and optional total as response headers"""
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.approximate_total is not None:
+        response.headers["X-Approximate-Total"] = str(page.approximate_total)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Benchmark the admin user search (GET /users?search=) against a large
+synthetic member table
+Times the single window-count query the endpoint runs and, with
+--before, the COUNT + page ILIKE pair it ran before the pg_trgm indexes
+(timed with those indexes dropped inside a rolled-back transaction).
+WARNING: Inserts (and afterwards deletes) users in the configured
+database, and --before locks the users table while it runs. Use only
+in development!
+
+Usage: python scripts/benchmark_user_search.py [--users 100000] [--runs 200] [--before] [--keep]
+"""
+import argparse
+import statistics
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import select, func, or_, text
+from app.db.session import SessionLocal
+from app.models import *  # Import all models
+from app.models.user import User
+from app.models.branch import Branch
+from app.repositories.user_repository import (
+    user_listing_query,
+    user_search_criterion,
+    user_search_order,
+)
+
+# Synthetic members are recognisable (and removable) by this domain
+BENCH_DOMAIN = "bench.invalid"
+
+TRGM_INDEXES = ["ix_users_full_name_trgm", "ix_users_email_trgm"]
+
+FIRST_NAMES = [
+    "Grace", "John", "Joseph", "Josephine", "Mary", "Anne", "Annabel", "David",
+    "Esther", "Samuel", "Ruth", "Daniel", "Deborah", "Jonathan", "Joy", "Peter",
+]
+LAST_NAMES = [
+    "Mensah", "Okafor", "Adeyemi", "Smith", "Johnson", "Williams", "Brown",
+    "Nwosu", "Boateng", "Okonkwo", "Taylor", "Anderson", "Annan", "Osei",
+]
+
+
+def bench_email(n: int) -> str:
+    """Email of the n-th synthetic member (mirrors seed_users)"""
+    first = FIRST_NAMES[(n * 7) % len(FIRST_NAMES)]
+    last = LAST_NAMES[(n * 13) % len(LAST_NAMES)]
+    return f"{first}.{last}.{n}@{BENCH_DOMAIN}".lower()
+
+
+# (label, search term) - prefix, substring, typo and exact-email searches
+SEARCHES = [
+    ("name prefix", "Jos"),
+    ("surname", "okafor"),
+    ("substring", "ann"),
+    ("typo", "Jonathon Okafor"),
+    ("email", bench_email(42)),
+    ("email part", "mensah.42"),
+    ("no match", "zzqxj"),
+]
+
+
+def seed_users(db, start: int, count: int) -> None:
+    """Insert `count` synthetic members in one INSERT ... SELECT"""
+    db.execute(text("""
+        INSERT INTO users (id, full_name, email, password_hash, status, branch_id,
+                           unread_notification_count, created_at, updated_at)
+        SELECT gen_random_uuid(),
+               f.name || ' ' || l.name,
+               lower(f.name || '.' || l.name || '.' || g) || '@' || :domain,
+               'x',
+               (ARRAY['approved', 'pending', 'revoked'])[1 + g % 3],
+               b.ids[1 + g % cardinality(b.ids)],
+               0,
+               now() - (g || ' minutes')::interval,
+               now()
+        FROM generate_series(:start, :start + :count - 1) g
+        CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids FROM branches) b
+        CROSS JOIN LATERAL (
+            SELECT (:first)[1 + (g * 7) % cardinality(:first)] AS name
+        ) f
+        CROSS JOIN LATERAL (
+            SELECT (:last)[1 + (g * 13) % cardinality(:last)] AS name
+        ) l
+    """), {
+        "start": start,
+        "count": count,
+        "domain": BENCH_DOMAIN,
+        "first": FIRST_NAMES,
+        "last": LAST_NAMES,
+    })
+    db.commit()
+    db.execute(text("ANALYZE users"))
+
+
+def search_statement(term: str, limit: int = 10):
+    """The statement GET /users?search= runs: page and total in one query"""
+    return user_listing_query().where(
+        user_search_criterion(term)
+    ).order_by(*user_search_order(term)).limit(limit)
+
+
+def legacy_search_statements(term: str, limit: int = 10):
+    """The count and page statements GET /users?search= ran before pg_trgm"""
+    pattern = f"%{term}%"
+    query = select(User).outerjoin(Branch, User.branch_id == Branch.id).where(
+        or_(User.email.ilike(pattern), User.full_name.ilike(pattern))
+    )
+    count = select(func.count()).select_from(query.subquery())
+    page = query.order_by(User.created_at.desc()).limit(limit)
+    return count, page
+
+
+def run_current(db, term: str) -> int:
+    rows = db.execute(search_statement(term)).all()
+    return rows[0].total if rows else 0
+
+
+def run_legacy(db, term: str) -> int:
+    count_stmt, page_stmt = legacy_search_statements(term)
+    total = db.scalar(count_stmt)
+    db.scalars(page_stmt).all()
+    return total
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def time_searches(db, run, runs: int) -> float:
+    """Print per-search timings for `run`; returns the worst p95 in ms"""
+    worst = 0.0
+    print(f"{'search':<12} {'rows':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for label, term in SEARCHES:
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            total = run(db, term)
+            timings.append((time.perf_counter() - started) * 1000)
+        p95 = percentile(timings, 0.95)
+        worst = max(worst, p95)
+        print(f"{label:<12} {total:>7} {statistics.median(timings):>8.2f} {p95:>8.2f} {max(timings):>8.2f}")
+    return worst
+
+
+def benchmark(runs: int, before: bool) -> bool:
+    """Time each search; returns True when every current p95 is under 20 ms"""
+    db = SessionLocal()
+    try:
+        if before:
+            print("Before (COUNT + page, leading-wildcard ILIKE, no trigram indexes):")
+            for index in TRGM_INDEXES:
+                db.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            before_p95 = time_searches(db, run_legacy, runs)
+            db.rollback()
+            print("\nAfter (window-count query, trigram indexes):")
+
+        after_p95 = time_searches(db, run_current, runs)
+        if before:
+            print(f"\nWorst p95: {before_p95:.2f} ms -> {after_p95:.2f} ms")
+
+        compiled = search_statement(SEARCHES[1][1]).compile(db.get_bind())
+        print("\nPlan for a surname search:")
+        plan = db.connection().exec_driver_sql(f"EXPLAIN ANALYZE {compiled}", compiled.params)
+        for line in plan.scalars():
+            print(f"  {line}")
+    finally:
+        db.close()
+    return after_p95 < 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--before", action="store_true", help="Also time the pre-pg_trgm search")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic users")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if not db.scalar(select(func.count()).select_from(Branch)):
+            print("❌ Please run seed_branches.py first")
+            sys.exit(1)
+
+    db = SessionLocal()
+    ok = False
+    try:
+        print(f"\n=== Benchmarking User Search ({args.users} synthetic users) ===\n")
+        existing = db.scalar(select(func.count()).select_from(User).where(
+            User.email.like(f"%@{BENCH_DOMAIN}")
+        ))
+        if existing < args.users:
+            seed_users(db, existing + 1, args.users - existing)
+        # Release the lock on users: --before drops indexes from another session
+        db.commit()
+
+        ok = benchmark(args.runs, args.before)
+        print(f"\n{'✅' if ok else '❌'} p95 target (< 20 ms) {'met' if ok else 'missed'}")
+    finally:
+        if not args.keep:
+            db.rollback()
+            db.execute(text("DELETE FROM users WHERE email LIKE :pattern"), {"pattern": f"%@{BENCH_DOMAIN}"})
+            db.commit()
+        db.close()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
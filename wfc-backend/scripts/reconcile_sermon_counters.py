@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Recompute sermon view/like counters from sermon_views
+Run after bulk data fixes, or from cron if the in-app job is disabled
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db.session import SessionLocal
+from app.models import *  # Import all models
+from app.repositories.sermon_repository import reconcile_counters_stmt
+
+
+def reconcile_counters():
+    """Repair drifted sermon engagement counters"""
+    db = SessionLocal()
+    
+    try:
+        print("\n=== Reconciling Sermon Counters ===\n")
+        
+        repaired = db.scalars(reconcile_counters_stmt()).all()
+        db.commit()
+        
+        print(f"✅ Repaired {len(repaired)} sermon(s)")
+        for sermon_id in repaired:
+            print(f"  - {sermon_id}")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error reconciling counters: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    reconcile_counters()
@@ -0,0 +1,13 @@
+import os
+
+# Settings are read at import time; give the required ones test values
+# so unit tests run without a .env file
+for _name, _value in {
+    "SECRET_KEY": "test-secret-key",
+    "JWT_SECRET_KEY": "test-jwt-secret-key",
+    "DATABASE_URL": "postgresql://postgres@localhost/wfc_test",
+    "VIMEO_ACCESS_TOKEN": "test-token",
+    "VIMEO_CLIENT_ID": "test-client-id",
+    "VIMEO_CLIENT_SECRET": "test-client-secret",
+}.items():
+    os.environ.setdefault(_name, _value)
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.services import notification_service
+from app.services.notification_service import NotificationDispatcher
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Runs a job's `stmt`: a list of rows, or an exception to raise"""
+
+    def __init__(self, log):
+        self.log = log
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, stmt):
+        await asyncio.sleep(0)
+        if isinstance(stmt, Exception):
+            raise stmt
+        return FakeResult(stmt)
+
+    async def commit(self):
+        self.log.append("commit")
+
+
+@pytest.fixture
+def published(monkeypatch):
+    announced = []
+
+    async def publish_created(rows, message, notification_type, created_at):
+        announced.append(message)
+
+    monkeypatch.setattr(notification_service.notification_hub, "publish_created", publish_created)
+    return announced
+
+
+def dispatcher(log):
+    return NotificationDispatcher(session_factory=lambda: FakeSession(log))
+
+
+def enqueue(dispatcher, stmt, message):
+    dispatcher.enqueue(stmt, message, "sermon_uploaded", datetime(2026, 1, 1))
+
+
+def test_failed_job_does_not_stop_the_queue(published):
+    log = []
+
+    async def run():
+        worker = dispatcher(log)
+        enqueue(worker, [("row",)], "first")
+        enqueue(worker, RuntimeError("deadlock detected"), "broken")
+        enqueue(worker, [("row",), ("row",)], "third")
+        await worker.stop()
+        return worker.stats()
+
+    stats = asyncio.run(run())
+
+    assert published == ["first", "third"]
+    assert log == ["commit", "commit"]
+    assert stats["jobs"] == 2
+    assert stats["failures"] == 1
+    assert stats["notifications"] == 3
+
+
+def test_queued_jobs_drain_on_shutdown(published):
+    async def run():
+        worker = dispatcher([])
+        for n in range(5):
+            enqueue(worker, [("row",)], f"job {n}")
+        # Nothing has run yet: the worker has not been scheduled
+        assert worker.stats()["queued"] == 5
+        await worker.stop()
+        return worker
+
+    worker = asyncio.run(run())
+
+    assert published == [f"job {n}" for n in range(5)]
+    assert worker.stats()["queued"] == 0
+    assert not worker.running
+
+
+def test_shutdown_gives_up_after_timeout(published, caplog):
+    class SlowSession(FakeSession):
+        async def execute(self, stmt):
+            await asyncio.sleep(1)
+            return FakeResult(stmt)
+
+    async def run():
+        worker = NotificationDispatcher(session_factory=lambda: SlowSession([]), shutdown_timeout=0.05)
+        enqueue(worker, [("row",)], "slow")
+        enqueue(worker, [("row",)], "never")
+        await worker.stop()
+        return worker
+
+    worker = asyncio.run(run())
+
+    assert published == []
+    assert not worker.running
+    assert "Dropped" in caplog.text
@@ -0,0 +1,57 @@
+import re
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.notification_repository import delete_notification_stmt, mark_read_stmt
+
+USER_ID = uuid.uuid4()
+
+
+def compiled(stmt) -> str:
+    return re.sub(r"\s+", " ", str(stmt.compile(dialect=postgresql.dialect())))
+
+
+def cte(sql: str, name: str) -> str:
+    """Body of the `name` CTE"""
+    match = re.search(rf"\b{name} AS \((.*?)\)(?:, \w+ AS \(| SELECT )", sql)
+    assert match, f"no {name} CTE in {sql}"
+    return match.group(1)
+
+
+def counter_update(sql: str) -> str:
+    adjusted = cte(sql, "adjusted")
+    assert adjusted.startswith("UPDATE users SET unread_notification_count=")
+    return adjusted
+
+
+def test_mark_read_only_updates_unread_rows():
+    for sql in (compiled(mark_read_stmt(USER_ID, uuid.uuid4())), compiled(mark_read_stmt(USER_ID))):
+        marked = cte(sql, "marked")
+        assert marked.startswith("UPDATE notifications SET is_read=")
+        assert "notifications.user_id = " in marked
+        assert "notifications.is_read = false" in marked
+
+
+def test_mark_read_lowers_counter_by_rows_that_changed():
+    sql = compiled(mark_read_stmt(USER_ID, uuid.uuid4()))
+
+    # Already-read rows never reach `marked`, so re-reading moves nothing
+    assert "users.unread_notification_count + -(SELECT count(*) AS count_1 FROM marked)" in counter_update(sql)
+
+
+def test_mark_all_read_is_scoped_to_the_member():
+    sql = compiled(mark_read_stmt(USER_ID))
+
+    assert "notifications.id =" not in cte(sql, "marked")
+    assert "WHERE users.id = " in counter_update(sql)
+
+
+def test_delete_lowers_counter_only_for_unread_rows():
+    sql = compiled(delete_notification_stmt(USER_ID, uuid.uuid4()))
+
+    deleted = cte(sql, "deleted")
+    assert deleted.startswith("DELETE FROM notifications WHERE")
+    assert deleted.endswith("RETURNING notifications.is_read")
+    # A read row comes back from `deleted` but is filtered out of the delta
+    assert "-(SELECT count(*) AS count_2 FROM deleted WHERE deleted.is_read = false)" in counter_update(sql)
@@ -0,0 +1,142 @@
+import asyncio
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, String, Uuid, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+from app.utils.pagination import CursorParams, decode_cursor, encode_cursor, keyset_paginate
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+    id = Column(Uuid, primary_key=True)
+    created_at = Column(DateTime, nullable=False)
+    position = Column(Integer, nullable=False)
+    name = Column(String, nullable=False)
+
+
+ORDER = (Item.created_at, Item.id)
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+class AsyncSessionAdapter:
+    """Just enough of AsyncSession for keyset_paginate, over a sync session"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def add_items(db, timestamps):
+    items = [
+        Item(id=uuid.uuid4(), created_at=created_at, position=n, name=f"item {n}")
+        for n, created_at in enumerate(timestamps)
+    ]
+    db.add_all(items)
+    db.commit()
+    return items
+
+
+def read_all(db, limit, descending=True):
+    """Follow next_cursor to the end; returns the pages' items"""
+    pages, cursor = [], None
+    while True:
+        page = asyncio.run(keyset_paginate(
+            AsyncSessionAdapter(db), select(Item), ORDER,
+            CursorParams(cursor=cursor, limit=limit), descending=descending,
+        ))
+        pages.append(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    values = (datetime(2026, 3, 4, 5, 6, 7, 890123), uuid.uuid4())
+
+    assert decode_cursor(encode_cursor(values), ORDER) == values
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "not base64 !!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(json.dumps({"a": 1}).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(["2026-01-01T00:00:00"]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(["yesterday", str(uuid.uuid4())]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(["2026-01-01T00:00:00", "not-a-uuid"]).encode()).decode(),
+])
+def test_malformed_cursor_is_a_client_error(token):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(token, ORDER)
+
+    assert 400 <= error.value.status_code < 500
+
+
+def test_tampered_cursor_is_a_client_error():
+    token = encode_cursor((START, uuid.uuid4()))
+
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(token[:-6] + "!!!!!!", ORDER)
+
+    assert 400 <= error.value.status_code < 500
+
+
+def test_pages_cover_every_row_once_in_order(db):
+    add_items(db, [START + timedelta(minutes=n) for n in range(7)])
+
+    pages = read_all(db, limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [item.position for page in pages for item in page] == [6, 5, 4, 3, 2, 1, 0]
+
+
+def test_rows_sharing_created_at_are_split_by_id(db):
+    # Five rows in the same instant: only the id orders them
+    items = add_items(db, [START] * 5 + [START - timedelta(seconds=1)])
+
+    pages = read_all(db, limit=2)
+    seen = [item.id for page in pages for item in page]
+
+    tied = sorted((item.id for item in items if item.created_at == START), reverse=True)
+    assert seen[:5] == tied
+    assert len(seen) == len(set(seen)) == 6
+
+
+def test_ascending_pages(db):
+    add_items(db, [START + timedelta(minutes=n) for n in range(5)])
+
+    pages = read_all(db, limit=2, descending=False)
+
+    assert [item.position for page in pages for item in page] == [0, 1, 2, 3, 4]
+
+
+def test_no_next_cursor_on_last_page(db):
+    add_items(db, [START + timedelta(minutes=n) for n in range(4)])
+
+    exact = asyncio.run(keyset_paginate(
+        AsyncSessionAdapter(db), select(Item), ORDER, CursorParams(limit=4)
+    ))
+    short = asyncio.run(keyset_paginate(
+        AsyncSessionAdapter(db), select(Item), ORDER, CursorParams(limit=10)
+    ))
+
+    assert len(exact.items) == 4 and exact.next_cursor is None
+    assert len(short.items) == 4 and short.next_cursor is None
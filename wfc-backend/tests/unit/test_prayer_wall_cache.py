@@ -0,0 +1,90 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import prayer_service
+from app.services.prayer_service import WallPage, invalidate_prayer, prayer_wall_cache
+from app.utils.pagination import CursorPage, CursorParams, encode_cursor
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+PAGE_SIZE = 3
+
+
+def prayer(minutes_ago):
+    return SimpleNamespace(created_at=START - timedelta(minutes=minutes_ago), id=uuid.uuid4())
+
+
+def position(prayer):
+    return (prayer.created_at, prayer.id)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    prayer_wall_cache.clear()
+    yield
+    prayer_wall_cache.clear()
+
+
+@pytest.fixture
+def wall():
+    """Ten prayers, newest first, cached as pages 0-3: [0-2] [3-5] [6-8] [9]"""
+    prayers = [prayer(n) for n in range(10)]
+    for first in range(0, len(prayers), PAGE_SIZE):
+        rows = prayers[first:first + PAGE_SIZE]
+        more = first + PAGE_SIZE < len(prayers)
+        upper = position(prayers[first - 1]) if first else None
+        lower = position(rows[-1]) if more else None
+        page = CursorPage(items=rows, next_cursor=encode_cursor(lower) if more else None)
+        key = (encode_cursor(upper) if upper else None, PAGE_SIZE, False)
+        prayer_wall_cache.set(key, WallPage(page, upper, lower))
+    return prayers
+
+
+def cached_pages(prayers):
+    """Numbers of the wall pages still cached"""
+    pages = [prayer_wall_cache.get(key) for key in list(prayer_wall_cache._data)]
+    return sorted(prayers.index(wall.page.items[0]) // PAGE_SIZE for wall in pages)
+
+
+def test_new_prayer_drops_only_the_first_page(wall):
+    assert invalidate_prayer(prayer(-1)) == 1
+    assert cached_pages(wall) == [1, 2, 3]
+
+
+def test_edit_inside_a_page_leaves_other_pages(wall):
+    assert invalidate_prayer(wall[4]) == 1
+    assert cached_pages(wall) == [0, 2, 3]
+
+
+def test_deleting_a_boundary_row_drops_the_page_it_ends(wall):
+    # wall[5] is page 1's last row and the cursor page 2 starts after
+    assert invalidate_prayer(wall[5]) == 1
+    assert cached_pages(wall) == [0, 2, 3]
+
+
+def test_last_page_has_no_lower_bound(wall):
+    assert invalidate_prayer(wall[9]) == 1
+    assert cached_pages(wall) == [0, 1, 2]
+
+
+def test_prayer_older_than_the_last_row_drops_the_last_page(wall):
+    assert invalidate_prayer(prayer(60)) == 1
+    assert cached_pages(wall) == [0, 1, 2]
+
+
+def test_page_read_during_invalidation_is_not_cached(monkeypatch):
+    async def paginate(db, stmt, columns, params):
+        # A write lands while the page is being read
+        invalidate_prayer(prayer(0))
+        return CursorPage(items=[])
+
+    monkeypatch.setattr(prayer_service, "keyset_paginate", paginate)
+    params = CursorParams(limit=PAGE_SIZE)
+
+    page = asyncio.run(prayer_service.get_prayer_wall(None, params))
+
+    assert page.items == []
+    assert len(prayer_wall_cache) == 0
@@ -0,0 +1,150 @@
+import asyncio
+import uuid
+
+from app.services.view_buffer import BLOG, FULL, PENDING, QUEUED, SERMON, ViewBuffer
+
+
+class FakeWriterBuffer(ViewBuffer):
+    """ViewBuffer whose writes are recorded instead of sent to the database"""
+
+    def __init__(self, fail_writes=0, during_write=None, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_writes = fail_writes
+        self.during_write = during_write
+        self.writes = []
+
+    async def _write(self, kind, rows):
+        if self.during_write:
+            self.during_write(self)
+            self.during_write = None
+        if self.fail_writes:
+            self.fail_writes -= 1
+            raise ConnectionError("database unavailable")
+        self.writes.append((kind, list(rows)))
+        return len(rows)
+
+
+def ids(count):
+    return [uuid.uuid4() for _ in range(count)]
+
+
+def written_keys(buffer, kind=SERMON):
+    return [(content_id, user_id) for k, rows in buffer.writes if k == kind
+            for content_id, user_id, _ in rows]
+
+
+def test_duplicate_views_are_coalesced():
+    buffer = FakeWriterBuffer()
+    sermon, user = ids(2)
+
+    assert buffer.add(SERMON, sermon, user) == QUEUED
+    assert buffer.add(SERMON, str(sermon), str(user)) == PENDING
+    # Same ids, other content type: a separate view
+    assert buffer.add(BLOG, sermon, user) == QUEUED
+
+    assert buffer.depth == 2
+    assert buffer.stats()["coalesced"] == 1
+    assert asyncio.run(buffer.flush()) == 2
+    assert written_keys(buffer) == [(sermon, user)]
+
+
+def test_flush_writes_chunks_of_max_batch():
+    buffer = FakeWriterBuffer(max_batch=3)
+    for sermon in ids(7):
+        buffer.add(SERMON, sermon, uuid.uuid4())
+
+    assert asyncio.run(buffer.flush()) == 7
+    assert [len(rows) for _, rows in buffer.writes] == [3, 3, 1]
+    assert buffer.depth == 0
+
+
+def test_full_buffer_refuses_new_views():
+    buffer = FakeWriterBuffer(max_pending=2)
+    user = uuid.uuid4()
+    first, second, third = ids(3)
+
+    assert buffer.add(SERMON, first, user) == QUEUED
+    assert buffer.add(BLOG, second, user) == QUEUED
+    assert buffer.add(SERMON, third, user) == FULL
+    # Already buffered views are still recognised
+    assert buffer.add(SERMON, first, user) == PENDING
+    assert buffer.depth == 2
+    assert buffer.stats()["overflowed"] == 1
+
+
+def test_failed_flush_requeues_keeping_earliest_view():
+    user = uuid.uuid4()
+    first, second = ids(2)
+
+    def view_again(buffer):
+        # Arrives while the failing flush is in flight
+        assert buffer.add(SERMON, first, user) == QUEUED
+
+    buffer = FakeWriterBuffer(fail_writes=1, during_write=view_again)
+    buffer.add(SERMON, first, user)
+    buffer.add(SERMON, second, user)
+    original = dict(buffer._pending[SERMON])
+
+    assert asyncio.run(buffer.flush()) == 0
+    assert buffer.stats()["failures"] == 1
+    assert buffer._pending[SERMON] == original
+
+    assert asyncio.run(buffer.flush()) == 2
+    assert {(c, u): t for _, rows in buffer.writes for c, u, t in rows} == original
+
+
+def test_requeue_respects_max_pending():
+    users = ids(3)
+    sermon = uuid.uuid4()
+
+    def fill(buffer):
+        for user in ids(2):
+            buffer.add(BLOG, sermon, user)
+
+    buffer = FakeWriterBuffer(fail_writes=1, during_write=fill, max_pending=3)
+    for user in users:
+        buffer.add(SERMON, sermon, user)
+
+    asyncio.run(buffer.flush())
+
+    # Two new blog views plus one of the three failed sermon views fit
+    assert buffer.depth == 3
+    assert len(buffer._pending[SERMON]) == 1
+    assert buffer.stats()["dropped"] == 2
+
+
+def test_failed_chunk_requeues_only_unwritten_rows():
+    buffer = FakeWriterBuffer(max_batch=2)
+    sermons = ids(5)
+    for sermon in sermons:
+        buffer.add(SERMON, sermon, uuid.uuid4())
+
+    calls = 0
+    write = buffer._write
+
+    async def fail_second_chunk(kind, rows):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise ConnectionError("database unavailable")
+        return await write(kind, rows)
+
+    buffer._write = fail_second_chunk
+    assert asyncio.run(buffer.flush()) == 2
+    assert buffer.depth == 3
+
+
+def test_stop_flushes_pending_views():
+    async def run():
+        buffer = FakeWriterBuffer(flush_interval=3600)
+        buffer.start()
+        sermon, user = ids(2)
+        buffer.add(SERMON, sermon, user)
+        await buffer.stop()
+        return buffer, (sermon, user)
+
+    buffer, key = asyncio.run(run())
+
+    assert not buffer.running
+    assert written_keys(buffer) == [key]
+    assert buffer.depth == 0
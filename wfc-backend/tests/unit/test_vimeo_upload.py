@@ -0,0 +1,92 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+from fastapi import UploadFile
+
+from app.core.exceptions import VimeoServiceError
+from app.services import vimeo
+
+API_BASE = "https://vimeo.test"
+UPLOAD_LINK = "https://tus.vimeo.test/upload/123"
+VIDEO_URI = "/videos/123"
+
+
+class FakeTusServer:
+    """
+    Minimal Vimeo API + tus server for httpx.MockTransport.
+    PATCHes listed in `fail_patches` (1-based) store only the first half
+    of their body and answer 500, like a connection dropped mid-chunk.
+    """
+
+    def __init__(self, fail_patches=()):
+        self.fail_patches = set(fail_patches)
+        self.stored = b""
+        self.patch_offsets = []
+        self.deleted = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST" and request.url.path == "/me/videos":
+            return httpx.Response(201, json={
+                "uri": VIDEO_URI,
+                "upload": {"upload_link": UPLOAD_LINK},
+                "pictures": {"sizes": [{"link": "https://i.vimeocdn.test/1.jpg"}]},
+            })
+        if request.method == "DELETE" and request.url.path == VIDEO_URI:
+            self.deleted.append(request.url.path)
+            return httpx.Response(204)
+        if request.method == "HEAD" and str(request.url) == UPLOAD_LINK:
+            return httpx.Response(200, headers={"Upload-Offset": str(len(self.stored))})
+        if request.method == "PATCH" and str(request.url) == UPLOAD_LINK:
+            self.patch_offsets.append(int(request.headers["Upload-Offset"]))
+            if self.patch_offsets[-1] != len(self.stored):
+                return httpx.Response(409)
+            body = request.content
+            if len(self.patch_offsets) in self.fail_patches:
+                self.stored += body[:len(body) // 2]
+                return httpx.Response(500)
+            self.stored += body
+            return httpx.Response(204, headers={"Upload-Offset": str(len(self.stored))})
+        return httpx.Response(404)
+
+
+def upload(server: FakeTusServer, data: bytes, chunk_size: int):
+    async def run():
+        file = UploadFile(file=io.BytesIO(data), size=len(data), filename="sermon.mp4")
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server.handle)) as client:
+            return await vimeo.upload_video_to_vimeo(
+                file, "Sermon", "", client=client, api_base=API_BASE, chunk_size=chunk_size
+            )
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    async def sleep(delay):
+        pass
+    monkeypatch.setattr(vimeo.asyncio, "sleep", sleep)
+
+
+def test_upload_resumes_from_reported_offset():
+    data = bytes(range(256)) * 40
+    server = FakeTusServer(fail_patches={2})
+
+    result = upload(server, data, chunk_size=4096)
+
+    assert server.stored == data
+    # The second chunk broke off after 2048 bytes; the upload went on
+    # from there rather than resending the chunk or the file
+    assert server.patch_offsets == [0, 4096, 6144]
+    assert result["video_id"] == "123"
+    assert server.deleted == []
+
+
+def test_placeholder_deleted_when_retries_run_out():
+    data = b"x" * 10000
+    server = FakeTusServer(fail_patches=range(1, 100))
+
+    with pytest.raises(VimeoServiceError):
+        upload(server, data, chunk_size=4096)
+
+    assert server.deleted == [VIDEO_URI]